@@ -1,16 +1,61 @@
+"""
+Panel de Administración - Nancy's Collection
+Inventario, alertas y analytics. Cada vista es una función: un rerun solo ejecuta la vista activa
+y plotly se importa únicamente cuando se abre ANALYTICS.
+IMPORTAR / EXPORTAR carga listas de precios (CSV/Excel) y descarga el catálogo (CSV/Parquet).
+La vista oculta PERFORMANCE (?vista=performance) muestra la instrumentación del proceso.
+"""
+
+import tempfile
+from pathlib import Path
+
 import streamlit as st
 import pandas as pd
-from datetime import datetime
-import plotly.express as px
-from supabase import create_client, Client
-
-# --- Configuración de la Aplicación ---
-st.set_page_config(
-    page_title="Admin - Nancy's Collection",
-    layout="wide",
-    initial_sidebar_state="expanded",
-    page_icon="👗"
+from supabase import Client
+from catalog_queries import (
+    COLUMNAS_TABLA_ADMIN,
+    detalle_producto,
+)
+from catalog_io import (
+    ArchivoInvalido,
+    aplicar_importacion,
+    exportar_catalogo,
+    leer_bloques,
+    planificar_importacion,
+    revisar_conflictos,
+)
+from catalog_metrics import (
+    STOCK_CRITICO,
+    estado_stock,
+    filtrar_catalogo,
+    metricas_inventario,
+    opciones_filtro,
+    preparar_tabla_admin,
+)
+from consultas_async import cargar_catalogo_concurrente
+from data_access import obtener_cliente, obtener_cliente_async, obtener_cliente_escritura
+from edicion_catalogo import (
+    COLUMNA_VERSION,
+    COLUMNAS_EDITABLES,
+    aplicar_cambios,
+    cambios_editados,
+    validar_cambios,
+)
+from cache_imagenes import CacheImagenes
+from instrumentation import (
+    REGISTRO,
+    iniciar_servidor_desde_entorno,
+    marcar_miss,
+    medir_cache,
+    rerun,
+    span,
 )
+from ui_assets import aplicar_css
+
+# Cache de imágenes de la galería: directorio y ancho de las miniaturas
+DIRECTORIO_CACHE_IMAGENES = Path(__file__).parent / ".cache_imagenes"
+ANCHO_GALERIA_PX = 480
+
 
 # --- Sistema de Autenticación Simple ---
 def check_password():
@@ -21,7 +66,7 @@ def check_password():
             admin_password = st.secrets["auth"]["admin_password"]
         except KeyError:
             admin_password = "admin123"  # Fallback
-        
+
         if st.session_state["password"] == admin_password:
             st.session_state["password_correct"] = True
             del st.session_state["password"]  # No almacenar contraseña
@@ -31,26 +76,26 @@ def check_password():
     if "password_correct" not in st.session_state:
         # Primera vez, mostrar input
         st.markdown("""
-        <div style='max-width: 450px; margin: 100px auto; padding: 50px; 
+        <div style='max-width: 450px; margin: 100px auto; padding: 50px;
                     background: white; border-radius: 15px; box-shadow: 0 8px 30px rgba(0,0,0,0.12);
                     border: 1px solid #E5E5E5;'>
             <div style='text-align: center; margin-bottom: 30px;'>
-                <div style='font-family: "Playfair Display", serif; font-style: italic; 
+                <div style='font-family: "Playfair Display", serif; font-style: italic;
                             font-size: 36px; color: #1A1A1A; letter-spacing: 2px;'>
                     Nancy's Collection
                 </div>
-                <div style='font-family: "Lato", sans-serif; font-size: 14px; color: #666; 
+                <div style='font-family: "Lato", sans-serif; font-size: 14px; color: #666;
                             letter-spacing: 2px; margin-top: 10px;'>
                     PANEL DE ADMINISTRACIÓN
                 </div>
             </div>
         </div>
         """, unsafe_allow_html=True)
-        
+
         st.text_input(
-            "Contraseña", 
-            type="password", 
-            on_change=password_entered, 
+            "Contraseña",
+            type="password",
+            on_change=password_entered,
             key="password",
             placeholder="Ingresa la contraseña de administrador"
         )
@@ -59,9 +104,9 @@ def check_password():
     elif not st.session_state["password_correct"]:
         # Contraseña incorrecta
         st.text_input(
-            "Contraseña", 
-            type="password", 
-            on_change=password_entered, 
+            "Contraseña",
+            type="password",
+            on_change=password_entered,
             key="password",
             placeholder="Ingresa la contraseña de administrador"
         )
@@ -71,217 +116,18 @@ def check_password():
         # Contraseña correcta
         return True
 
-if not check_password():
-    st.stop()
-
-# --- Configuración de la Aplicación (después de auth) ---
-
-# CSS personalizado - Estética elegante Nancy's Collection
-st.markdown("""
-<style>
-    /* Forzar tema claro */
-    [data-testid="stAppViewContainer"] {
-        background-color: #FAFAFA;
-    }
-    
-    /* Fuentes elegantes */
-    @import url('https://fonts.googleapis.com/css2?family=Playfair+Display:ital,wght@0,400;0,600;1,400;1,600&family=Lato:wght@300;400;600&display=swap');
-    
-    body, p, div, span, label {
-        font-family: 'Lato', sans-serif;
-        color: #2C2C2C;
-    }
-    
-    h1, h2, h3, h4 {
-        font-family: 'Playfair Display', serif;
-        font-style: italic;
-        color: #1A1A1A;
-        letter-spacing: 1px;
-    }
-    
-    /* Product cards elegantes */
-    .product-card {
-        border: 1px solid #E5E5E5;
-        border-radius: 12px;
-        padding: 20px;
-        margin: 10px 0;
-        background: white;
-        box-shadow: 0 2px 10px rgba(0,0,0,0.06);
-        transition: all 0.3s;
-    }
-    .product-card:hover {
-        transform: translateY(-5px);
-        box-shadow: 0 12px 30px rgba(0,0,0,0.12);
-        border-color: #1A1A1A;
-    }
-    
-    /* Metric cards con estética Nancy's */
-    .metric-card {
-        background: linear-gradient(135deg, #1A1A1A 0%, #2C2C2C 100%);
-        padding: 25px;
-        border-radius: 12px;
-        color: white;
-        text-align: center;
-        box-shadow: 0 4px 15px rgba(0,0,0,0.15);
-    }
-    
-    /* Price tag elegante */
-    .price-tag {
-        font-family: 'Playfair Display', serif;
-        font-size: 28px;
-        font-weight: 600;
-        color: #1A1A1A;
-        letter-spacing: 0.5px;
-    }
-    
-    /* Stock badges */
-    .stock-badge {
-        display: inline-block;
-        padding: 6px 14px;
-        border-radius: 20px;
-        font-weight: 500;
-        font-size: 11px;
-        letter-spacing: 0.5px;
-    }
-    .stock-ok { 
-        background: #E8F5E9; 
-        color: #2E7D32; 
-        border: 1px solid #A5D6A7;
-    }
-    .stock-low { 
-        background: #FFF3E0; 
-        color: #E65100; 
-        border: 1px solid #FFCC80;
-    }
-    .stock-out { 
-        background: #FFEBEE; 
-        color: #C62828; 
-        border: 1px solid #EF9A9A;
-    }
-    
-    /* Botones elegantes */
-    .stButton button {
-        background: white !important;
-        color: #1A1A1A !important;
-        border: 2px solid #1A1A1A !important;
-        border-radius: 25px !important;
-        padding: 10px 24px !important;
-        font-weight: 600 !important;
-        letter-spacing: 1px !important;
-        font-family: 'Lato', sans-serif !important;
-        font-style: normal !important;
-    }
-    .stButton button:hover {
-        background: #1A1A1A !important;
-        color: white !important;
-        transform: translateY(-2px);
-        box-shadow: 0 6px 20px rgba(0,0,0,0.2) !important;
-    }
-    
-    /* Botón primary (seleccionado) - fondo negro, letra blanca */
-    .stButton button[kind="primary"] {
-        background: #1A1A1A !important;
-        color: #FFFFFF !important;
-        border: 2px solid #1A1A1A !important;
-    }
-    
-    .stButton button[kind="primary"]:hover {
-        background: #000000 !important;
-        color: #FFFFFF !important;
-    }
-    
-    /* Forzar texto blanco en botones primary */
-    .stButton button[kind="primary"] p {
-        color: #FFFFFF !important;
-    }
-    
-    /* Botón secondary */
-    .stButton button[kind="secondary"] {
-        background: white !important;
-        color: #1A1A1A !important;
-        border: 2px solid #E5E5E5 !important;
-    }
-    
-    /* Tabs elegantes */
-    .stTabs [data-baseweb="tab-list"] {
-        gap: 8px;
-        border-bottom: 2px solid #E5E5E5;
-    }
-    .stTabs [data-baseweb="tab"] {
-        font-family: 'Lato', sans-serif;
-        font-weight: 500;
-        padding: 12px 24px;
-        color: #666;
-    }
-    .stTabs [aria-selected="true"] {
-        color: #1A1A1A;
-        border-bottom: 3px solid #1A1A1A;
-    }
-    
-    /* Selectbox y dropdowns con fondo blanco */
-    [data-baseweb="select"] > div {
-        background-color: #FFFFFF !important;
-        border: 1px solid #E5E5E5 !important;
-        font-family: 'Lato', sans-serif !important;
-    }
-    
-    [role="listbox"] {
-        background-color: #FFFFFF !important;
-    }
-    
-    [role="option"] {
-        background-color: #FFFFFF !important;
-        color: #2C2C2C !important;
-    }
-    
-    [role="option"]:hover {
-        background-color: #F8F8F8 !important;
-    }
-    
-    /* Sidebar con fondo blanco */
-    [data-testid="stSidebar"] {
-        background-color: #FFFFFF !important;
-    }
-    
-    [data-testid="stSidebar"] > div:first-child {
-        background-color: #FFFFFF !important;
-    }
-</style>
-""", unsafe_allow_html=True)
-
-# --- Header elegante ---
-st.markdown("""
-<div style='text-align: center; padding: 30px 0 20px 0;'>
-    <div style='font-family: "Playfair Display", serif; font-style: italic; 
-                font-size: 42px; color: #1A1A1A; letter-spacing: 2px;'>
-        Nancy's Collection
-    </div>
-    <div style='font-family: "Lato", sans-serif; font-size: 12px; color: #666; 
-                letter-spacing: 2px; margin-top: 5px;'>
-        PANEL DE ADMINISTRACIÓN • GESTIÓN DE INVENTARIO
-    </div>
-</div>
-<hr style='border: none; border-top: 1px solid #E5E5E5; margin: 20px 0;'>
-""", unsafe_allow_html=True)
-
-# Inicializar estado de navegación
-if 'current_view' not in st.session_state:
-    st.session_state.current_view = 'inventario'
-
 
 # --- Conexión a Supabase (API REST) ---
 @st.cache_resource
 def init_supabase_client() -> Client:
     """Inicializa cliente de Supabase usando API REST (sin problemas de firewall)."""
     try:
-        url = st.secrets["supabase"]["url"]
-        key = st.secrets["supabase"]["key"]
-        return create_client(url, key)
+        return obtener_cliente(st.secrets)
     except KeyError:
         st.error("Configuración faltante: Por favor configura st.secrets['supabase']")
         st.info("""
         Configuración requerida en .streamlit/secrets.toml:
-        
+
         [supabase]
         url = "https://tu-proyecto.supabase.co"
         key = "tu-anon-key-aqui"
@@ -298,16 +144,49 @@ def init_supabase_client() -> Client:
         st.stop()
 
 
-supabase = init_supabase_client()
+@st.cache_resource
+def init_supabase_async():
+    """Cliente para las lecturas concurrentes (HTTP/2, pool compartido por las sesiones)."""
+    return obtener_cliente_async(st.secrets, init_supabase_client())
+
+
+@st.cache_resource
+def init_supabase_escritura():
+    """Cliente con service_role_key para guardar stock y precios (la anon key solo lee)."""
+    return obtener_cliente_escritura(st.secrets, init_supabase_client())
+
+
+@st.cache_resource
+def init_metricas():
+    """Endpoint /metrics de Prometheus (una vez por proceso, si NANCY_METRICAS_PUERTO está definida)."""
+    return iniciar_servidor_desde_entorno()
+
+
+@st.cache_resource
+def init_cache_imagenes():
+    """Cache LRU en disco de las fotos de Storage (compartida por todas las sesiones)."""
+    return CacheImagenes(DIRECTORIO_CACHE_IMAGENES)
+
+
+def imagen_galeria(url):
+    """Miniatura de la galería desde la cache local; si falla, la URL de Storage."""
+    try:
+        return init_cache_imagenes().obtener(url, ancho=ANCHO_GALERIA_PX)
+    except Exception:
+        return url
 
 
 # --- Carga de Datos con Cache ---
 @st.cache_data(ttl=60)
 def load_catalog_data():
     """Carga el catálogo desde Supabase con TTL de 60s (simula consulta 'tiempo real' desde ERP)."""
+    marcar_miss('load_catalog_data')
     try:
-        response = supabase.table('tb_catalogo_stock').select('*').order('modelo').order('talla').execute()
-        df = pd.DataFrame(response.data)
+        # Paginación keyset por (modelo, sku) con los rangos en paralelo; orden final por modelo/talla en memoria
+        # descripcion y created_at no se muestran: se excluyen de la carga masiva
+        df = pd.DataFrame(cargar_catalogo_concurrente(init_supabase_async(), columnas=COLUMNAS_TABLA_ADMIN))
+        if not df.empty:
+            df = df.sort_values(['modelo', 'talla'], kind='stable').reset_index(drop=True)
         return df
     except Exception as e:
         st.error(f"Error al cargar catálogo: {e}")
@@ -315,312 +194,670 @@ def load_catalog_data():
         return pd.DataFrame()
 
 
-df_catalogo = load_catalog_data()
+@st.cache_data(ttl=60)
+def load_detalle_producto(sku):
+    """Carga la descripción de un producto solo cuando se abre su detalle."""
+    try:
+        return detalle_producto(init_supabase_client(), sku)
+    except Exception as e:
+        st.error(f"Error al cargar detalle de {sku}: {e}")
+        return {}
 
-# --- Verificación de datos ---
-if df_catalogo.empty:
-    st.warning("No hay productos en el catálogo. Verifica la tabla tb_catalogo_stock en Supabase.")
-    st.stop()
 
-# --- Sidebar: Navegación y Métricas ---
-with st.sidebar:
+# --- Header elegante ---
+def render_header():
     st.markdown("""
-    <div style='text-align: center; padding: 20px 0; border-bottom: 2px solid #E5E5E5;'>
-        <div style='font-family: "Playfair Display", serif; font-style: italic; 
-                    font-size: 24px; color: #1A1A1A;'>
+    <div style='text-align: center; padding: 30px 0 20px 0;'>
+        <div style='font-family: "Playfair Display", serif; font-style: italic;
+                    font-size: 42px; color: #1A1A1A; letter-spacing: 2px;'>
             Nancy's Collection
         </div>
-        <div style='font-family: "Lato", sans-serif; font-size: 10px; color: #666; 
-                    letter-spacing: 1px; margin-top: 5px;'>
-            PANEL DE ADMINISTRACIÓN
+        <div style='font-family: "Lato", sans-serif; font-size: 12px; color: #666;
+                    letter-spacing: 2px; margin-top: 5px;'>
+            PANEL DE ADMINISTRACIÓN • GESTIÓN DE INVENTARIO
         </div>
     </div>
+    <hr style='border: none; border-top: 1px solid #E5E5E5; margin: 20px 0;'>
     """, unsafe_allow_html=True)
-    
-    st.markdown("<br>", unsafe_allow_html=True)
-    
-    # Botones de navegación
-    if st.button("INVENTARIO", use_container_width=True, type="primary" if st.session_state.current_view == 'inventario' else "secondary"):
-        st.session_state.current_view = 'inventario'
-        st.rerun()
-    
-    if st.button("ANALYTICS", use_container_width=True, type="primary" if st.session_state.current_view == 'analytics' else "secondary"):
-        st.session_state.current_view = 'analytics'
-        st.rerun()
-    
-    st.markdown("---")
-    
-    # Métricas rápidas
-    st.markdown("### Resumen Rápido")
-    
-    total_productos = len(df_catalogo)
-    valor_inventario = (df_catalogo['precio_soles'] * df_catalogo['stock_actual']).sum()
-    productos_agotados = len(df_catalogo[df_catalogo['stock_actual'] == 0])
-    productos_criticos = len(df_catalogo[df_catalogo['stock_actual'] <= 5])
-    
-    st.metric("Total Productos", total_productos)
-    st.metric("Valor Inventario", f"S/ {valor_inventario:,.2f}")
-    st.metric("Productos Agotados", productos_agotados, delta_color="inverse")
-    st.metric("Stock Crítico (≤5)", productos_criticos, delta_color="inverse")
-    
-    if productos_criticos > 0:
-        st.warning(f"Hay {productos_criticos} productos que requieren reabastecimiento.")
-    else:
-        st.success("Niveles de inventario adecuados.")
-    
-    st.markdown("<br>", unsafe_allow_html=True)
-    
-    if st.button("CERRAR SESIÓN", use_container_width=True):
-        st.session_state["password_correct"] = False
-        st.rerun()
+
+
+# --- Sidebar: Navegación y Métricas ---
+def render_sidebar(df_catalogo):
+    with st.sidebar:
+        st.markdown("""
+        <div style='text-align: center; padding: 20px 0; border-bottom: 2px solid #E5E5E5;'>
+            <div style='font-family: "Playfair Display", serif; font-style: italic;
+                        font-size: 24px; color: #1A1A1A;'>
+                Nancy's Collection
+            </div>
+            <div style='font-family: "Lato", sans-serif; font-size: 10px; color: #666;
+                        letter-spacing: 1px; margin-top: 5px;'>
+                PANEL DE ADMINISTRACIÓN
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+
+        st.markdown("<br>", unsafe_allow_html=True)
+
+        # Botones de navegación
+        if st.button("INVENTARIO", use_container_width=True, type="primary" if st.session_state.current_view == 'inventario' else "secondary"):
+            st.session_state.current_view = 'inventario'
+            st.rerun()
+
+        if st.button("ANALYTICS", use_container_width=True, type="primary" if st.session_state.current_view == 'analytics' else "secondary"):
+            st.session_state.current_view = 'analytics'
+            st.rerun()
+
+        if st.button("IMPORTAR / EXPORTAR", use_container_width=True, type="primary" if st.session_state.current_view == 'archivos' else "secondary"):
+            st.session_state.current_view = 'archivos'
+            st.rerun()
+
+        st.markdown("---")
+
+        # Métricas rápidas
+        st.markdown("### Resumen Rápido")
+
+        metricas = metricas_inventario(df_catalogo)
+        productos_criticos = metricas['criticos']
+
+        st.metric("Total Productos", metricas['total_productos'])
+        st.metric("Valor Inventario", f"S/ {metricas['valor_inventario']:,.2f}")
+        st.metric("Productos Agotados", metricas['agotados'], delta_color="inverse")
+        st.metric(f"Stock Crítico (≤{STOCK_CRITICO})", productos_criticos, delta_color="inverse")
+
+        if productos_criticos > 0:
+            st.warning(f"Hay {productos_criticos} productos que requieren reabastecimiento.")
+        else:
+            st.success("Niveles de inventario adecuados.")
+
+        st.markdown("<br>", unsafe_allow_html=True)
+
+        if st.button("CERRAR SESIÓN", use_container_width=True):
+            st.session_state["password_correct"] = False
+            st.rerun()
+
 
 # --- Filtros Principales ---
-st.markdown("---")
-st.markdown("### Filtros de Búsqueda")
+def render_filtros(df_catalogo):
+    """Muestra los filtros y retorna (df_filtrado, vista)."""
+    st.markdown("---")
+    st.markdown("### Filtros de Búsqueda")
+
+    col1, col2, col3, col4 = st.columns(4)
 
-col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        modelo_seleccionado = st.selectbox('Modelo:', opciones_filtro(df_catalogo, 'modelo'))
 
-with col1:
-    modelos = ['Todos'] + sorted(df_catalogo['modelo'].unique().tolist())
-    modelo_seleccionado = st.selectbox('Modelo:', modelos)
+    with col2:
+        color_seleccionado = st.selectbox('Color:', opciones_filtro(df_catalogo, 'color'))
 
-with col2:
-    colores = ['Todos'] + sorted(df_catalogo['color'].dropna().unique().tolist())
-    color_seleccionado = st.selectbox('Color:', colores)
+    with col3:
+        stock_minimo = st.number_input('Stock Mínimo:', min_value=0, value=0, step=1)
 
-with col3:
-    stock_minimo = st.number_input('Stock Mínimo:', min_value=0, value=0, step=1)
+    with col4:
+        vista = st.selectbox('Vista:', ['Galería', 'Tabla'])
+
+    # Aplicar filtros
+    with span('admin.filtrar'):
+        df_filtrado = filtrar_catalogo(
+            df_catalogo,
+            modelo=modelo_seleccionado,
+            color=color_seleccionado,
+            stock_minimo=stock_minimo
+        )
 
-with col4:
-    vista = st.selectbox('Vista:', ['Galería', 'Tabla'])
+    return df_filtrado, vista
+
+
+# --- VISTA DE ANALYTICS ---
+def render_analytics(df_catalogo, df_filtrado):
+    # plotly es la dependencia más pesada de la app: se importa solo en esta vista
+    with span('admin.importar_plotly'):
+        import plotly.express as px
 
-# --- Vista según navegación ---
-if st.session_state.current_view == 'analytics':
-    # VISTA DE ANALYTICS
     st.markdown("---")
     st.markdown("### Análisis de Inventario")
-    
+
+    metricas = metricas_inventario(df_catalogo)
+
     col1, col2, col3, col4 = st.columns(4)
-    
+
     with col1:
         st.markdown("""
         <div class='metric-card'>
             <h3 style='margin:0; color: white;'>PRODUCTOS</h3>
             <h1 style='margin:10px 0; color: white;'>{}</h1>
         </div>
-        """.format(len(df_catalogo)), unsafe_allow_html=True)
-    
+        """.format(metricas['total_productos']), unsafe_allow_html=True)
+
     with col2:
-        valor_total = (df_catalogo['precio_soles'] * df_catalogo['stock_actual']).sum()
         st.markdown("""
         <div class='metric-card'>
             <h3 style='margin:0; color: white;'>VALOR INVENTARIO</h3>
             <h1 style='margin:10px 0; color: white;'>S/ {:.0f}</h1>
         </div>
-        """.format(valor_total), unsafe_allow_html=True)
-    
+        """.format(metricas['valor_inventario']), unsafe_allow_html=True)
+
     with col3:
-        stock_total = df_catalogo['stock_actual'].sum()
         st.markdown("""
         <div class='metric-card'>
             <h3 style='margin:0; color: white;'>STOCK TOTAL</h3>
             <h1 style='margin:10px 0; color: white;'>{}</h1>
         </div>
-        """.format(stock_total), unsafe_allow_html=True)
-    
+        """.format(metricas['stock_total']), unsafe_allow_html=True)
+
     with col4:
-        agotados = len(df_catalogo[df_catalogo['stock_actual'] == 0])
         st.markdown("""
         <div class='metric-card' style='background: linear-gradient(135deg, #DC3545 0%, #C62828 100%);'>
             <h3 style='margin:0; color: white;'>AGOTADOS</h3>
             <h1 style='margin:10px 0; color: white;'>{}</h1>
         </div>
-        """.format(agotados), unsafe_allow_html=True)
-    
+        """.format(metricas['agotados']), unsafe_allow_html=True)
+
     # Gráficos
     st.markdown("<br>", unsafe_allow_html=True)
-    
+
     col_g1, col_g2 = st.columns(2)
-    
+
     with col_g1:
         # Stock por modelo
-        stock_por_modelo = df_catalogo.groupby('modelo')['stock_actual'].sum().reset_index()
-        fig1 = px.bar(stock_por_modelo, x='modelo', y='stock_actual', 
-                      title='Stock por Modelo',
-                      labels={'stock_actual': 'Unidades', 'modelo': 'Modelo'})
-        fig1.update_traces(marker_color='#1A1A1A')
+        with span('admin.graficos'):
+            stock_por_modelo = df_catalogo.groupby('modelo')['stock_actual'].sum().reset_index()
+            fig1 = px.bar(stock_por_modelo, x='modelo', y='stock_actual',
+                          title='Stock por Modelo',
+                          labels={'stock_actual': 'Unidades', 'modelo': 'Modelo'})
+            fig1.update_traces(marker_color='#1A1A1A')
         st.plotly_chart(fig1, use_container_width=True)
-    
+
     with col_g2:
         # Valor por modelo
-        df_catalogo['valor'] = df_catalogo['precio_soles'] * df_catalogo['stock_actual']
-        valor_por_modelo = df_catalogo.groupby('modelo')['valor'].sum().reset_index()
-        fig2 = px.pie(valor_por_modelo, values='valor', names='modelo',
-                      title='Valor de Inventario por Modelo')
+        with span('admin.graficos'):
+            valor = df_catalogo['precio_soles'] * df_catalogo['stock_actual']
+            valor_por_modelo = valor.groupby(df_catalogo['modelo']).sum().rename('valor').reset_index()
+            fig2 = px.pie(valor_por_modelo, values='valor', names='modelo',
+                          title='Valor de Inventario por Modelo')
+        st.plotly_chart(fig2, use_container_width=True)
+
+    # Productos según los filtros seleccionados
+    if df_filtrado.empty:
+        return
+
+    st.markdown("---")
+    st.markdown(f"### Según Filtros ({len(df_filtrado)} productos)")
+
+    col_chart1, col_chart2 = st.columns(2)
+
+    with col_chart1:
+        # Top productos por valor de inventario
+        with span('admin.graficos'):
+            top_valor = df_filtrado.assign(valor_stock=df_filtrado['precio_soles'] * df_filtrado['stock_actual'])\
+                .nlargest(5, 'valor_stock')[['modelo', 'valor_stock']]
+
+            fig1 = px.bar(
+                top_valor,
+                x='valor_stock',
+                y='modelo',
+                orientation='h',
+                title='Top 5 Productos por Valor en Inventario',
+                labels={'valor_stock': 'Valor (S/)', 'modelo': 'Modelo'}
+            )
+        st.plotly_chart(fig1, use_container_width=True)
+
+    with col_chart2:
+        # Distribución de stock por modelo
+        with span('admin.graficos'):
+            stock_por_modelo = df_filtrado.groupby('modelo')['stock_actual'].sum().reset_index()
+
+            fig2 = px.pie(
+                stock_por_modelo,
+                values='stock_actual',
+                names='modelo',
+                title='Distribución de Stock por Modelo'
+            )
         st.plotly_chart(fig2, use_container_width=True)
-    
-    st.stop()
 
-# VISTA DE INVENTARIO (por defecto)
-# Aplicar filtros
-df_filtrado = df_catalogo.copy()
 
-if modelo_seleccionado != 'Todos':
-    df_filtrado = df_filtrado[df_filtrado['modelo'] == modelo_seleccionado]
+# --- VISTA DE INVENTARIO (por defecto) ---
+def render_galeria(df_filtrado):
+    """Vista de galería con cards."""
+    cols = st.columns(3)
+    for idx, row in df_filtrado.iterrows():
+        with cols[idx % 3]:
+            # Determinar estado del stock
+            stock_class, stock_text = estado_stock(row['stock_actual'])
+
+            # Card del producto
+            with st.container():
+                # Imagen
+                if pd.notna(row['url_foto']) and row['url_foto']:
+                    st.image(imagen_galeria(row['url_foto']), use_container_width=True)
+                else:
+                    st.markdown("""
+                    <div style='background: linear-gradient(135deg, #e0e0e0 0%, #f5f5f5 100%);
+                                height: 200px; display: flex; align-items: center;
+                                justify-content: center; border-radius: 10px;'>
+                        <span style='font-size: 48px;'>📷</span>
+                    </div>
+                    """, unsafe_allow_html=True)
+
+                # Información del producto
+                st.markdown(f"**{row['modelo']}**")
+                st.markdown(f"<span class='price-tag'>S/ {row['precio_soles']:.2f}</span>", unsafe_allow_html=True)
+
+                col_info1, col_info2 = st.columns(2)
+                with col_info1:
+                    st.caption(f"🎨 {row['color']}")
+                with col_info2:
+                    st.caption(f"📏 {row['talla']}")
+
+                st.markdown(f"<span class='stock-badge {stock_class}'>{stock_text}</span>", unsafe_allow_html=True)
+
+                # Detalles bajo demanda: la descripción se consulta solo al abrirlos
+                # (el contenido de un st.expander se ejecuta aunque esté cerrado)
+                if st.toggle("Ver detalles", key=f"detalles_{row['sku']}"):
+                    with st.container(border=True):
+                        detalle = load_detalle_producto(row['sku'])
+                        st.write(f"**SKU:** {row['sku']}")
+                        st.write(f"**Descripción:** {detalle.get('descripcion') or '-'}")
+                        if pd.notna(row['url_foto']) and row['url_foto']:
+                            st.markdown(f"[🔗 Ver imagen completa]({row['url_foto']})")
+
+            st.markdown("")  # Espacio entre cards
+
+
+def render_editor(df_filtrado):
+    """Grilla editable de stock y precios: los cambios se guardan todos juntos en un solo round trip."""
+    columnas = ['sku', 'url_foto', 'modelo', 'talla', 'color'] + COLUMNAS_EDITABLES + [COLUMNA_VERSION]
+    original = df_filtrado[columnas].set_index('sku')
+
+    # Las ediciones de st.data_editor van por posición de fila: si cambian los filtros
+    # (otras filas) o se acaba de guardar, el editor empieza de cero con otra key
+    firma = hash(tuple(original.index))
+    version = st.session_state.setdefault('version_editor', 0)
+    editado = st.data_editor(
+        original,
+        key=f"editor_catalogo_{version}_{firma}",
+        use_container_width=True,
+        height=600,
+        column_order=['url_foto', 'modelo', 'talla', 'color'] + COLUMNAS_EDITABLES,
+        disabled=['url_foto', 'modelo', 'talla', 'color'],
+        column_config={
+            "sku": st.column_config.TextColumn("SKU"),
+            "url_foto": st.column_config.ImageColumn("Foto", width="small"),
+            "modelo": "Modelo",
+            "talla": "Talla",
+            "color": "Color",
+            "precio_soles": st.column_config.NumberColumn(
+                "Precio (S/)", min_value=0.0, step=0.1, format="S/ %.2f", required=True
+            ),
+            "stock_actual": st.column_config.NumberColumn(
+                "Stock", min_value=0, step=1, format="%d", required=True
+            ),
+        },
+    )
+
+    cambios = cambios_editados(original, editado)
+    errores = validar_cambios(cambios)
+    for error in errores:
+        st.error(error)
+
+    col_info, col_boton = st.columns([3, 1])
+    with col_info:
+        st.caption(f"✏️ {len(cambios)} productos modificados · cambiar los filtros descarta lo no guardado")
+    with col_boton:
+        guardar = st.button("GUARDAR CAMBIOS", type="primary", use_container_width=True,
+                            disabled=not cambios or bool(errores))
+
+    if guardar:
+        try:
+            resultado = aplicar_cambios(init_supabase_escritura(), cambios)
+        except Exception as e:
+            st.error(f"No se pudieron guardar los cambios: {e}")
+            return
+        st.session_state.resultado_edicion = resultado
+        st.session_state.version_editor = version + 1
+        # Se recarga el catálogo: lo guardado y las versiones vigentes de los conflictos
+        load_catalog_data.clear()
+        st.rerun()
 
-if color_seleccionado != 'Todos':
-    df_filtrado = df_filtrado[df_filtrado['color'] == color_seleccionado]
 
-df_filtrado = df_filtrado[df_filtrado['stock_actual'] >= stock_minimo]
+def render_resultado_edicion():
+    """Resumen del último guardado (se muestra una vez, después del rerun)."""
+    resultado = st.session_state.pop('resultado_edicion', None)
+    if resultado is None:
+        return
+    if resultado['aplicados']:
+        st.success(f"✅ {len(resultado['aplicados'])} productos actualizados")
+    if resultado['conflictos']:
+        st.warning(
+            f"⚠️ {len(resultado['conflictos'])} productos no se guardaron porque cambiaron desde que se "
+            f"cargó la tabla (sincronización del ERP u otra sesión). La tabla ya muestra sus valores "
+            f"actuales: revísalos y vuelve a editarlos. SKU: {', '.join(sorted(resultado['conflictos']))}"
+        )
+    if resultado['no_existen']:
+        st.error(f"Ya no existen en el catálogo: {', '.join(resultado['no_existen'])}")
+
+
+def render_tabla(df_catalogo, df_filtrado):
+    """Vista de tabla con imágenes como miniaturas (o editable: stock y precios)."""
+    render_resultado_edicion()
+    if st.toggle("✏️ Editar stock y precios", key='editar_tabla'):
+        render_editor(df_filtrado)
+        return
+
+    display_df = preparar_tabla_admin(df_filtrado)
+
+    st.dataframe(
+        display_df,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "Imagen": st.column_config.ImageColumn(
+                "Foto",
+                help="Imagen del producto",
+                width="small"
+            ),
+            "Stock": st.column_config.ProgressColumn(
+                "Stock",
+                help="Unidades disponibles en almacén",
+                format="%d",
+                min_value=0,
+                max_value=int(df_catalogo['stock_actual'].max())
+            ),
+            "Precio (S/)": st.column_config.NumberColumn(
+                "Precio (S/)",
+                format="S/ %.2f"
+            )
+        },
+        height=600
+    )
+
+
+def render_inventario(df_catalogo, df_filtrado, vista):
+    # --- Resultados ---
+    st.markdown("---")
+    st.markdown(f"### Resultados: {len(df_filtrado)} productos encontrados")
 
-# --- Resultados ---
-st.markdown("---")
-st.markdown(f"### Resultados: {len(df_filtrado)} productos encontrados")
+    if df_filtrado.empty:
+        st.info("No hay productos que coincidan con los criterios de búsqueda. Intenta ajustar los filtros.")
+        return
 
-if df_filtrado.empty:
-    st.info("No hay productos que coincidan con los criterios de búsqueda. Intenta ajustar los filtros.")
-else:
     # Alertas (antes de mostrar productos)
     col_a, col_b = st.columns(2)
-    
+
     with col_a:
         agotados = df_filtrado[df_filtrado['stock_actual'] == 0]
         if not agotados.empty:
             st.error(f"ALERTA: {len(agotados)} productos sin stock disponible")
-    
+
     with col_b:
         criticos = df_filtrado[(df_filtrado['stock_actual'] > 0) & (df_filtrado['stock_actual'] <= 5)]
         if not criticos.empty:
             st.warning(f"ADVERTENCIA: {len(criticos)} productos con stock crítico (≤5 unidades)")
-    
+
     st.markdown("")  # Espacio
-    
+
     # Vista según selección
     if vista == 'Galería':
-        # Vista de galería con cards
-        cols = st.columns(3)
-        for idx, row in df_filtrado.iterrows():
-            with cols[idx % 3]:
-                # Determinar estado del stock
-                if row['stock_actual'] == 0:
-                    stock_class = "stock-out"
-                    stock_text = "AGOTADO"
-                elif row['stock_actual'] <= 5:
-                    stock_class = "stock-low"
-                    stock_text = f"BAJO STOCK ({row['stock_actual']})"
-                else:
-                    stock_class = "stock-ok"
-                    stock_text = f"DISPONIBLE ({row['stock_actual']})"
-                
-                # Card del producto
-                with st.container():
-                    # Imagen
-                    if pd.notna(row['url_foto']) and row['url_foto']:
-                        st.image(row['url_foto'], use_container_width=True)
-                    else:
-                        st.markdown("""
-                        <div style='background: linear-gradient(135deg, #e0e0e0 0%, #f5f5f5 100%); 
-                                    height: 200px; display: flex; align-items: center; 
-                                    justify-content: center; border-radius: 10px;'>
-                            <span style='font-size: 48px;'>📷</span>
-                        </div>
-                        """, unsafe_allow_html=True)
-                    
-                    # Información del producto
-                    st.markdown(f"**{row['modelo']}**")
-                    st.markdown(f"<span class='price-tag'>S/ {row['precio_soles']:.2f}</span>", unsafe_allow_html=True)
-                    
-                    col_info1, col_info2 = st.columns(2)
-                    with col_info1:
-                        st.caption(f"🎨 {row['color']}")
-                    with col_info2:
-                        st.caption(f"📏 {row['talla']}")
-                    
-                    st.markdown(f"<span class='stock-badge {stock_class}'>{stock_text}</span>", unsafe_allow_html=True)
-                    
-                    # Expandible con más detalles
-                    with st.expander("Ver detalles"):
-                        st.write(f"**SKU:** {row['sku']}")
-                        st.write(f"**Descripción:** {row['descripcion']}")
-                        if pd.notna(row['url_foto']) and row['url_foto']:
-                            st.markdown(f"[🔗 Ver imagen completa]({row['url_foto']})")
-                
-                st.markdown("")  # Espacio entre cards
-    
+        with span('admin.render_galeria'):
+            render_galeria(df_filtrado)
     else:
-        # Vista de tabla con imágenes como miniaturas
-        display_df = df_filtrado[['url_foto', 'sku', 'modelo', 'talla', 'color', 'precio_soles', 'stock_actual']].copy()
-        display_df.columns = ['Imagen', 'SKU', 'Modelo', 'Talla', 'Color', 'Precio (S/)', 'Stock']
-        
-        st.dataframe(
-            display_df,
-            use_container_width=True,
-            hide_index=True,
-            column_config={
-                "Imagen": st.column_config.ImageColumn(
-                    "Foto",
-                    help="Imagen del producto",
-                    width="small"
-                ),
-                "Stock": st.column_config.ProgressColumn(
-                    "Stock",
-                    help="Unidades disponibles en almacén",
-                    format="%d",
-                    min_value=0,
-                    max_value=int(df_catalogo['stock_actual'].max())
-                ),
-                "Precio (S/)": st.column_config.NumberColumn(
-                    "Precio (S/)",
-                    format="S/ %.2f"
-                )
-            },
-            height=600
+        with span('admin.render_tabla'):
+            render_tabla(df_catalogo, df_filtrado)
+
+    st.caption("📊 Los gráficos de inventario están en la vista ANALYTICS.")
+
+
+# --- VISTA IMPORTAR / EXPORTAR ---
+def archivo_exportado(formato):
+    """Archivo del export para st.download_button (se genera recién al hacer clic).
+
+    Se escribe en un archivo temporal en disco y se devuelve el archivo abierto:
+    mientras se recorren las páginas el export no ocupa memoria, y Streamlit
+    lo lee una sola vez al servir la descarga (con un BytesIO habría dos copias:
+    el buffer y su getvalue()). Sin buffer (RawIOBase) para que download_button
+    lo acepte; el temporal se borra solo al cerrarse.
+    """
+    destino = tempfile.TemporaryFile(buffering=0)
+    exportar_catalogo(init_supabase_client(), destino, formato)
+    destino.seek(0)
+    return destino
+
+
+def render_exportar():
+    st.markdown("### Exportar catálogo")
+    st.caption("Catálogo completo leído página por página; el archivo se genera al hacer clic.")
+    col_csv, col_parquet = st.columns(2)
+    with col_csv:
+        st.download_button(
+            "DESCARGAR CSV", data=lambda: archivo_exportado('csv'), file_name="catalogo.csv",
+            mime="text/csv", use_container_width=True, on_click="ignore"
+        )
+    with col_parquet:
+        st.download_button(
+            "DESCARGAR PARQUET", data=lambda: archivo_exportado('parquet'), file_name="catalogo.parquet",
+            mime="application/vnd.apache.parquet", use_container_width=True, on_click="ignore"
         )
 
-# --- Visualización Analytics ---
-if not df_filtrado.empty:
-    st.markdown("---")
-    st.markdown("### Análisis de Inventario")
-    
-    col_chart1, col_chart2 = st.columns(2)
-    
-    with col_chart1:
-        # Top productos por valor de inventario
-        df_filtrado['valor_stock'] = df_filtrado['precio_soles'] * df_filtrado['stock_actual']
-        top_valor = df_filtrado.nlargest(5, 'valor_stock')[['modelo', 'valor_stock']]
-        
-        fig1 = px.bar(
-            top_valor, 
-            x='valor_stock', 
-            y='modelo',
-            orientation='h',
-            title='Top 5 Productos por Valor en Inventario',
-            labels={'valor_stock': 'Valor (S/)', 'modelo': 'Modelo'}
+
+def render_resultado_importacion():
+    """Resumen del último guardado de la importación (se muestra una vez, después del rerun)."""
+    resultado = st.session_state.pop('resultado_importacion', None)
+    if resultado is None:
+        return
+    st.success(f"✅ {resultado['guardadas']:,} productos guardados desde {resultado['archivo']}")
+    if resultado['conflictos']:
+        st.warning(
+            f"⚠️ {len(resultado['conflictos']):,} productos no se guardaron porque cambiaron después de cargar "
+            f"el catálogo (sincronización del ERP u otra sesión). La vista previa de abajo ya los compara con "
+            f"sus valores actuales: revísalos y vuelve a aplicar."
         )
-        st.plotly_chart(fig1, use_container_width=True)
-    
-    with col_chart2:
-        # Distribución de stock por modelo
-        stock_por_modelo = df_filtrado.groupby('modelo')['stock_actual'].sum().reset_index()
-        
-        fig2 = px.pie(
-            stock_por_modelo,
-            values='stock_actual',
-            names='modelo',
-            title='Distribución de Stock por Modelo'
+        st.dataframe(resultado['detalle_conflictos'], use_container_width=True, hide_index=True)
+    if resultado['no_existen']:
+        st.error(f"Ya no existen en el catálogo: {', '.join(resultado['no_existen'])}")
+
+
+def render_importar(df_catalogo):
+    st.markdown("### Importar lista de precios")
+    st.caption(
+        "CSV o Excel con columna sku (o código) y cualquiera de: modelo, color, talla, precio, stock, url_foto. "
+        "Las celdas vacías no modifican el producto."
+    )
+    archivo = st.file_uploader("Archivo", type=['csv', 'xlsx'], label_visibility="collapsed")
+
+    render_resultado_importacion()
+    if archivo is None:
+        return
+
+    # El plan se calcula una vez por archivo subido (cada interacción es un rerun)
+    guardado = st.session_state.get('plan_importacion')
+    if guardado is None or guardado[0] != archivo.file_id:
+        try:
+            with st.spinner("Leyendo y comparando con el catálogo..."):
+                plan = planificar_importacion(leer_bloques(archivo, archivo.name), df_catalogo)
+                revisar_conflictos(init_supabase_client(), plan)
+        except (ArchivoInvalido, ValueError) as e:
+            st.error(f"No se pudo leer el archivo: {e}")
+            return
+        except ImportError:
+            st.error("Para importar Excel instala openpyxl (pip install openpyxl) o guarda la hoja como CSV.")
+            return
+        st.session_state.plan_importacion = (archivo.file_id, plan)
+    else:
+        plan = guardado[1]
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Filas leídas", f"{plan['filas']:,}")
+    col2.metric("Nuevos", f"{plan['nuevos']:,}")
+    col3.metric("Con cambios", f"{plan['actualizados']:,}")
+    col4.metric("Con errores", f"{len(plan['errores']):,}", delta_color="inverse")
+
+    if len(plan['errores']):
+        with st.container(border=True):
+            st.markdown("**Filas con errores (no se importan)**")
+            st.dataframe(plan['errores'].head(1000), use_container_width=True, hide_index=True)
+
+    if plan['cambios'].empty:
+        st.info(f"Sin cambios: los {plan['sin_cambios']:,} productos del archivo ya coinciden con el catálogo.")
+        return
+
+    if plan['conflictos']:
+        st.warning(
+            f"⚠️ {plan['conflictos']:,} productos cambiaron en la base después de cargar el catálogo "
+            f"(columna conflicto): no se guardarán. Vuelve a comparar con el catálogo actual para revisarlos."
+        )
+        if st.button("VOLVER A COMPARAR"):
+            load_catalog_data.clear()
+            st.session_state.pop('plan_importacion', None)
+            st.rerun()
+    st.markdown("**Vista previa de los cambios**")
+    st.dataframe(plan['cambios'].head(1000), use_container_width=True, hide_index=True)
+    if len(plan['cambios']) > 1000:
+        st.caption(f"Se muestran 1.000 de {len(plan['cambios']):,} cambios.")
+
+    if st.button(f"APLICAR {len(plan['cambios']):,} CAMBIOS", type="primary"):
+        progreso = st.progress(0.0, text="Guardando...")
+        try:
+            resultado = aplicar_importacion(
+                init_supabase_escritura(), plan,
+                al_avanzar=lambda hechas, total: progreso.progress(hechas / total, text=f"Guardando {hechas:,} de {total:,}...")
+            )
+        except Exception as e:
+            st.error(f"Error al guardar: {e}")
+            return
+        resultado['archivo'] = archivo.name
+        resultado['detalle_conflictos'] = plan['cambios'].loc[
+            plan['cambios']['sku'].isin(list(resultado['conflictos'])), ['sku', 'modelo', 'campos']
+        ].assign(updated_at=lambda df: df['sku'].map(resultado['conflictos']))
+        st.session_state.resultado_importacion = resultado
+        st.session_state.pop('plan_importacion', None)
+        load_catalog_data.clear()
+        st.rerun()
+
+
+def render_archivos(df_catalogo):
+    st.markdown("---")
+    render_exportar()
+    st.markdown("---")
+    render_importar(df_catalogo)
+
+
+# --- VISTA DE PERFORMANCE (oculta: ?vista=performance) ---
+def render_performance():
+    """Desglose de los reruns recientes y ratios de cache de este proceso."""
+    st.markdown("---")
+    st.markdown("### Performance")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        ratio = REGISTRO.ratio_cache('load_catalog_data')
+        st.metric("Hit ratio load_catalog_data", "—" if ratio is None else f"{ratio:.0%}")
+    with col2:
+        reruns = REGISTRO.reruns_recientes()
+        st.metric("Reruns registrados", len(reruns))
+    with col3:
+        st.metric("Rerun p95", f"{REGISTRO.percentil('admin_panel.rerun', 95) * 1000:.0f} ms")
+
+    if reruns:
+        st.markdown("#### Reruns recientes (ms por span)")
+        desglose = pd.DataFrame([r['spans'] for r in reruns]).fillna(0)
+        st.bar_chart(desglose)
+
+        st.dataframe(
+            pd.DataFrame([{
+                'Hora': pd.Timestamp(r['inicio'], unit='s').strftime('%H:%M:%S'),
+                'App': r['app'],
+                'Total (ms)': round(r['total_ms'], 1),
+                'Span más lento': max(r['spans'], key=r['spans'].get) if r['spans'] else '',
+            } for r in reversed(reruns)]),
+            use_container_width=True,
+            hide_index=True
         )
-        st.plotly_chart(fig2, use_container_width=True)
+
+    st.markdown("#### Spans")
+    st.dataframe(pd.DataFrame(REGISTRO.resumen_spans()).round(2), use_container_width=True, hide_index=True)
+
+    imagenes = init_cache_imagenes().estadisticas()
+    descargas = REGISTRO.contadores.get('imagenes.misses', 0)
+    st.caption(
+        f"Cache de imágenes: {imagenes['imagenes']} fotos, {imagenes['bytes'] / 1e6:.1f} de "
+        f"{imagenes['presupuesto'] / 1e6:.0f} MB · {descargas:g} descargas desde Storage"
+    )
+
+    if init_metricas() is not None:
+        host, puerto = init_metricas().server_address[:2]
+        st.caption(f"Prometheus: http://{host}:{puerto}/metrics")
+
 
 # --- Footer ---
-st.markdown("---")
-st.markdown("""
-<div style='text-align: center; padding: 20px; color: #666;'>
-    <p><b>Nancy's Collection</b> - Sistema de Gestión de Inventario Cloud-Native</p>
-    <p style='font-size: 12px;'>
-        🔧 Supabase (PostgreSQL) | 🔗 API REST | 📊 Analytics | ⚡ Real-time sync con ERP TumiSoft
-    </p>
-    <p style='font-size: 11px; color: #999;'>
-        Desarrollado con Streamlit • Deploy-ready para Streamlit Cloud
-    </p>
-</div>
-""", unsafe_allow_html=True)
+def render_footer():
+    st.markdown("---")
+    st.markdown("""
+    <div style='text-align: center; padding: 20px; color: #666;'>
+        <p><b>Nancy's Collection</b> - Sistema de Gestión de Inventario Cloud-Native</p>
+        <p style='font-size: 12px;'>
+            🔧 Supabase (PostgreSQL) | 🔗 API REST | 📊 Analytics | ⚡ Real-time sync con ERP TumiSoft
+        </p>
+        <p style='font-size: 11px; color: #999;'>
+            Desarrollado con Streamlit • Deploy-ready para Streamlit Cloud
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+
+
+@rerun('admin_panel')
+def main():
+    # --- Configuración de la Aplicación ---
+    st.set_page_config(
+        page_title="Admin - Nancy's Collection",
+        layout="wide",
+        initial_sidebar_state="expanded",
+        page_icon="👗"
+    )
+
+    init_metricas()
+
+    if not check_password():
+        st.stop()
+
+    # CSS personalizado - Estética elegante Nancy's Collection (assets/admin_panel.css)
+    aplicar_css("admin_panel.css")
+    render_header()
+
+    # Inicializar estado de navegación
+    # ?vista=performance abre la vista oculta de instrumentación (no aparece en el sidebar)
+    if 'current_view' not in st.session_state:
+        st.session_state.current_view = 'performance' if st.query_params.get('vista') == 'performance' else 'inventario'
+
+    df_catalogo = medir_cache('load_catalog_data', load_catalog_data)
+
+    # --- Verificación de datos ---
+    if df_catalogo.empty:
+        st.warning("No hay productos en el catálogo. Verifica la tabla tb_catalogo_stock en Supabase.")
+        st.stop()
+
+    render_sidebar(df_catalogo)
+
+    if st.session_state.current_view == 'performance':
+        render_performance()
+        render_footer()
+        return
+
+    if st.session_state.current_view == 'archivos':
+        render_archivos(df_catalogo)
+        render_footer()
+        return
+
+    df_filtrado, vista = render_filtros(df_catalogo)
+
+    # --- Vista según navegación: solo se ejecuta el código de la vista activa ---
+    if st.session_state.current_view == 'analytics':
+        render_analytics(df_catalogo, df_filtrado)
+    else:
+        render_inventario(df_catalogo, df_filtrado, vista)
+
+    render_footer()
+
+
+if __name__ == "__main__":
+    main()
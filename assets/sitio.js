@@ -0,0 +1,256 @@
+/* Sitio estático - Nancy's Collection
+ * Filtros y búsqueda en el navegador sobre el JSON del catálogo, y carrito en
+ * localStorage. El mensaje de WhatsApp replica tarjetas_html.mensaje_whatsapp()
+ * (benchmarks/verificar_sitio.py comprueba que ambos coinciden). */
+(function () {
+    'use strict';
+
+    var CLAVE_CARRITO = 'nancy_carrito';
+    // Pesos por campo como catalog_search.CAMPOS_BUSQUEDA
+    var PESOS = { modelo: 3, color: 2, talla: 1 };
+    var MAX_RESULTADOS = 96;
+
+    var datos = null;
+    var porSku = {};
+
+    // --- Mensaje y carrito (sin DOM: se prueban con node) ---
+    function precio(valor) {
+        return valor.toFixed(2);
+    }
+
+    function mensajeWhatsapp(items) {
+        if (!items.length) {
+            return '';
+        }
+        var mensaje = '🖤 *Nuevo Pedido - Nancy\'s Collection*\n\n';
+        var total = 0;
+        items.forEach(function (item) {
+            mensaje += '• ' + item.modelo + '\n';
+            mensaje += '  Color: ' + item.color + ' | Talla: ' + item.talla + '\n';
+            mensaje += '  ' + item.cantidad + ' x S/ ' + precio(item.precio) + '\n\n';
+            total += item.precio * item.cantidad;
+        });
+        mensaje += '💰 *TOTAL: S/ ' + precio(total) + '*\n\n';
+        mensaje += 'Confirmar disponibilidad y coordinar entrega 🚚';
+        return mensaje;
+    }
+
+    function agregarAlCarrito(carrito, producto) {
+        for (var i = 0; i < carrito.length; i++) {
+            if (carrito[i].sku === producto.sku) {
+                if (carrito[i].cantidad < producto.stock_actual) {
+                    carrito[i].cantidad += 1;
+                }
+                return carrito;
+            }
+        }
+        carrito.push({
+            sku: producto.sku,
+            modelo: producto.modelo,
+            color: producto.color,
+            talla: producto.talla,
+            precio: producto.precio_soles,
+            cantidad: 1,
+            stock_disponible: producto.stock_actual,
+            imagen: producto.url_foto
+        });
+        return carrito;
+    }
+
+    if (typeof module !== 'undefined') {
+        module.exports = { mensajeWhatsapp: mensajeWhatsapp, agregarAlCarrito: agregarAlCarrito };
+        return;
+    }
+
+    // --- Estado en localStorage ---
+    function leerCarrito() {
+        try {
+            return JSON.parse(localStorage.getItem(CLAVE_CARRITO)) || [];
+        } catch (e) {
+            return [];
+        }
+    }
+
+    function guardarCarrito(carrito) {
+        localStorage.setItem(CLAVE_CARRITO, JSON.stringify(carrito));
+        dibujarCarrito(carrito);
+    }
+
+    // --- Catálogo ---
+    function normalizar(texto) {
+        return String(texto).toLowerCase().normalize('NFKD').replace(/[\u0300-\u036f]/g, '');
+    }
+
+    function cargarDatos(url) {
+        return fetch(url).then(function (r) { return r.json(); }).then(function (json) {
+            datos = json;
+            datos.productos = json.filas.map(function (fila) {
+                var producto = {};
+                json.columnas.forEach(function (columna, i) { producto[columna] = fila[i]; });
+                producto.texto = {};
+                Object.keys(PESOS).forEach(function (campo) { producto.texto[campo] = normalizar(producto[campo]); });
+                porSku[producto.sku] = producto;
+                return producto;
+            });
+        });
+    }
+
+    function buscar(productos, consulta) {
+        var palabras = normalizar(consulta).match(/[a-z0-9]+/g) || [];
+        if (!palabras.length) {
+            return productos;
+        }
+        var puntuados = [];
+        productos.forEach(function (producto, posicion) {
+            var puntaje = 0;
+            for (var i = 0; i < palabras.length; i++) {
+                var mejor = 0;
+                Object.keys(PESOS).forEach(function (campo) {
+                    if (producto.texto[campo].indexOf(palabras[i]) !== -1) {
+                        mejor = Math.max(mejor, PESOS[campo]);
+                    }
+                });
+                if (!mejor) {
+                    return;
+                }
+                puntaje += mejor;
+            }
+            puntuados.push([puntaje, posicion, producto]);
+        });
+        puntuados.sort(function (a, b) { return b[0] - a[0] || a[1] - b[1]; });
+        return puntuados.map(function (p) { return p[2]; });
+    }
+
+    function llenarOpciones(select, columna) {
+        var valores = {};
+        datos.productos.forEach(function (p) { if (p[columna] != null) { valores[p[columna]] = true; } });
+        Object.keys(valores).sort().forEach(function (valor) {
+            var opcion = document.createElement('option');
+            opcion.value = opcion.textContent = valor;
+            select.appendChild(opcion);
+        });
+    }
+
+    function tarjeta(producto) {
+        var copia = document.getElementById('plantilla-tarjeta').content.firstElementChild.cloneNode(true);
+        copia.dataset.sku = producto.sku;
+        copia.querySelector('.boton-agregar').dataset.sku = producto.sku;
+        copia.querySelector('[data-campo="modelo"]').textContent = producto.modelo;
+        copia.querySelector('[data-campo="precio"]').textContent = 'S/ ' + precio(producto.precio_soles);
+        copia.querySelector('[data-campo="detalle"]').textContent = producto.color + ' • Talla ' + producto.talla;
+        var badge = copia.querySelector('[data-campo="stock"]');
+        var bajo = producto.stock_actual <= datos.stock_bajo;
+        badge.className = 'stock-badge ' + (bajo ? 'stock-low' : 'stock-ok');
+        badge.textContent = bajo ? 'Últimas ' + producto.stock_actual + ' unidades' : 'En stock';
+        var foto = copia.querySelector('[data-campo="foto"]');
+        if (producto.url_foto) {
+            foto.src = producto.url_foto;
+            foto.alt = producto.modelo;
+        } else {
+            foto.parentElement.innerHTML = '<div style="font-size:80px; color:#CCC;">📷</div>';
+        }
+        return copia;
+    }
+
+    function filtrar() {
+        var consulta = document.getElementById('busqueda').value;
+        var filtros = {};
+        ['modelo', 'color', 'talla'].forEach(function (columna) {
+            filtros[columna] = document.getElementById('filtro-' + columna).value;
+        });
+        var activo = consulta.trim() || Object.keys(filtros).some(function (c) { return filtros[c] !== 'Todos'; });
+        document.getElementById('pagina').hidden = !!activo;
+        var resultados = document.getElementById('resultados');
+        resultados.hidden = !activo;
+        if (!activo) {
+            return;
+        }
+        var encontrados = buscar(datos.productos, consulta).filter(function (p) {
+            return Object.keys(filtros).every(function (c) { return filtros[c] === 'Todos' || p[c] === filtros[c]; });
+        });
+        var grilla = resultados.querySelector('.grilla');
+        grilla.textContent = '';
+        encontrados.slice(0, MAX_RESULTADOS).forEach(function (p) { grilla.appendChild(tarjeta(p)); });
+        resultados.querySelector('.resumen b').textContent = encontrados.length;
+    }
+
+    // --- Carrito ---
+    function dibujarCarrito(carrito) {
+        var flotante = document.getElementById('carrito-flotante');
+        var total = carrito.reduce(function (s, i) { return s + i.precio * i.cantidad; }, 0);
+        flotante.hidden = !carrito.length;
+        flotante.querySelector('[data-campo="items"]').textContent = carrito.length + ' productos';
+        flotante.querySelector('.cart-total-float').textContent = 'S/ ' + precio(total);
+
+        var lista = document.getElementById('items-carrito');
+        lista.textContent = '';
+        carrito.forEach(function (item) {
+            var fila = document.createElement('div');
+            fila.className = 'item-carrito';
+            var texto = document.createElement('div');
+            texto.textContent = item.modelo + ' · ' + item.color + ' · Talla ' + item.talla +
+                ' · S/ ' + precio(item.precio);
+            var cantidad = document.createElement('input');
+            cantidad.type = 'number';
+            cantidad.min = 1;
+            cantidad.max = item.stock_disponible;
+            cantidad.value = item.cantidad;
+            cantidad.addEventListener('change', function () {
+                item.cantidad = Math.max(1, Math.min(item.stock_disponible, parseInt(cantidad.value, 10) || 1));
+                guardarCarrito(carrito);
+            });
+            var quitar = document.createElement('button');
+            quitar.type = 'button';
+            quitar.textContent = '🗑️';
+            quitar.addEventListener('click', function () {
+                guardarCarrito(carrito.filter(function (i) { return i.sku !== item.sku; }));
+            });
+            fila.append(texto, cantidad, quitar);
+            lista.appendChild(fila);
+        });
+        document.getElementById('total-carrito').textContent = 'S/ ' + precio(total);
+        document.getElementById('enviar-whatsapp').href =
+            'https://wa.me/' + datos.whatsapp + '?text=' + encodeURIComponent(mensajeWhatsapp(carrito));
+    }
+
+    function iniciar() {
+        var body = document.body;
+        cargarDatos(body.dataset.catalogo).then(function () {
+            ['modelo', 'color', 'talla'].forEach(function (columna) {
+                var select = document.getElementById('filtro-' + columna);
+                llenarOpciones(select, columna);
+                select.addEventListener('change', filtrar);
+            });
+            document.getElementById('busqueda').addEventListener('input', filtrar);
+
+            document.addEventListener('click', function (evento) {
+                var boton = evento.target.closest('.boton-agregar');
+                if (boton && porSku[boton.dataset.sku]) {
+                    guardarCarrito(agregarAlCarrito(leerCarrito(), porSku[boton.dataset.sku]));
+                }
+            });
+            var panel = document.getElementById('panel-carrito');
+            document.getElementById('carrito-flotante').addEventListener('click', function () { panel.showModal(); });
+            document.getElementById('cerrar-carrito').addEventListener('click', function () { panel.close(); });
+            document.getElementById('vaciar-carrito').addEventListener('click', function () { guardarCarrito([]); });
+            // El carrito se comparte entre pestañas
+            window.addEventListener('storage', function (e) {
+                if (e.key === CLAVE_CARRITO) { dibujarCarrito(leerCarrito()); }
+            });
+            guardarCarrito(reconciliar(leerCarrito()));
+        });
+    }
+
+    // Como validar_carrito(): precio y stock del export vigente; lo agotado sale del carrito
+    function reconciliar(carrito) {
+        return carrito.filter(function (item) { return porSku[item.sku]; }).map(function (item) {
+            var producto = porSku[item.sku];
+            item.precio = producto.precio_soles;
+            item.stock_disponible = producto.stock_actual;
+            item.cantidad = Math.min(item.cantidad, producto.stock_actual);
+            return item;
+        });
+    }
+
+    document.addEventListener('DOMContentLoaded', iniciar);
+})();
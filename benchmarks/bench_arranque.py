@@ -0,0 +1,96 @@
+"""
+BENCHMARK DE ARRANQUE - Arranque en frío y costo por rerun
+==========================================================
+
+Mide, para cada app de Streamlit:
+  1. Importación en frío: tiempo de un proceso nuevo que solo importa el módulo
+     (sin ejecutar main()), como referencia del costo de los imports top-level.
+  2. Primera ejecución: AppTest corre el script completo una vez.
+  3. Rerun: mediana de N reruns sobre la misma sesión (caches ya calientes).
+
+Los scripts se pasan como argumento, así se puede comparar una versión anterior
+contra la actual. Cada script se mide en procesos propios con su carpeta como
+raíz (sys.path y directorio de trabajo): una copia de otro commit importa sus
+propios módulos y lee su propio .streamlit/secrets.toml.
+
+Las apps leen st.secrets; desde fake_supabase.py basta NANCY_FAKE_SUPABASE=<filas>.
+Para comparar contra versiones anteriores al fake, las dos copias deben
+apuntar al mismo PostgREST de prueba en su secrets.toml.
+
+USO:
+    python benchmarks/bench_arranque.py admin_panel.py catalogo_publico.py --reruns 20
+    git worktree add /tmp/nancy-antes <commit>
+    python benchmarks/bench_arranque.py /tmp/nancy-antes/admin_panel.py admin_panel.py
+
+REQUISITOS:
+pip install streamlit
+"""
+
+import sys
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+
+
+def en_proceso_nuevo(script, codigo, timeout=None):
+    """Ejecuta `codigo` en un intérprete nuevo con la carpeta del script como raíz; retorna la última línea."""
+    raiz = script.parent
+    salida = subprocess.run(
+        [sys.executable, "-c", f"import sys\nsys.path.insert(0, {str(raiz)!r})\n{codigo}"],
+        cwd=raiz, capture_output=True, text=True, check=True, timeout=timeout
+    )
+    return salida.stdout.strip().splitlines()[-1]
+
+
+def importacion_en_frio(script, repeticiones):
+    """Mediana en ms de importar el script en un intérprete nuevo."""
+    codigo = (
+        "import time, runpy\n"
+        "inicio = time.perf_counter()\n"
+        f"runpy.run_path({str(script)!r}, run_name='bench_import')\n"
+        "print((time.perf_counter() - inicio) * 1000)\n"
+    )
+    return statistics.median(float(en_proceso_nuevo(script, codigo)) for _ in range(repeticiones))
+
+
+def ejecuciones(script, reruns, timeout):
+    """(ms primera ejecución, ms mediana por rerun) usando AppTest."""
+    codigo = (
+        "import time, statistics\n"
+        "from streamlit.testing.v1 import AppTest\n"
+        f"app = AppTest.from_file({str(script)!r}, default_timeout={timeout})\n"
+        # admin_panel pide contraseña: se marca la sesión como autenticada
+        "app.session_state['password_correct'] = True\n"
+        "inicio = time.perf_counter()\n"
+        "app.run()\n"
+        "primera = (time.perf_counter() - inicio) * 1000\n"
+        "tiempos = []\n"
+        f"for _ in range({reruns}):\n"
+        "    inicio = time.perf_counter()\n"
+        "    app.run()\n"
+        "    tiempos.append((time.perf_counter() - inicio) * 1000)\n"
+        "print(primera, statistics.median(tiempos))\n"
+    )
+    primera, rerun = en_proceso_nuevo(script, codigo).split()
+    return float(primera), float(rerun)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Arranque en frío y costo por rerun de las apps")
+    parser.add_argument("scripts", nargs="+", type=Path, help="Scripts de Streamlit a medir")
+    parser.add_argument("--reruns", type=int, default=20)
+    parser.add_argument("--importaciones", type=int, default=5, help="Procesos nuevos para la importación en frío")
+    parser.add_argument("--timeout", type=float, default=60)
+    args = parser.parse_args()
+
+    print(f"{'Script':<32} {'Import (ms)':>12} {'1a ejec. (ms)':>14} {'Rerun (ms)':>12}")
+    for script in args.scripts:
+        script = script.resolve()
+        importacion = importacion_en_frio(script, args.importaciones)
+        primera, rerun = ejecuciones(script, args.reruns, args.timeout)
+        print(f"{script.name:<32} {importacion:>12.1f} {primera:>14.1f} {rerun:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+BENCHMARK DE CARRITOS - Escritura directa vs diferida
+=====================================================
+
+Simula sesiones que hacen clics en el carrito (agregar, cambiar cantidades) y
+mide cuánto espera cada clic por la persistencia:
+
+  - Directa: cada clic escribe su carrito en SQLite (una transacción por clic).
+  - Diferida: carritos.CarritosPersistentes solo anota el cambio; el hilo de
+    fondo escribe todo lo pendiente en un lote.
+
+Al final comprueba que lo guardado coincide con el último estado de cada
+carrito y reporta el tamaño de la forma compacta {sku: cantidad}.
+
+USO:
+    python benchmarks/bench_carritos.py --sesiones 50 --clics 40
+"""
+
+import sys
+import time
+import random
+import argparse
+import tempfile
+import threading
+import statistics
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from carritos import AlmacenSQLite, CarritosPersistentes, deserializar, serializar  # noqa: E402
+
+
+def simular(persistir, sesiones, clics):
+    """Latencias (ms) de persistir en cada clic y estado final de cada carrito."""
+    latencias, finales = [], {}
+    candado = threading.Lock()
+
+    def sesion(numero):
+        rng = random.Random(numero)
+        token = f"token-{numero:04d}"
+        carrito = {}
+        for _ in range(clics):
+            sku = f"NC-{rng.randrange(5000):07d}-Negro"
+            carrito[sku] = carrito.get(sku, 0) + 1
+            inicio = time.perf_counter()
+            persistir(token, dict(carrito))
+            with candado:
+                latencias.append((time.perf_counter() - inicio) * 1000)
+            time.sleep(rng.uniform(0, 0.02))
+        finales[token] = carrito
+
+    hilos = [threading.Thread(target=sesion, args=(i,)) for i in range(sesiones)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    return latencias, finales
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latencia de clic con persistencia directa o diferida")
+    parser.add_argument("--sesiones", type=int, default=50)
+    parser.add_argument("--clics", type=int, default=40)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directo = AlmacenSQLite(Path(tmp) / "directo.sqlite3")
+        diferido = CarritosPersistentes(AlmacenSQLite(Path(tmp) / "diferido.sqlite3"), retardo=0.5)
+
+        print(f"{args.sesiones} sesiones x {args.clics} clics\n")
+        print(f"{'Persistencia':<12} {'p50 (ms)':>9} {'p99 (ms)':>9} {'Máx (ms)':>9}")
+        for nombre, persistir in (
+            ("Directa", lambda token, c: directo.escribir_lote({token: serializar(c)})),
+            ("Diferida", diferido.guardar),
+        ):
+            latencias, finales = simular(persistir, args.sesiones, args.clics)
+            latencias.sort()
+            print(f"{nombre:<12} {statistics.median(latencias):>9.3f} "
+                  f"{latencias[int(len(latencias) * 0.99)]:>9.3f} {latencias[-1]:>9.3f}")
+
+        diferido.vaciar_pendientes()
+        guardados = {token: deserializar(diferido.almacen.leer(token)) for token in finales}
+        ok = guardados == finales
+        tamano = statistics.mean(len(serializar(c)) for c in finales.values())
+        print(f"\n{'✓' if ok else '❌'} Lo guardado coincide con el último estado de los {len(finales)} carritos")
+        print(f"Tamaño medio guardado: {tamano:.0f} bytes por carrito "
+              f"({statistics.mean(len(c) for c in finales.values()):.0f} productos)")
+        if not ok:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+BENCHMARK DE IMPORTACIÓN / EXPORTACIÓN - Archivos grandes del catálogo
+======================================================================
+
+Importación: genera una lista de precios de proveedor (CSV con ';' y coma
+decimal, como la exporta Excel en español) sobre un catálogo sintético, con
+un porcentaje de precios cambiados, SKUs nuevos y algunas filas inválidas.
+Mide catalog_io.planificar_importacion() (lectura por bloques + validación +
+diferencias vectorizadas) y el pico de memoria, y aplica el plan contra el
+Supabase en memoria contando requests. Antes de aplicar, una "sincronización
+del ERP" modifica algunos productos del plan: se comprueba que
+revisar_conflictos() los marca y que al guardar vuelven como conflicto sin
+pisarse. Con openpyxl instalado mide también el mismo archivo en XLSX.
+
+Exportación: catalog_io.exportar_catalogo() a CSV y Parquet contra el fake,
+comparando el pico de memoria con armar el DataFrame completo y exportarlo.
+
+USO:
+    python benchmarks/bench_catalog_io.py --filas 100000
+    python benchmarks/bench_catalog_io.py --filas 100000 --exportar 20000 --xlsx
+
+REQUISITOS:
+    pandas, pyarrow (Parquet), openpyxl (solo con --xlsx)
+"""
+
+import io
+import sys
+import time
+import argparse
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from catalog_io import (  # noqa: E402
+    aplicar_importacion, exportar_catalogo, leer_bloques, planificar_importacion, revisar_conflictos,
+)
+from catalog_queries import COLUMNAS_TABLA_ADMIN, TABLA_CATALOGO, cargar_catalogo  # noqa: E402
+from fake_supabase import SupabaseFake, filas_sinteticas  # noqa: E402
+
+
+def medir(funcion):
+    """(resultado, segundos, pico de memoria en MB).
+
+    Se ejecuta dos veces: tracemalloc hace mucho más lento el código con
+    muchos objetos chicos, así que el tiempo se mide en una corrida sin él.
+    """
+    inicio = time.perf_counter()
+    funcion()
+    segundos = time.perf_counter() - inicio
+    tracemalloc.start()
+    resultado = funcion()
+    pico = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    return resultado, segundos, pico
+
+
+def lista_proveedor(catalogo, cambios, nuevos):
+    """Lista con todos los SKUs: `cambios` de ellos con otro precio, `nuevos` SKUs nuevos y 3 filas inválidas."""
+    lista = catalogo[['sku', 'modelo', 'precio_soles', 'stock_actual']].rename(
+        columns={'sku': 'Código', 'modelo': 'Modelo', 'precio_soles': 'Precio', 'stock_actual': 'Stock'})
+    paso = max(1, len(lista) // max(cambios, 1))
+    lista.loc[lista.index[::paso][:cambios], 'Precio'] += 5
+    lista = pd.concat([lista, pd.DataFrame({
+        'Código': [f"NC-NUEVO-{i:06d}" for i in range(nuevos)],
+        'Modelo': 'Vestido Temporada', 'Precio': 119.9, 'Stock': 6,
+    })], ignore_index=True)
+    lista['Stock'] = lista['Stock'].astype(object)
+    lista.loc[1, 'Stock'] = 'diez'
+    lista.loc[2, 'Código'] = ''
+    lista.loc[3, 'Precio'] = -1
+    return lista
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Importación y exportación de archivos grandes")
+    parser.add_argument("--filas", type=int, default=100_000, help="Productos del catálogo y del archivo")
+    parser.add_argument("--cambios", type=float, default=0.10, help="Fracción de precios cambiados")
+    parser.add_argument("--nuevos", type=int, default=1000)
+    parser.add_argument("--conflictos", type=int, default=5, help="Productos que el ERP modifica antes de guardar")
+    parser.add_argument("--exportar", type=int, default=20_000, help="Productos del catálogo a exportar")
+    parser.add_argument("--xlsx", action="store_true", help="Medir también el archivo en XLSX (openpyxl)")
+    args = parser.parse_args()
+
+    filas = filas_sinteticas(args.filas)
+    catalogo = pd.DataFrame(filas)[COLUMNAS_TABLA_ADMIN.split(',')]
+    lista = lista_proveedor(catalogo, int(args.filas * args.cambios), args.nuevos)
+
+    archivos = {}
+    csv = io.BytesIO()
+    lista.to_csv(csv, sep=';', decimal=',', index=False, encoding='utf-8-sig')
+    archivos['lista.csv'] = csv.getvalue()
+    if args.xlsx:
+        xlsx = io.BytesIO()
+        lista.to_excel(xlsx, index=False)
+        archivos['lista.xlsx'] = xlsx.getvalue()
+
+    print(f"Importación: {len(lista):,} filas contra un catálogo de {args.filas:,}\n")
+    print(f"{'Archivo':<12} {'MB':>6} {'Tiempo (s)':>11} {'Pico (MB)':>10} {'Nuevos':>8} {'Cambios':>8} {'Errores':>8}")
+    for nombre, contenido in archivos.items():
+        plan, segundos, pico = medir(lambda: planificar_importacion(leer_bloques(io.BytesIO(contenido), nombre), catalogo))
+        print(f"{nombre:<12} {len(contenido) / 1e6:>6.1f} {segundos:>11.2f} {pico:>10.1f} "
+              f"{plan['nuevos']:>8,} {plan['actualizados']:>8,} {len(plan['errores']):>8,}")
+
+    cliente = SupabaseFake({TABLA_CATALOGO: filas})
+    # El ERP sincroniza algunos productos del plan entre la lectura y el guardado
+    cambios = plan['cambios']
+    pisadas = cambios.loc[cambios['accion'].eq('actualizar'), 'sku'].head(args.conflictos).tolist()
+    if pisadas:
+        cliente.table(TABLA_CATALOGO).update({'stock_actual': 0}).in_('sku', pisadas).execute()
+    marcadas = revisar_conflictos(cliente, plan)
+
+    llamadas = cliente.llamadas
+    inicio = time.perf_counter()
+    resultado = aplicar_importacion(cliente, plan)
+    segundos = time.perf_counter() - inicio
+    print(f"\nAplicar: {resultado['guardadas']:,} filas en {cliente.llamadas - llamadas} requests ({segundos:.2f} s), "
+          f"{len(resultado['conflictos'])} en conflicto ({marcadas} marcadas en la vista previa)")
+    actuales = {f['sku']: f['stock_actual'] for f in cliente.tablas[TABLA_CATALOGO]}
+    ok = (plan['nuevos'] == args.nuevos and plan['actualizados'] == int(args.filas * args.cambios)
+          and len(plan['errores']) == 3
+          and marcadas == len(pisadas) and sorted(resultado['conflictos']) == sorted(pisadas)
+          and all(actuales[sku] == 0 for sku in pisadas)
+          and resultado['guardadas'] == len(cambios) - len(pisadas))
+
+    cliente = SupabaseFake({TABLA_CATALOGO: filas_sinteticas(args.exportar)})
+    print(f"\nExportación: {args.exportar:,} productos\n")
+    print(f"{'Método':<28} {'MB':>6} {'Tiempo (s)':>11} {'Pico (MB)':>10}")
+    def exportar(formato):
+        destino = io.BytesIO()
+        return exportar_catalogo(cliente, destino, formato), destino
+
+    def exportar_dataframe():
+        destino = io.BytesIO()
+        pd.DataFrame(cargar_catalogo(cliente)).to_csv(destino, index=False)
+        return destino
+
+    for formato in ('csv', 'parquet'):
+        (escritas, destino), segundos, pico = medir(lambda: exportar(formato))
+        # El pico incluye el archivo generado (BytesIO); con una ruta va directo a disco
+        pico -= len(destino.getvalue()) / 1e6
+        print(f"{'Páginas → ' + formato:<28} {len(destino.getvalue()) / 1e6:>6.1f} {segundos:>11.2f} {pico:>10.1f}")
+        ok &= escritas == args.exportar
+
+    destino, segundos, pico = medir(exportar_dataframe)
+    pico -= len(destino.getvalue()) / 1e6
+    print(f"{'DataFrame completo → csv':<28} {len(destino.getvalue()) / 1e6:>6.1f} {segundos:>11.2f} {pico:>10.1f}")
+
+    print(f"\n{'✓' if ok else '❌'} Conteos de la importación (con conflictos) y la exportación")
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
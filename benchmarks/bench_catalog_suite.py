@@ -0,0 +1,107 @@
+"""
+SUITE DE BENCHMARKS DEL CATÁLOGO (pytest-benchmark)
+====================================================
+
+Mide los caminos calientes de ambas apps sobre catálogos sintéticos de
+generate_catalog_data.py (distribuciones sesgadas de modelo/color/talla/stock):
+
+  - carga:      filas JSON de PostgREST -> DataFrame ordenado (load_catalog_data)
+  - filtros:    filtrar_catalogo() con las combinaciones de las apps
+  - facetas:    opciones de los selectbox y conteos por faceta
+  - métricas:   metricas_inventario() (resumen rápido y analytics)
+  - render:     preparación de la tabla admin y de los badges de stock
+
+Tamaños por defecto: 10k y 100k SKUs. BENCH_TAMANOS=10000,100000,1000000
+agrega el de 1M.
+
+USO (el archivo no sigue el patrón test_*, se pasa explícitamente):
+    pytest benchmarks/bench_catalog_suite.py --benchmark-autosave \\
+        --benchmark-storage=file://benchmarks/resultados
+    # Comparar contra la última corrida guardada y fallar si algo empeora >10%
+    pytest benchmarks/bench_catalog_suite.py --benchmark-storage=file://benchmarks/resultados \\
+        --benchmark-compare --benchmark-compare-fail=median:10%
+
+REQUISITOS:
+pip install pytest pytest-benchmark numpy pandas
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from catalog_metrics import (  # noqa: E402
+    conteo_facetas,
+    estado_stock,
+    filtrar_catalogo,
+    metricas_inventario,
+    opciones_filtro,
+    preparar_tabla_admin,
+)
+from catalog_queries import COLUMNAS_TABLA_ADMIN  # noqa: E402
+from generate_catalog_data import generate_synthetic_catalog  # noqa: E402
+
+TAMANOS = [int(t) for t in os.getenv("BENCH_TAMANOS", "10000,100000").split(",")]
+
+# Productos que se dibujan en una página de la galería
+PRODUCTOS_EN_PANTALLA = 200
+
+
+@pytest.fixture(scope="module", params=TAMANOS, ids=lambda n: f"{n // 1000}k")
+def catalogo(request):
+    """DataFrame sintético con las columnas de la tabla admin (uno por tamaño)."""
+    df = generate_synthetic_catalog(request.param)
+    # El generador emite las columnas de COPY; updated_at (versión de la edición
+    # por lotes) la pone la base, aquí un timestamp fijo con el mismo formato
+    df = df.assign(updated_at='2025-01-01T00:00:00+00:00')
+    return df[COLUMNAS_TABLA_ADMIN.split(',')]
+
+
+def test_carga(benchmark, catalogo):
+    import pandas as pd
+
+    # Lo que hace load_catalog_data() con las páginas ya recibidas
+    filas = catalogo.to_dict('records')
+    df = benchmark(
+        lambda: pd.DataFrame(filas).sort_values(['modelo', 'talla'], kind='stable').reset_index(drop=True)
+    )
+    assert len(df) == len(catalogo)
+
+
+@pytest.mark.parametrize("filtros", [
+    {'modelo': 'Vestido'},
+    {'modelo': 'Vestido', 'color': 'Negro', 'talla': 'M'},
+    {'color': 'Morado', 'stock_minimo': 10},
+], ids=["modelo", "modelo+color+talla", "color_raro+stock"])
+def test_filtros(benchmark, catalogo, filtros):
+    resultado = benchmark(filtrar_catalogo, catalogo, **filtros)
+    assert len(resultado) <= len(catalogo)
+
+
+def test_opciones_filtro(benchmark, catalogo):
+    opciones = benchmark(lambda: [opciones_filtro(catalogo, c) for c in ('modelo', 'color', 'talla')])
+    assert all(o[0] == 'Todos' for o in opciones)
+
+
+def test_conteo_facetas(benchmark, catalogo):
+    facetas = benchmark(conteo_facetas, catalogo)
+    assert facetas['modelo'].sum() == len(catalogo)
+
+
+def test_metricas(benchmark, catalogo):
+    metricas = benchmark(metricas_inventario, catalogo)
+    assert metricas['total_productos'] == len(catalogo)
+
+
+def test_preparar_tabla_admin(benchmark, catalogo):
+    tabla = benchmark(preparar_tabla_admin, catalogo)
+    assert list(tabla.columns)[0] == 'Imagen'
+
+
+def test_badges_galeria(benchmark, catalogo):
+    pagina = catalogo.head(PRODUCTOS_EN_PANTALLA)
+    badges = benchmark(lambda: [estado_stock(s) for s in pagina['stock_actual']])
+    assert len(badges) == len(pagina)
@@ -0,0 +1,93 @@
+"""
+BENCHMARK DE CONSULTAS CONCURRENTES - Secuencial vs asyncio
+===========================================================
+
+Compara la carga del catálogo con cargar_catalogo() (páginas una tras otra)
+contra consultas_async.cargar_catalogo_concurrente() (rangos keyset en
+paralelo), más una página típica que además valida el stock del carrito,
+contra el Supabase en memoria de fake_supabase.py con latencia simulada.
+Comprueba que ambas rutas devuelven exactamente las mismas filas.
+
+Se miden la primera carga del proceso (cortes muestreados con un conteo y una
+clave por rango) y las siguientes (cortes de la carga anterior).
+
+USO:
+    python benchmarks/bench_consultas_async.py --filas 20000 --latencia-ms 80
+
+REQUISITOS:
+pip install pandas
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from catalog_queries import (  # noqa: E402
+    COLUMNAS_GALERIA_PUBLICA,
+    TABLA_CATALOGO,
+    cargar_catalogo,
+    stock_por_sku,
+)
+import consultas_async  # noqa: E402
+from consultas_async import (  # noqa: E402
+    ClienteHilos,
+    cargar_catalogo_async,
+    cargar_catalogo_concurrente,
+    cortes_catalogo,
+    en_paralelo,
+    stock_por_sku_async,
+)
+from fake_supabase import PerfilRed, SupabaseFake, filas_sinteticas  # noqa: E402
+
+
+def cronometrar(funcion):
+    inicio = time.perf_counter()
+    resultado = funcion()
+    return resultado, (time.perf_counter() - inicio) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Carga secuencial vs concurrente del catálogo")
+    parser.add_argument("--filas", type=int, default=20_000)
+    parser.add_argument("--latencia-ms", type=float, default=80)
+    parser.add_argument("--carrito", type=int, default=10, help="Productos en el carrito a validar")
+    args = parser.parse_args()
+
+    cliente = SupabaseFake({TABLA_CATALOGO: filas_sinteticas(args.filas)}, PerfilRed(latencia_ms=args.latencia_ms))
+    asincrono = ClienteHilos(cliente)
+    skus = tuple(f['sku'] for f in cliente.tablas[TABLA_CATALOGO][:args.carrito])
+    carga = dict(columnas=COLUMNAS_GALERIA_PUBLICA, solo_disponibles=True)
+
+    secuencial, ms_secuencial = cronometrar(lambda: cargar_catalogo(cliente, **carga))
+    consultas_async._cortes_previos.clear()
+    primera, ms_primera = cronometrar(lambda: cargar_catalogo_concurrente(asincrono, **carga))
+    concurrente, ms_concurrente = cronometrar(lambda: cargar_catalogo_concurrente(asincrono, **carga))
+
+    cortes = cortes_catalogo(concurrente)
+    _, ms_pagina_secuencial = cronometrar(lambda: (cargar_catalogo(cliente, **carga), stock_por_sku(cliente, skus)))
+    _, ms_pagina_concurrente = cronometrar(lambda: en_paralelo(
+        filas=cargar_catalogo_async(asincrono, cortes=cortes, **carga),
+        stock=stock_por_sku_async(asincrono, skus),
+    ))
+
+    print(f"{args.filas:,} filas, {args.latencia_ms:.0f} ms por request, {len(cortes) + 1} rangos\n")
+    print(f"{'Carga':<28} {'Secuencial (ms)':>16} {'Concurrente (ms)':>17} {'Mejora':>8}")
+    for nombre, antes, despues in (
+        ("Primera carga (muestreo)", ms_secuencial, ms_primera),
+        ("Catálogo completo", ms_secuencial, ms_concurrente),
+        ("Catálogo + stock carrito", ms_pagina_secuencial, ms_pagina_concurrente),
+    ):
+        print(f"{nombre:<28} {antes:>16.0f} {despues:>17.0f} {antes / despues:>7.1f}x")
+
+    claves = [(f['modelo'], f['sku']) for f in secuencial]
+    iguales = all(claves == [(f['modelo'], f['sku']) for f in filas] for filas in (primera, concurrente))
+    print(f"\n{'✓' if iguales else '❌'} Mismas filas y mismo orden ({len(concurrente):,})")
+    if not iguales:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+BENCHMARK DE EDICIÓN - Fila por fila vs lote con concurrencia optimista
+=======================================================================
+
+Edita N filas del catálogo (stock y precio) contra el Supabase en memoria con
+latencia de red simulada y mide el tiempo de guardado:
+
+  - Fila por fila: un update ... eq(sku) por producto (como editar en la UI de Supabase).
+  - Lote: edicion_catalogo.aplicar_cambios(), una sola llamada RPC.
+
+Antes del lote, una "sincronización del ERP" modifica algunas de las filas
+editadas: se comprueba que vuelven como conflicto sin pisarse y que el resto
+del lote sí se guardó.
+
+USO:
+    python benchmarks/bench_edicion_lote.py --filas 500 --latencia-ms 60
+
+REQUISITOS:
+    pandas
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from catalog_queries import COLUMNAS_TABLA_ADMIN, TABLA_CATALOGO, cargar_catalogo  # noqa: E402
+from edicion_catalogo import COLUMNAS_EDITABLES, aplicar_cambios, cambios_editados  # noqa: E402
+from fake_supabase import PerfilRed, SupabaseFake, filas_sinteticas  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Guardado de ediciones fila por fila vs en lote")
+    parser.add_argument("--productos", type=int, default=5000)
+    parser.add_argument("--filas", type=int, default=500, help="Filas editadas")
+    parser.add_argument("--latencia-ms", type=float, default=60)
+    parser.add_argument("--conflictos", type=int, default=5, help="Filas que el ERP modifica antes de guardar")
+    args = parser.parse_args()
+
+    cliente = SupabaseFake({TABLA_CATALOGO: filas_sinteticas(args.productos)})
+    df = pd.DataFrame(cargar_catalogo(cliente, columnas=COLUMNAS_TABLA_ADMIN))
+    original = df.set_index('sku')[COLUMNAS_EDITABLES + ['updated_at']]
+    editado = original.copy()
+    editado.iloc[:args.filas, editado.columns.get_loc('stock_actual')] += 1
+    cambios = cambios_editados(original, editado)
+
+    cliente.perfil = PerfilRed(latencia_ms=args.latencia_ms)
+    print(f"{len(cambios)} filas editadas, latencia {args.latencia_ms:.0f} ms por request\n")
+    print(f"{'Guardado':<14} {'Requests':>9} {'Tiempo (s)':>11}")
+
+    llamadas = cliente.llamadas
+    inicio = time.perf_counter()
+    for cambio in cambios:
+        cliente.table(TABLA_CATALOGO).update({
+            'precio_soles': cambio['precio_soles'], 'stock_actual': cambio['stock_actual'],
+        }).eq('sku', cambio['sku']).execute()
+    print(f"{'Fila por fila':<14} {cliente.llamadas - llamadas:>9} {time.perf_counter() - inicio:>11.2f}")
+
+    # Las versiones leídas quedaron viejas: se vuelve a leer, como haría el panel
+    cliente.perfil = PerfilRed()
+    df = pd.DataFrame(cargar_catalogo(cliente, columnas=COLUMNAS_TABLA_ADMIN))
+    original = df.set_index('sku')[COLUMNAS_EDITABLES + ['updated_at']]
+    editado = original.copy()
+    editado.iloc[:args.filas, editado.columns.get_loc('stock_actual')] += 1
+    cambios = cambios_editados(original, editado)
+
+    # El ERP sincroniza algunas de esas filas entre la lectura y el guardado
+    pisadas = [cambio['sku'] for cambio in cambios[:args.conflictos]]
+    if pisadas:
+        cliente.table(TABLA_CATALOGO).update({'stock_actual': 0}).in_('sku', pisadas).execute()
+
+    cliente.perfil = PerfilRed(latencia_ms=args.latencia_ms)
+    llamadas = cliente.llamadas
+    inicio = time.perf_counter()
+    resultado = aplicar_cambios(cliente, cambios)
+    print(f"{'Lote (RPC)':<14} {cliente.llamadas - llamadas:>9} {time.perf_counter() - inicio:>11.2f}")
+
+    actuales = {f['sku']: f['stock_actual'] for f in cliente.tablas[TABLA_CATALOGO]}
+    ok = (
+        sorted(resultado['conflictos']) == sorted(pisadas)
+        and all(actuales[sku] == 0 for sku in pisadas)
+        and len(resultado['aplicados']) == len(cambios) - len(pisadas)
+        and all(actuales[c['sku']] == c['stock_actual'] for c in cambios if c['sku'] not in pisadas)
+    )
+    print(f"\n{'✓' if ok else '❌'} {len(resultado['aplicados'])} guardadas, "
+          f"{len(resultado['conflictos'])} en conflicto sin pisar lo que escribió el ERP")
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+BENCHMARK DE FRAGMENTOS - Costo por clic en "AGREGAR AL CARRITO"
+================================================================
+
+Compara el trabajo del servidor por clic con 200 productos en pantalla:
+  - Script completo: lo que costaba cada clic cuando el botón llamaba st.rerun()
+    (CSS, header, filtros y el bucle de la galería completa).
+  - Fragmento: lo que cuesta ahora, solo la tarjeta clicada (render_tarjeta)
+    más el carrito flotante.
+
+Se reporta tiempo de pared (latencia percibida en el servidor) y tiempo de CPU
+del proceso, ambos como mediana de N clics. Los productos son sintéticos: el
+catálogo se reemplaza en memoria, sin conexión a Supabase.
+
+USO:
+    python benchmarks/bench_fragmentos.py --productos 200 --clics 30
+
+REQUISITOS:
+pip install streamlit
+"""
+
+import time
+import argparse
+import statistics
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+
+def app_completa(raiz, productos):
+    import sys
+    sys.path.insert(0, raiz)
+
+    import pandas as pd
+    import catalogo_publico
+
+    df = pd.DataFrame([{
+        'sku': f"NC-{i:05d}",
+        'modelo': f"Modelo {i % 9}",
+        'color': 'Negro',
+        'talla': 'M',
+        'precio_soles': 99.0,
+        'stock_actual': 10,
+        'url_foto': None,
+    } for i in range(productos)])
+    catalogo_publico.load_productos = lambda: df
+    catalogo_publico.main()
+
+
+def tarjeta_sola(raiz, productos):
+    import sys
+    sys.path.insert(0, raiz)
+
+    import pandas as pd
+    import streamlit as st
+    import catalogo_publico
+
+    if 'carrito' not in st.session_state:
+        st.session_state.carrito = []
+    prod = pd.Series({
+        'sku': "NC-00000",
+        'modelo': "Modelo 0",
+        'color': 'Negro',
+        'talla': 'M',
+        'precio_soles': 99.0,
+        'stock_actual': 10,
+        'url_foto': None,
+    })
+    catalogo_publico.render_tarjeta(prod, st.empty())
+
+
+def medir_clics(funcion, productos, clics, timeout):
+    """Medianas (ms de pared, ms de CPU) de clicar el botón del primer producto."""
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_function(funcion, args=(str(RAIZ), productos), default_timeout=timeout)
+    app.run()
+
+    pared, cpu = [], []
+    for _ in range(clics):
+        inicio_pared, inicio_cpu = time.perf_counter(), time.process_time()
+        app.button(key="add_NC-00000").click().run()
+        pared.append((time.perf_counter() - inicio_pared) * 1000)
+        cpu.append((time.process_time() - inicio_cpu) * 1000)
+    return statistics.median(pared), statistics.median(cpu)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Costo por clic: script completo vs fragmento")
+    parser.add_argument("--productos", type=int, default=200)
+    parser.add_argument("--clics", type=int, default=30)
+    parser.add_argument("--timeout", type=float, default=60)
+    args = parser.parse_args()
+
+    completo = medir_clics(app_completa, args.productos, args.clics, args.timeout)
+    fragmento = medir_clics(tarjeta_sola, args.productos, args.clics, args.timeout)
+
+    print(f"COSTO POR CLIC ({args.productos} productos, mediana de {args.clics} clics)\n")
+    print(f"{'Ejecución':<18} {'Pared (ms)':>12} {'CPU (ms)':>10}")
+    print(f"{'Script completo':<18} {completo[0]:>12.1f} {completo[1]:>10.1f}")
+    print(f"{'Fragmento':<18} {fragmento[0]:>12.1f} {fragmento[1]:>10.1f}")
+    print(f"\nReducción de CPU por clic: {1 - fragmento[1] / completo[1]:.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+BENCHMARK DE IMÁGENES - Etapa de validación de generate_catalog_data.py
+=======================================================================
+
+Mide cuánto agrega al build el análisis de imágenes (catalog_images.py):
+secuencial contra el pool de procesos, sobre las fotos de catalogo-nancy's/
+repetidas --copias veces para simular un catálogo más grande. Con tantos
+procesos como núcleos, el tiempo debería bajar casi linealmente.
+
+USO:
+    python benchmarks/bench_imagenes.py
+    python benchmarks/bench_imagenes.py --copias 20 --procesos 1,2,4,8
+
+REQUISITOS:
+pip install Pillow numpy
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+
+from catalog_images import analizar_imagenes  # noqa: E402
+
+CATALOGO = RAIZ / "catalogo-nancy's"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tiempo de la etapa de imágenes por cantidad de procesos")
+    parser.add_argument("--copias", type=int, default=5, help="Veces que se repite cada foto")
+    parser.add_argument("--procesos", default=f"1,{os.cpu_count() or 1}", help="Procesos a probar, separados por coma")
+    args = parser.parse_args()
+
+    fotos = sorted(CATALOGO.glob("*.png"))
+    with tempfile.TemporaryDirectory() as tmp:
+        rutas = []
+        for copia in range(args.copias):
+            for foto in fotos:
+                destino = Path(tmp) / f"{copia:03d}-{foto.name}"
+                shutil.copyfile(foto, destino)
+                rutas.append(destino)
+
+        print(f"{len(rutas)} imágenes ({os.cpu_count()} núcleos)\n")
+        print(f"{'Procesos':>8} {'Tiempo (s)':>12} {'ms/imagen':>10}")
+        for procesos in dict.fromkeys(int(p) for p in args.procesos.split(",")):
+            inicio = time.perf_counter()
+            metadatos = analizar_imagenes(rutas, max_procesos=procesos)
+            segundos = time.perf_counter() - inicio
+            print(f"{procesos:>8} {segundos:>12.2f} {segundos * 1000 / len(rutas):>10.1f}")
+
+        duplicadas = sum('duplicada' in m['alertas'] for m in metadatos.values())
+        print(f"\nDuplicadas detectadas: {duplicadas} (esperadas {len(rutas) - len(fotos)})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+BENCHMARK DE LATENCIA - Carga del catálogo bajo condiciones de red simuladas
+============================================================================
+
+Mide cuánto tarda cargar_catalogo() (paginación keyset) contra el Supabase en
+memoria de fake_supabase.py con distintas latencias y anchos de banda. Sirve
+para ver cuánto pesa el número de round-trips frente al tamaño de la
+respuesta, sin depender de la red real. Reproducible: mismas semillas, mismos
+resultados.
+
+USO:
+    python benchmarks/bench_latencia.py --filas 20000
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from catalog_queries import (  # noqa: E402
+    COLUMNAS_GALERIA_PUBLICA,
+    TABLA_CATALOGO,
+    cargar_catalogo,
+)
+from fake_supabase import PerfilRed, SupabaseFake, ErrorFake, filas_sinteticas  # noqa: E402
+
+# (nombre, latencia ms, ancho de banda kbps)
+PERFILES = [
+    ("Local", 0, None),
+    ("Misma región", 15, 100_000),
+    ("Lima -> us-east", 80, 20_000),
+    ("Móvil 4G", 120, 5_000),
+]
+
+
+def medir(filas, perfil, columnas):
+    cliente = SupabaseFake({TABLA_CATALOGO: filas}, perfil)
+    inicio = time.perf_counter()
+    resultado = cargar_catalogo(cliente, columnas=columnas, solo_disponibles=True)
+    total_ms = (time.perf_counter() - inicio) * 1000
+    return total_ms, cliente.espera_ms, cliente.llamadas, cliente.bytes_transferidos, len(resultado)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Carga del catálogo con latencia y ancho de banda simulados")
+    parser.add_argument("--filas", type=int, default=20_000)
+    parser.add_argument("--tasa-error", type=float, default=0.05, help="Tasa de error para la prueba de fallos")
+    args = parser.parse_args()
+
+    filas = filas_sinteticas(args.filas)
+
+    print(f"CARGA DEL CATÁLOGO ({args.filas:,} filas)\n")
+    # "Red" es la espera simulada; la diferencia con "Total" es el trabajo del fake y del cliente
+    print(f"{'Perfil':<18} {'Proyección':<11} {'Requests':>9} {'KB':>9} {'Red (ms)':>10} {'Total (ms)':>11}")
+    for nombre, latencia, ancho_banda in PERFILES:
+        for etiqueta, columnas in (("*", "*"), ("galería", COLUMNAS_GALERIA_PUBLICA)):
+            perfil = PerfilRed(latencia_ms=latencia, ancho_banda_kbps=ancho_banda)
+            total_ms, red_ms, llamadas, tamano, _ = medir(filas, perfil, columnas)
+            print(f"{nombre:<18} {etiqueta:<11} {llamadas:>9} {tamano / 1024:>9,.0f} {red_ms:>10,.0f} {total_ms:>11,.0f}")
+
+    print(f"\nFALLOS INYECTADOS (tasa {args.tasa_error:.0%}, 20 cargas)")
+    fallidas = 0
+    for semilla in range(20):
+        try:
+            medir(filas, PerfilRed(tasa_error=args.tasa_error, semilla=semilla), COLUMNAS_GALERIA_PUBLICA)
+        except ErrorFake:
+            fallidas += 1
+    print(f"Cargas completas fallidas: {fallidas}/20")
+
+
+if __name__ == "__main__":
+    main()
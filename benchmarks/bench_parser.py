@@ -0,0 +1,155 @@
+"""
+BENCHMARK DEL PARSER - Regex + iterdir por código vs parser lineal
+==================================================================
+
+Genera en un directorio temporal una lista de precios grande y un directorio
+con decenas de miles de imágenes (solo la cabecera: PNG en los .png y JPEG en
+los .txt, como las fotos de catalogo-nancy's/), y mide:
+
+  - parse_prices_file() actual: una pasada por línea + índice de imágenes
+    construido con un solo scandir.
+  - La implementación anterior (regex con .*? sobre todo el archivo y un
+    iterdir + lower() de todo el directorio por cada producto), solo en un
+    tamaño reducido porque es O(productos x archivos).
+
+En el tamaño reducido verifica además que ambas producen exactamente los
+mismos productos para las fotos que veía la anterior (solo extensión .png);
+termina con código 1 si no coinciden.
+
+USO:
+    python benchmarks/bench_parser.py --productos 5000 --imagenes 30000
+"""
+
+import re
+import sys
+import time
+import random
+import argparse
+import tempfile
+from pathlib import Path
+from itertools import groupby
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import generate_catalog_data as gcd  # noqa: E402
+from catalog_images import FIRMAS  # noqa: E402
+
+MODELOS = ['Vestido', 'Gabardina', 'Enterizo', 'Conjunto', 'Blazer', 'Blusa Manga Larga', 'Pantalón']
+COLORES = ['azul', 'rojo', 'rosa', 'crema', 'blanca', 'negro', 'verde', 'gris']
+# Basta la firma: el parser detecta el formato por los primeros bytes, no decodifica
+CABECERAS = {formato: firma for firma, formato in FIRMAS}
+
+
+def crear_catalogo(directorio, productos, imagenes, semilla=42):
+    """Escribe precios-catalogo.txt y `imagenes` archivos .png (PNG) / .txt (JPEG) en el directorio."""
+    rng = random.Random(semilla)
+    bloques = []
+    for i in range(productos):
+        codigo = f"{i:04d}"
+        bloque = f"COD {codigo} - {rng.choice(MODELOS)}\n"
+        if rng.random() < 0.5:
+            bloque += "Tallas S, M, L\n"
+        bloques.append(bloque + f"PEN {rng.randint(49, 249)}.00\n")
+    (directorio / "precios-catalogo.txt").write_text("\n".join(bloques), encoding="utf-8")
+
+    for n in range(imagenes):
+        codigo = f"{rng.randrange(productos * 2):04d}"
+        extension, formato = (".png", 'png') if rng.random() < 0.7 else (".txt", 'jpeg')
+        nombre = f"cod{codigo}-{rng.choice(MODELOS).lower()}{rng.choice(COLORES)}{n}{extension}"
+        (directorio / nombre).write_bytes(CABECERAS[formato])
+
+
+def parse_anterior(prices_file, catalog_dir):
+    """Implementación anterior (referencia): regex global + iterdir por producto."""
+    def find_images_for_code(code):
+        images = []
+        code_normalized = code.zfill(4)
+        for file in catalog_dir.iterdir():
+            if file.is_file():
+                filename = file.name.lower()
+                if f"cod{code_normalized}" in filename and file.suffix == '.png':
+                    images.append((file.name, gcd.extract_color_from_filename(filename, code_normalized)))
+        return images
+
+    content = prices_file.read_text(encoding='utf-8')
+    pattern = r'COD\s+(\d+)\s*-\s*([^\n]+)\n(?:Tallas?\s+([^\n]+)\n)?.*?PEN\s+([\d.]+)'
+    products = []
+    seen_codes = {}
+    for match in re.finditer(pattern, content, re.IGNORECASE | re.MULTILINE):
+        code = match.group(1).strip()
+        description = re.sub(r'\s+', ' ', match.group(2).strip()).strip()
+        sizes = match.group(3).strip() if match.group(3) else "Única"
+        price = float(match.group(4).strip())
+        images = find_images_for_code(code)
+        if images:
+            for img_path, color_variant in images:
+                key = f"{code}-{color_variant}"
+                if key not in seen_codes:
+                    products.append((code, description, sizes, price, img_path, color_variant))
+                    seen_codes[key] = True
+        elif code not in seen_codes:
+            products.append((code, description, sizes, price, None, None))
+            seen_codes[code] = True
+    return products
+
+
+def firma(productos):
+    """Campos comparables con la salida de parse_anterior().
+
+    La implementación anterior solo veía los archivos .png: se quedan las
+    variantes con foto .png, y un código que solo tiene fotos JPEG (.txt) vuelve
+    a ser la entrada sin imagen que producía ella.
+    """
+    salida = []
+    for codigo, grupo in groupby(productos, key=lambda p: p['codigo']):
+        grupo = list(grupo)
+        png = [p for p in grupo if p['image_file'] and p['image_file'].lower().endswith('.png')]
+        if png:
+            salida.extend((p['codigo'], p['modelo'], p['talla'], p['precio_soles'], p['image_file'], p['color'])
+                          for p in png)
+        else:
+            p = grupo[0]
+            salida.append((codigo, p['modelo'], p['talla'], p['precio_soles'], None, None))
+    return salida
+
+
+def medir(funcion, *args):
+    inicio = time.perf_counter()
+    resultado = funcion(*args)
+    return (time.perf_counter() - inicio) * 1000, resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parser de la lista de precios: regex vs lineal")
+    parser.add_argument("--productos", type=int, default=5000)
+    parser.add_argument("--imagenes", type=int, default=30000)
+    parser.add_argument("--productos-referencia", type=int, default=500, help="Tamaño para la implementación anterior")
+    parser.add_argument("--imagenes-referencia", type=int, default=3000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        grande = Path(tmp) / "grande"
+        grande.mkdir()
+        crear_catalogo(grande, args.productos, args.imagenes)
+        ms, productos = medir(gcd.parse_prices_file, grande / "precios-catalogo.txt", grande)
+        print(f"Parser lineal: {args.productos:,} productos, {args.imagenes:,} archivos -> "
+              f"{len(productos):,} SKUs en {ms:,.0f} ms")
+
+        chico = Path(tmp) / "chico"
+        chico.mkdir()
+        crear_catalogo(chico, args.productos_referencia, args.imagenes_referencia)
+        precios = chico / "precios-catalogo.txt"
+        ms_nuevo, nuevos = medir(gcd.parse_prices_file, precios, chico)
+        ms_anterior, anteriores = medir(parse_anterior, precios, chico)
+        print(f"\nReferencia: {args.productos_referencia:,} productos, {args.imagenes_referencia:,} archivos")
+        print(f"  Anterior: {ms_anterior:>10,.0f} ms")
+        print(f"  Lineal:   {ms_nuevo:>10,.0f} ms ({ms_anterior / ms_nuevo:,.0f}x)")
+
+        iguales = firma(nuevos) == anteriores
+        print(f"  Mismos productos y orden: {'sí' if iguales else 'NO'}")
+        if not iguales:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
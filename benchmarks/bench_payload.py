@@ -0,0 +1,103 @@
+"""
+BENCHMARK DE PAYLOAD - select('*') vs proyecciones por vista
+=============================================================
+
+Estima los bytes que viajan por cada refresco del catálogo con select('*')
+frente a las proyecciones de catalog_queries.py. Los dos efectos se separan:
+la proyección se compara sin comprimir contra select('*') sin comprimir, y
+comprimida contra select('*') comprimido (httpx pide gzip por defecto, así que
+lo que viaja en realidad es la columna gzip de ambos).
+Las filas sintéticas imitan el formato JSON que devuelve PostgREST.
+
+USO:
+    python benchmarks/bench_payload.py --filas 100000
+"""
+
+import sys
+import gzip
+import json
+import random
+import argparse
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from catalog_queries import (  # noqa: E402
+    COLUMNAS_CATALOGO_PUBLICO,
+    COLUMNAS_GALERIA_PUBLICA,
+    COLUMNAS_TABLA_ADMIN,
+    COLUMNAS_VALIDACION_CARRITO,
+)
+
+MODELOS = ['Vestido', 'Gabardina', 'Enterizo', 'Pantalón Cintura Alta', 'Blusa Manga Larga',
+           'Conjunto', 'Blazer Catalan', 'Polo Lame', 'Vestisaco']
+COLORES = ['Negro', 'Blanco', 'Azul', 'Rojo', 'Rosa', 'Crema', 'Beige', 'Verde']
+TALLAS = ['S', 'M', 'L', 'S, M, L', 'Única']
+FRASES = ['Tela satén Monterrey de caída suave.', 'Corte entallado con cierre invisible.',
+          'Forro interior y acabado a mano.', 'Ideal para eventos de día y noche.',
+          'Lavar a mano con agua fría.', 'Confeccionado en Lima, Perú.']
+
+URL_BASE = "https://tuproyecto.supabase.co/storage/v1/object/public/product-images/"
+
+
+def fila_sintetica(i, rng):
+    modelo = rng.choice(MODELOS)
+    color = rng.choice(COLORES)
+    talla = rng.choice(TALLAS)
+    fecha = datetime(2025, 1, 1) + timedelta(minutes=rng.randint(0, 500_000))
+    sku = f"NC-{i:07d}-{color}"
+    return {
+        'id': i,
+        'sku': sku,
+        'modelo': modelo,
+        'descripcion': f"{modelo} {color} - Tallas {talla}. " + " ".join(rng.sample(FRASES, 4)),
+        'talla': talla,
+        'color': color,
+        'precio_soles': round(rng.uniform(49, 249), 2),
+        'stock_actual': rng.randint(0, 40),
+        'url_foto': f"{URL_BASE}{sku}-cod{i:04d}-{modelo.lower().replace(' ', '')}.png",
+        'updated_at': fecha.isoformat() + "+00:00",
+        'created_at': fecha.isoformat() + "+00:00",
+    }
+
+
+def medir(filas, columnas):
+    """Retorna (bytes JSON, bytes gzip) de la respuesta con la proyección dada."""
+    if columnas != '*':
+        campos = columnas.split(',')
+        filas = [{c: f[c] for c in campos} for f in filas]
+    cuerpo = json.dumps(filas, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return len(cuerpo), len(gzip.compress(cuerpo, compresslevel=6))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bytes por refresco: select('*') vs proyecciones")
+    parser.add_argument("--filas", type=int, default=100_000)
+    parser.add_argument("--semilla", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.semilla)
+    filas = [fila_sintetica(i, rng) for i in range(1, args.filas + 1)]
+    disponibles = [f for f in filas if f['stock_actual'] > 0]
+
+    vistas = [
+        ("Galería pública", disponibles, '*', COLUMNAS_GALERIA_PUBLICA),
+        ("Catálogo público + búsq.", disponibles, '*', COLUMNAS_CATALOGO_PUBLICO),
+        ("Tabla admin", filas, '*', COLUMNAS_TABLA_ADMIN),
+        ("Validación carrito (5)", filas[:5], '*', COLUMNAS_VALIDACION_CARRITO),
+    ]
+
+    print(f"BYTES POR REFRESCO ({args.filas:,} filas)\n")
+    print(f"{'':<24} {'---------- sin comprimir ----------':>36} {'-------------- gzip ---------------':>36}")
+    print(f"{'Vista':<24} {'select(*)':>12} {'proyección':>12} {'Reducción':>10}"
+          f" {'select(*)':>12} {'proyección':>12} {'Reducción':>10}")
+    for nombre, datos, antes, despues in vistas:
+        bytes_antes, gzip_antes = medir(datos, antes)
+        bytes_despues, gzip_despues = medir(datos, despues)
+        print(f"{nombre:<24} {bytes_antes:>12,} {bytes_despues:>12,} {1 - bytes_despues / bytes_antes:>9.1%}"
+              f" {gzip_antes:>12,} {gzip_despues:>12,} {1 - gzip_despues / gzip_antes:>9.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+BENCHMARK DE PICO DE TRÁFICO - Con y sin pasarela de datos
+==========================================================
+
+Simula el minuto después de publicar el catálogo en Instagram: cientos de
+sesiones llegan en pocos segundos, cargan el catálogo (snapshot compartido)
+y hacen varias acciones de carrito, cada una validando el stock del carrito
+contra el Supabase en memoria de fake_supabase.py, que responde 429 por
+encima de --limite-rps requests por segundo.
+
+  - Sin pasarela: cada validación va directo a Supabase (con una cache TTL
+    por carrito como st.cache_data, que no junta misses simultáneos); un
+    429 deja el carrito sin validar.
+  - Con pasarela_datos.PasarelaDatos: single-flight + cubeta de tokens por
+    debajo del límite; lo que no consigue turno se valida con el snapshot.
+
+USO:
+    python benchmarks/bench_pico.py --sesiones 300 --ventana 10 --limite-rps 30
+
+REQUISITOS:
+pip install pandas
+"""
+
+import sys
+import time
+import random
+import argparse
+import threading
+import statistics
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cache_snapshot import CacheSnapshot  # noqa: E402
+from catalog_queries import COLUMNAS_GALERIA_PUBLICA, TABLA_CATALOGO, cargar_catalogo, stock_por_sku  # noqa: E402
+from fake_supabase import PerfilRed, SupabaseFake, filas_sinteticas  # noqa: E402
+from pasarela_datos import PasarelaDatos, SupabaseSaturado  # noqa: E402
+
+TTL_STOCK = 30
+PRODUCTOS_POPULARES = 100
+
+
+class CacheTTL:
+    """Como st.cache_data(ttl=...): por clave, sin juntar misses simultáneos ni cachear excepciones."""
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self.valores = {}
+
+    def obtener(self, clave, funcion):
+        valor, vence = self.valores.get(clave, (None, 0.0))
+        if time.time() < vence:
+            return valor
+        valor = funcion()
+        self.valores[clave] = (valor, time.time() + self.ttl)
+        return valor
+
+
+def simular(args, con_pasarela):
+    perfil = PerfilRed(latencia_ms=args.latencia_ms, jitter_ms=args.latencia_ms / 4, semilla=1,
+                       limite_rps=args.limite_rps)
+    cliente = SupabaseFake({TABLA_CATALOGO: filas_sinteticas(args.filas)}, perfil)
+    snapshot = CacheSnapshot('pico', lambda: pd.DataFrame(cargar_catalogo(
+        cliente, columnas=COLUMNAS_GALERIA_PUBLICA, solo_disponibles=True)), ttl=300)
+    pasarela = PasarelaDatos(args.rps, args.rafaga, args.espera_ms)
+    cache_stock = CacheTTL(TTL_STOCK)
+    populares = [f['sku'] for f in cliente.tablas[TABLA_CATALOGO] if f['stock_actual'] > 0][:PRODUCTOS_POPULARES]
+
+    resultados = {'supabase': 0, 'snapshot': 0, 'sin_validar': 0}
+    latencias = []
+    candado = threading.Lock()
+
+    def consultar_stock(skus):
+        if con_pasarela:
+            return pasarela.consultar(('stock_carrito', skus), lambda: stock_por_sku(cliente, skus))
+        return stock_por_sku(cliente, skus)
+
+    def validar(skus):
+        # Como load_stock_carrito: la cache va por fuera, solo los misses llegan a la pasarela
+        try:
+            cache_stock.obtener(skus, lambda: consultar_stock(skus))
+            return 'supabase'
+        except SupabaseSaturado:
+            df = snapshot.obtener()
+            df.loc[df['sku'].isin(skus), ['sku', 'stock_actual', 'precio_soles']].to_dict('records')
+            return 'snapshot'
+        except Exception:
+            return 'sin_validar'
+
+    def sesion(rng):
+        snapshot.obtener()
+        carrito = []
+        for _ in range(args.acciones):
+            time.sleep(rng.uniform(0.1, 0.5))
+            # Los productos del post se repiten mucho entre sesiones
+            carrito = sorted(set(carrito) | {populares[min(int(rng.paretovariate(1.2)) - 1, len(populares) - 1)]})
+            inicio = time.perf_counter()
+            resultado = validar(tuple(carrito))
+            with candado:
+                latencias.append((time.perf_counter() - inicio) * 1000)
+                resultados[resultado] += 1
+
+    hilos = []
+    for i in range(args.sesiones):
+        hilo = threading.Thread(target=sesion, args=(random.Random(i),))
+        hilos.append(hilo)
+        hilo.start()
+        time.sleep(args.ventana / args.sesiones)
+    for hilo in hilos:
+        hilo.join()
+    return resultados, latencias, cliente.llamadas
+
+
+def percentil(muestras, p):
+    muestras = sorted(muestras)
+    return muestras[min(len(muestras) - 1, int(round(p / 100 * (len(muestras) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pico de sesiones contra Supabase con y sin pasarela")
+    parser.add_argument("--filas", type=int, default=2_000)
+    parser.add_argument("--sesiones", type=int, default=300)
+    parser.add_argument("--ventana", type=float, default=10, help="Segundos en los que llegan las sesiones")
+    parser.add_argument("--acciones", type=int, default=5, help="Acciones de carrito por sesión")
+    parser.add_argument("--latencia-ms", type=float, default=80)
+    parser.add_argument("--limite-rps", type=float, default=30, help="Rate limit simulado de PostgREST")
+    parser.add_argument("--rps", type=float, default=20, help="Límite de la pasarela")
+    parser.add_argument("--rafaga", type=float, default=5)
+    parser.add_argument("--espera-ms", type=float, default=500)
+    args = parser.parse_args()
+
+    print(f"{args.sesiones} sesiones en {args.ventana:g} s, {args.acciones} acciones cada una, "
+          f"Supabase con {args.latencia_ms:.0f} ms y 429 sobre {args.limite_rps:g} req/s\n")
+    print(f"{'Modo':<14} {'Requests':>9} {'Supabase':>9} {'Snapshot':>9} {'Sin validar':>12} "
+          f"{'p50 (ms)':>9} {'p99 (ms)':>9}")
+    for nombre, con_pasarela in (("Sin pasarela", False), ("Con pasarela", True)):
+        resultados, latencias, llamadas = simular(args, con_pasarela)
+        print(f"{nombre:<14} {llamadas:>9} {resultados['supabase']:>9} {resultados['snapshot']:>9} "
+              f"{resultados['sin_validar']:>12} {statistics.median(latencias):>9.1f} {percentil(latencias, 99):>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+BENCHMARK DE SALIDA - Memoria de generate_catalog_data.py por tamaño de catálogo
+================================================================================
+
+Escribe catálogos sintéticos de distintos tamaños en cada formato (SQL por
+lotes, CSV para COPY, JSONL y Parquet) y mide el pico de memoria con
+tracemalloc. Como la generación y la escritura son por bloques, el pico debe
+mantenerse plano aunque el catálogo crezca 10x o 100x.
+
+Como referencia mide también la forma anterior (DataFrame completo + un solo
+INSERT con todas las filas), cuyo pico crece con el catálogo.
+
+USO:
+    python benchmarks/bench_salida.py
+    python benchmarks/bench_salida.py --tamanos 10000,100000,1000000 --formatos sql,csv
+
+REQUISITOS:
+pip install numpy pandas pyarrow
+"""
+
+import io
+import sys
+import time
+import argparse
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from generate_catalog_data import (  # noqa: E402
+    SYNTHETIC_FORMATS,
+    generate_synthetic_catalog,
+    iter_synthetic_catalog,
+    write_sql,
+    write_synthetic_catalog,
+)
+
+
+def medir(funcion):
+    """(segundos, pico en MB) de una llamada."""
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    funcion()
+    segundos = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return segundos, pico / 1024 / 1024
+
+
+def salida_anterior(filas):
+    """DataFrame completo y un único INSERT armado en memoria (antes de los lotes)."""
+    df = generate_synthetic_catalog(filas)
+    buffer = io.StringIO()
+    write_sql(df.to_dict('records'), buffer, batch_size=filas)
+    return buffer.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pico de memoria de la salida del generador")
+    parser.add_argument("--tamanos", default="10000,100000", help="Tamaños separados por coma")
+    parser.add_argument("--formatos", default=",".join(SYNTHETIC_FORMATS))
+    parser.add_argument("--sin-anterior", action="store_true", help="No medir la forma anterior")
+    args = parser.parse_args()
+
+    tamanos = [int(t) for t in args.tamanos.split(",")]
+    formatos = args.formatos.split(",")
+
+    # Calentamiento: que las importaciones de pandas/pyarrow no cuenten en el pico
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt in formatos:
+            write_synthetic_catalog(iter_synthetic_catalog(100), Path(tmp) / f"calentamiento.{fmt}", fmt)
+
+    print(f"{'Formato':<10} {'Filas':>10} {'Tiempo (s)':>12} {'Pico (MB)':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt in formatos:
+            for filas in tamanos:
+                destino = Path(tmp) / f"salida.{fmt}"
+                segundos, pico = medir(
+                    lambda: write_synthetic_catalog(iter_synthetic_catalog(filas), destino, fmt)
+                )
+                print(f"{fmt:<10} {filas:>10,} {segundos:>12.2f} {pico:>12.1f}")
+
+    if not args.sin_anterior:
+        for filas in tamanos:
+            segundos, pico = medir(lambda: salida_anterior(filas))
+            print(f"{'anterior':<10} {filas:>10,} {segundos:>12.2f} {pico:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+BENCHMARK DE SNAPSHOT - TTL bloqueante vs stale-while-revalidate
+================================================================
+
+Simula sesiones que piden el catálogo sin parar mientras el TTL vence varias
+veces, contra el Supabase en memoria de fake_supabase.py con latencia:
+
+  - TTL bloqueante (como st.cache_data(ttl=...)): al vencer, quien pide espera
+    la carga completa, y cada sesión que llega en ese momento lanza la suya.
+  - cache_snapshot.CacheSnapshot: sirve el snapshot anterior y refresca en un
+    solo hilo de fondo.
+
+Después inyecta errores en todas las llamadas y comprueba que se sigue
+sirviendo el último snapshot bueno. La primera carga (fría) queda fuera de
+los percentiles en ambos casos.
+
+USO:
+    python benchmarks/bench_snapshot.py --sesiones 20 --segundos 6 --ttl 1
+"""
+
+import sys
+import time
+import argparse
+import threading
+import statistics
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cache_snapshot import CacheSnapshot  # noqa: E402
+from catalog_queries import COLUMNAS_GALERIA_PUBLICA, TABLA_CATALOGO, cargar_catalogo  # noqa: E402
+from fake_supabase import PerfilRed, SupabaseFake, filas_sinteticas  # noqa: E402
+
+
+class CacheTTL:
+    """Referencia: TTL que bloquea al vencer y no junta las cargas simultáneas."""
+
+    def __init__(self, cargar, ttl):
+        self.cargar, self.ttl = cargar, ttl
+        self.valor, self.vence = None, 0.0
+
+    def obtener(self):
+        if time.time() >= self.vence:
+            self.valor = self.cargar()
+            self.vence = time.time() + self.ttl
+        return self.valor
+
+
+def simular(cache, sesiones, segundos):
+    """Latencias (ms) de cada lectura de todas las sesiones, tras la carga fría."""
+    cache.obtener()
+    latencias = []
+    fin = time.time() + segundos
+
+    def sesion():
+        while time.time() < fin:
+            inicio = time.perf_counter()
+            cache.obtener()
+            latencias.append((time.perf_counter() - inicio) * 1000)
+            time.sleep(0.05)
+
+    hilos = [threading.Thread(target=sesion) for _ in range(sesiones)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    return latencias
+
+
+def percentil(muestras, p):
+    muestras = sorted(muestras)
+    return muestras[min(len(muestras) - 1, int(round(p / 100 * (len(muestras) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latencia de lectura del catálogo al vencer el TTL")
+    parser.add_argument("--filas", type=int, default=5_000)
+    parser.add_argument("--latencia-ms", type=float, default=80)
+    parser.add_argument("--sesiones", type=int, default=20)
+    parser.add_argument("--segundos", type=float, default=6)
+    parser.add_argument("--ttl", type=float, default=1)
+    args = parser.parse_args()
+
+    perfil = PerfilRed(latencia_ms=args.latencia_ms)
+    cliente = SupabaseFake({TABLA_CATALOGO: filas_sinteticas(args.filas)}, perfil)
+    cargar = lambda: cargar_catalogo(cliente, columnas=COLUMNAS_GALERIA_PUBLICA, solo_disponibles=True)  # noqa: E731
+
+    print(f"{args.sesiones} sesiones, {args.segundos:.0f} s, TTL {args.ttl:g} s, {args.latencia_ms:.0f} ms por request\n")
+    print(f"{'Cache':<24} {'Lecturas':>9} {'Cargas':>7} {'p50 (ms)':>9} {'p99 (ms)':>9} {'Máx (ms)':>9}")
+    for nombre, cache in (
+        ("TTL bloqueante", CacheTTL(cargar, args.ttl)),
+        ("Stale-while-revalidate", CacheSnapshot('bench', cargar, ttl=args.ttl)),
+    ):
+        llamadas_antes = cliente.llamadas
+        latencias = simular(cache, args.sesiones, args.segundos)
+        print(f"{nombre:<24} {len(latencias):>9} {cliente.llamadas - llamadas_antes:>7} "
+              f"{statistics.median(latencias):>9.2f} {percentil(latencias, 99):>9.2f} {max(latencias):>9.2f}")
+
+    # Supabase caído: se sigue sirviendo el último snapshot bueno
+    cache = CacheSnapshot('bench_errores', cargar, ttl=args.ttl, reintento_error=args.ttl)
+    bueno = cache.obtener()
+    perfil.tasa_error = 1.0
+    time.sleep(args.ttl)
+    servidos = [cache.obtener() for _ in range(3)]
+    time.sleep(0.5)
+    servidos.append(cache.obtener())
+    ok = all(valor is bueno for valor in servidos) and cache.ultimo_error is not None
+    print(f"\n{'✓' if ok else '❌'} Con todas las llamadas fallando se sirve el último snapshot bueno "
+          f"(error: {type(cache.ultimo_error).__name__})")
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+"""
+PRUEBA DE CARGA - Compradoras concurrentes en catalogo_publico.py
+=================================================================
+
+Simula N sesiones simultáneas con streamlit.testing.v1.AppTest, cada una en su
+propio proceso. Cada sesión repite un recorrido realista: entrar al catálogo,
+buscar, filtrar por talla, agregar productos, abrir el carrito, cambiar una
+cantidad y generar el pedido de WhatsApp. Antes de abrirlas se carga la app una
+vez, así las sesiones encuentran el snapshot ya en memoria como en el servidor.
+La app usa el Supabase en memoria de fake_supabase.py (NANCY_FAKE_SUPABASE),
+así que no se toca la base real.
+
+En el paso de checkout se verifica el pedido: el enlace wa.me debe llevar cada
+producto del carrito y el total calculado, y la caja "Total del Pedido" debe
+mostrar ese mismo total. Un pedido incorrecto cuenta como error.
+
+Reporta latencia de rerun p50/p95/p99 (total y por paso), reruns por segundo y
+memoria aproximada por sesión. Compara contra el baseline guardado en
+benchmarks/baselines/ (el de la misma configuración) y termina con código 1 si
+hay errores o si alguna métrica empeora más que la tolerancia.
+
+USO:
+    python benchmarks/carga_tienda.py                      # compara con benchmarks/baselines/carga_tienda.json
+    python benchmarks/carga_tienda.py --sesiones 20 --recorridos 3 --productos 5000
+    python benchmarks/carga_tienda.py --sesiones 20 --guardar-baseline benchmarks/baselines/carga_20.json
+    python benchmarks/carga_tienda.py --sesiones 20 --baseline benchmarks/baselines/carga_20.json
+
+REQUISITOS:
+pip install streamlit
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import random
+import resource
+import argparse
+import urllib.parse
+import multiprocessing
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+APP = RAIZ / "catalogo_publico.py"
+BASELINE = Path(__file__).resolve().parent / "baselines" / "carga_tienda.json"
+
+# Métricas donde un valor mayor es peor (el resto: mayor es mejor)
+METRICAS_MENOR_ES_MEJOR = ('p50_ms', 'p95_ms', 'p99_ms', 'mb_por_sesion')
+
+
+def percentil(valores, p):
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    indice = min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))
+    return ordenados[indice]
+
+
+def cronometrar(registro, paso, accion):
+    inicio = time.perf_counter()
+    accion()
+    registro.append((paso, (time.perf_counter() - inicio) * 1000))
+
+
+def verificar_checkout(app):
+    """Errores del pedido que muestra la vista del carrito (lista vacía si está bien)."""
+    carrito = app.session_state['carrito']
+    if not carrito:
+        return ["carrito vacío al llegar al checkout"]
+    total = f"S/ {sum(item['precio'] * item['cantidad'] for item in carrito):.2f}"
+    textos = [m.value for m in app.markdown]
+    enlaces = [re.search(r'href="(https://wa\.me/[^"]+)"', t) for t in textos]
+    enlaces = [e.group(1) for e in enlaces if e]
+    if len(enlaces) != 1:
+        return [f"se esperaba un enlace de WhatsApp, hay {len(enlaces)}"]
+    mensaje = urllib.parse.parse_qs(urllib.parse.urlparse(enlaces[0]).query).get('text', [''])[0]
+    errores = []
+    if f"TOTAL: {total}*" not in mensaje:
+        errores.append(f"el mensaje de WhatsApp no lleva el total {total}")
+    for item in carrito:
+        if f"{item['cantidad']} x S/ {item['precio']:.2f}" not in mensaje or item['modelo'] not in mensaje:
+            errores.append(f"el mensaje de WhatsApp no lleva {item['sku']} x{item['cantidad']}")
+    if not any('Total del Pedido' in t and total in t for t in textos):
+        errores.append(f"la caja del total no muestra {total}")
+    return errores
+
+
+def recorrido(app, rng, registro, errores):
+    """Un recorrido de compra completo sobre una sesión ya abierta."""
+    from catalogo_publico import VISTA_CATALOGO, VISTA_CARRITO
+
+    cronometrar(registro, 'navegar', lambda: app.radio(key='vista').set_value(VISTA_CATALOGO).run())
+
+    termino = rng.choice(['vestido', 'gabardina negro', 'blusa', 'conjunto crema'])
+    cronometrar(registro, 'buscar', lambda: app.text_input(key='busqueda').input(termino).run())
+
+    tallas = app.selectbox(key='talla_filter').options
+    cronometrar(registro, 'filtrar', lambda: app.selectbox(key='talla_filter').select(rng.choice(tallas)).run())
+
+    botones = [b for b in app.button if str(b.key).startswith('add_')]
+    elegidos = rng.sample(botones, min(2, len(botones)))
+    for boton in elegidos:
+        cronometrar(registro, 'agregar', lambda: app.button(key=boton.key).click().run())
+
+    cronometrar(registro, 'carrito', lambda: app.radio(key='vista').set_value(VISTA_CARRITO).run())
+
+    cantidades = [n for n in app.number_input if str(n.key).startswith('qty_')]
+    if cantidades:
+        cronometrar(registro, 'cantidad', lambda: app.number_input(key=cantidades[0].key).increment().run())
+
+    cronometrar(registro, 'checkout', lambda: app.run())
+    if elegidos:
+        errores.extend(verificar_checkout(app))
+
+    # Vaciar el carrito y limpiar filtros para el siguiente recorrido
+    app.session_state['carrito'] = []
+    app.radio(key='vista').set_value(VISTA_CATALOGO).run()
+    app.text_input(key='busqueda').input('')
+    app.selectbox(key='talla_filter').select('Todos')
+
+
+def calentar(timeout):
+    """Una carga completa antes de abrir las sesiones.
+
+    Las sesiones son procesos hijos (fork) y heredan lo que quedó en
+    st.cache_resource: como en el servidor real, el snapshot del catálogo y el
+    índice de búsqueda ya están cargados cuando llegan las compradoras.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(str(APP), default_timeout=timeout)
+    app.run()
+    return [f"calentamiento: {e.message}" for e in app.exception]
+
+
+def sesion(numero, recorridos, timeout):
+    """Corre en un proceso propio: AppTest cambia estado global de Streamlit
+    (Runtime._instance, el ScriptCache) en cada rerun, así que dos sesiones en
+    hilos del mismo proceso se pisan. Devuelve (registro, errores, KB de memoria).
+    """
+    from streamlit.testing.v1 import AppTest
+
+    memoria_inicial = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    registro, errores = [], []
+    rng = random.Random(numero)
+    try:
+        app = AppTest.from_file(str(APP), default_timeout=timeout)
+        cronometrar(registro, 'entrada', app.run)
+        pedidos = []
+        for _ in range(recorridos):
+            recorrido(app, rng, registro, pedidos)
+        errores.extend(f"sesión {numero}: {error}" for error in pedidos)
+        if app.exception:
+            errores.append(f"sesión {numero}: {app.exception[0].message}")
+    except Exception as e:
+        errores.append(f"sesión {numero}: {e!r}")
+    return registro, errores, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - memoria_inicial
+
+
+def resumir(registro, duracion, sesiones, memoria_kb):
+    tiempos = [ms for _, ms in registro]
+    resultado = {
+        'reruns': len(tiempos),
+        'p50_ms': percentil(tiempos, 50),
+        'p95_ms': percentil(tiempos, 95),
+        'p99_ms': percentil(tiempos, 99),
+        'reruns_por_s': len(tiempos) / duracion if duracion else 0.0,
+        'mb_por_sesion': memoria_kb / 1024 / sesiones,
+        'pasos': {},
+    }
+    for paso in dict.fromkeys(p for p, _ in registro):
+        valores = [ms for p, ms in registro if p == paso]
+        resultado['pasos'][paso] = {
+            'p50_ms': percentil(valores, 50),
+            'p95_ms': percentil(valores, 95),
+            'p99_ms': percentil(valores, 99),
+        }
+    return resultado
+
+
+def comparar(resultado, baseline, tolerancia):
+    """Lista de regresiones (texto) respecto al baseline: métricas globales y p50 por paso.
+
+    Por paso se compara la mediana: con pocos reruns por paso el p95 es casi
+    el máximo y varía demasiado entre corridas.
+    """
+    regresiones = []
+    for metrica in METRICAS_MENOR_ES_MEJOR + ('reruns_por_s',):
+        antes, ahora = baseline.get(metrica), resultado[metrica]
+        if not antes:
+            continue
+        if metrica in METRICAS_MENOR_ES_MEJOR:
+            empeora = ahora > antes * (1 + tolerancia)
+        else:
+            empeora = ahora < antes * (1 - tolerancia)
+        if empeora:
+            regresiones.append(f"{metrica}: {antes:.2f} -> {ahora:.2f}")
+    for paso, medidas in resultado['pasos'].items():
+        antes = baseline.get('pasos', {}).get(paso, {}).get('p50_ms')
+        if antes and medidas['p50_ms'] > antes * (1 + tolerancia):
+            regresiones.append(f"{paso} p50_ms: {antes:.2f} -> {medidas['p50_ms']:.2f}")
+    return regresiones
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de carga del catálogo público con AppTest")
+    # Los valores por defecto son los del baseline guardado (alrededor de un minuto con un solo núcleo)
+    parser.add_argument("--sesiones", type=int, default=5, help="Compradoras concurrentes")
+    parser.add_argument("--recorridos", type=int, default=2, help="Recorridos por sesión")
+    parser.add_argument("--productos", default="1000", help="Productos sintéticos o ruta JSON/JSONL para el fake")
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--baseline", type=Path, default=BASELINE,
+                        help="JSON de referencia (por defecto el de benchmarks/baselines/ si coincide la configuración)")
+    parser.add_argument("--tolerancia", type=float, default=0.5,
+                        help="Empeoramiento relativo permitido (el ruido entre corridas llega a ~30%%)")
+    parser.add_argument("--guardar-baseline", type=Path, help="Guarda el resultado como nuevo baseline")
+    args = parser.parse_args()
+
+    os.environ["NANCY_FAKE_SUPABASE"] = args.productos
+    sys.path.insert(0, str(RAIZ))
+
+    errores = calentar(args.timeout)
+    registro, memoria = [], 0
+    # fork y no un pool: el objetivo no se serializa (Streamlit reemplaza __main__ al correr la app)
+    contexto = multiprocessing.get_context('fork')
+    resultados = contexto.Queue()
+    procesos = [
+        contexto.Process(target=lambda n=n: resultados.put(sesion(n, args.recorridos, args.timeout)))
+        for n in range(args.sesiones)
+    ]
+    inicio = time.perf_counter()
+    for proceso in procesos:
+        proceso.start()
+    for _ in procesos:
+        registro_sesion, errores_sesion, memoria_sesion = resultados.get()
+        registro += registro_sesion
+        errores += errores_sesion
+        memoria += memoria_sesion
+    duracion = time.perf_counter() - inicio
+    for proceso in procesos:
+        proceso.join()
+
+    resultado = resumir(registro, duracion, args.sesiones, memoria)
+    resultado['config'] = {'sesiones': args.sesiones, 'recorridos': args.recorridos, 'productos': args.productos}
+
+    print(f"CARGA: {args.sesiones} sesiones x {args.recorridos} recorridos ({args.productos} productos)\n")
+    print(f"{'Paso':<12} {'p50 (ms)':>10} {'p95 (ms)':>10} {'p99 (ms)':>10}")
+    for paso, m in resultado['pasos'].items():
+        print(f"{paso:<12} {m['p50_ms']:>10.1f} {m['p95_ms']:>10.1f} {m['p99_ms']:>10.1f}")
+    print(f"{'TOTAL':<12} {resultado['p50_ms']:>10.1f} {resultado['p95_ms']:>10.1f} {resultado['p99_ms']:>10.1f}")
+    print(f"\nReruns: {resultado['reruns']} en {duracion:.1f} s ({resultado['reruns_por_s']:.1f}/s)")
+    print(f"Memoria aprox. por sesión: {resultado['mb_por_sesion']:.1f} MB")
+
+    for error in errores:
+        print(f"❌ {error}")
+
+    if args.guardar_baseline and errores:
+        print(f"\n❌ Con errores no se guarda el baseline")
+    elif args.guardar_baseline:
+        args.guardar_baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.guardar_baseline.write_text(json.dumps(resultado, indent=2), encoding="utf-8")
+        print(f"\n✓ Baseline guardado en {args.guardar_baseline}")
+
+    codigo = 1 if errores else 0
+    baseline = None
+    if args.baseline and args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        if args.baseline == BASELINE and baseline.get('config') != resultado['config']:
+            print(f"\n⚠️  {args.baseline} se midió con {baseline.get('config')}: no se compara")
+            baseline = None
+    elif args.baseline != BASELINE:
+        print(f"\n❌ No existe el baseline {args.baseline}")
+        codigo = 1
+    if baseline:
+        regresiones = comparar(resultado, baseline, args.tolerancia)
+        if regresiones:
+            print(f"\n❌ REGRESIÓN respecto a {args.baseline} (tolerancia {args.tolerancia:.0%}):")
+            for regresion in regresiones:
+                print(f"   {regresion}")
+            codigo = 1
+        else:
+            print(f"\n✓ Sin regresiones respecto a {args.baseline}")
+    sys.exit(codigo)
+
+
+if __name__ == "__main__":
+    main()
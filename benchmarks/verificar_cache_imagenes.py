@@ -0,0 +1,102 @@
+"""
+VERIFICACIÓN DE CACHE DE IMÁGENES - URLs versionadas en Supabase Storage
+========================================================================
+
+Corre upload_images_to_supabase.sync_product_images() contra el Storage en
+memoria de fake_supabase.py (sin tocar Supabase) sobre una copia de
+catalogo-nancy's/ y comprueba:
+
+  1. Cabeceras: cada objeto se sirve como image/webp con max-age de un año.
+  2. Nombres: llevan el hash del contenido y url_foto apunta a ese objeto.
+  3. Segunda corrida sin cambios: no sube nada y no cambia ninguna url_foto.
+  4. Una foto editada: solo su URL cambia, las demás quedan igual.
+
+Termina con código 1 si alguna comprobación falla.
+
+USO:
+    python benchmarks/verificar_cache_imagenes.py
+
+REQUISITOS:
+pip install Pillow
+"""
+
+import re
+import sys
+import shutil
+import tempfile
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+
+from catalog_queries import TABLA_CATALOGO  # noqa: E402
+from fake_supabase import SupabaseFake  # noqa: E402
+from generate_catalog_data import parse_prices_file  # noqa: E402
+from upload_images_to_supabase import BUCKET_NAME, ensure_bucket_exists, sync_product_images  # noqa: E402
+
+CACHE_ESPERADA = "max-age=31536000"
+PATRON_NOMBRE = re.compile(r'^NC-[\w-]+-[0-9a-f]{16}\.webp$')
+
+
+def urls(cliente):
+    return {fila['sku']: fila['url_foto'] for fila in cliente.tablas[TABLA_CATALOGO]}
+
+
+def main():
+    errores = []
+
+    def comprobar(condicion, mensaje):
+        print(f"{'✓' if condicion else '❌'} {mensaje}")
+        if not condicion:
+            errores.append(mensaje)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        catalogo = Path(tmp) / "catalogo"
+        shutil.copytree(RAIZ / "catalogo-nancy's", catalogo)
+        productos = parse_prices_file(catalogo / "precios-catalogo.txt", catalogo)
+        con_imagen = [{'sku': p['sku'], 'image_file': p['image_file']} for p in productos if p['image_file']]
+
+        cliente = SupabaseFake({TABLA_CATALOGO: [dict(p, url_foto=None) for p in productos]})
+        ensure_bucket_exists(cliente)
+        sincronizar = lambda: sync_product_images(cliente, con_imagen, catalogo, Path(tmp) / "web")  # noqa: E731
+
+        # 1-2. Primera subida
+        resultado = sincronizar()
+        bucket = cliente.storage.from_(BUCKET_NAME)
+        objetos = cliente.objetos[BUCKET_NAME]
+        comprobar(resultado['uploaded'] == len(con_imagen), f"Primera corrida sube {len(con_imagen)} imágenes")
+        cabeceras = [bucket.cabeceras(nombre) for nombre in objetos]
+        comprobar(all(c['content-type'] == 'image/webp' for c in cabeceras), "content-type: image/webp")
+        comprobar(all(c['cache-control'] == CACHE_ESPERADA for c in cabeceras), f"cache-control: {CACHE_ESPERADA}")
+        comprobar(all(PATRON_NOMBRE.match(nombre) for nombre in objetos), "Nombres {sku}-{hash}.webp")
+        primeras = urls(cliente)
+        publicas = {bucket.get_public_url(nombre) for nombre in objetos}
+        comprobar(all(primeras[p['sku']] in publicas for p in con_imagen), "url_foto apunta al objeto versionado")
+
+        # 3. Sin cambios: nada que subir
+        subidas_antes = len(objetos)
+        resultado = sincronizar()
+        comprobar(resultado['uploaded'] == 0 and resultado['unchanged'] == len(con_imagen),
+                  "Segunda corrida: 0 subidas, todas sin cambios")
+        comprobar(len(objetos) == subidas_antes and urls(cliente) == primeras, "Ninguna URL cambió")
+
+        # 4. Editar una foto: solo cambia su URL
+        from PIL import Image
+
+        editado = con_imagen[0]
+        with Image.open(catalogo / editado['image_file']) as imagen:
+            imagen.transpose(Image.Transpose.FLIP_LEFT_RIGHT).save(catalogo / editado['image_file'], imagen.format)
+        resultado = sincronizar()
+        finales = urls(cliente)
+        cambiadas = {sku for sku in finales if finales[sku] != primeras[sku]}
+        comprobar(resultado['uploaded'] == 1 and cambiadas == {editado['sku']},
+                  f"Foto editada: solo cambia la URL de {editado['sku']}")
+
+    if errores:
+        print(f"\n❌ {len(errores)} comprobaciones fallaron")
+        sys.exit(1)
+    print("\n✓ Cabeceras y versionado de URLs correctos")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+VERIFICACIÓN DE CACHE DE IMÁGENES EN DISCO - cache_imagenes.CacheImagenes
+=========================================================================
+
+Corre el cache LRU en disco del panel admin contra un servidor simulado con
+httpx.MockTransport (sin red) sobre un directorio temporal y comprueba:
+
+  1. Revalidación: una entrada vigente no vuelve a pedir nada; una vencida
+     manda If-None-Match / If-Modified-Since y con un 304 reutiliza los bytes
+     y la variante del disco sin volver a bajarlos.
+  2. Presupuesto: al pasarse del tamaño se expulsa la foto usada hace más
+     tiempo (original, metadatos y variantes), no la recién consultada, y un
+     cache nuevo sobre el mismo directorio reconstruye el mismo total.
+  3. Variantes: si la foto cambió en el servidor (200 con otro ETag), las
+     variantes viejas se borran y se regeneran desde el contenido nuevo.
+  4. Fallas: tras un error de descarga esa URL no se vuelve a pedir hasta
+     pasado REINTENTO_FALLIDAS.
+
+Termina con código 1 si alguna comprobación falla.
+
+USO:
+    python benchmarks/verificar_cache_imagenes_disco.py
+
+REQUISITOS:
+pip install httpx Pillow
+"""
+
+import sys
+import hashlib
+import tempfile
+from io import BytesIO
+from pathlib import Path
+
+import httpx
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cache_imagenes import CacheImagenes  # noqa: E402
+
+BASE = "https://storage.test/product-images"
+ANCHO_VARIANTE = 120
+
+
+def clave(url):
+    """Misma clave que usa CacheImagenes.obtener() para una URL."""
+    return hashlib.sha256(url.encode('utf-8')).hexdigest()[:32]
+
+
+def imagen_png(color, tamano=(480, 640)):
+    salida = BytesIO()
+    Image.new('RGB', tamano, color).save(salida, 'PNG')
+    return salida.getvalue()
+
+
+def color_central(datos):
+    with Image.open(BytesIO(datos)) as imagen:
+        return imagen.convert('RGB').getpixel((imagen.width // 2, imagen.height // 2))
+
+
+class ServidorSimulado:
+    """Fotos por ruta con ETag y Cache-Control; responde 304 si el ETag coincide."""
+
+    def __init__(self):
+        self.fotos = {}
+        self.fallas = set()
+        self.pedidos = []
+
+    def publicar(self, nombre, datos, version, cache_control='max-age=0'):
+        self.fotos[nombre] = (datos, f'"{version}"', cache_control)
+
+    def __call__(self, request):
+        nombre = request.url.path.rsplit('/', 1)[-1]
+        if nombre in self.fallas:
+            self.pedidos.append((nombre, 503, request.headers.get('if-none-match')))
+            return httpx.Response(503)
+        datos, etag, cache_control = self.fotos[nombre]
+        cabeceras = {'etag': etag, 'cache-control': cache_control,
+                     'last-modified': 'Mon, 06 Jan 2025 10:00:00 GMT'}
+        if request.headers.get('if-none-match') == etag:
+            self.pedidos.append((nombre, 304, etag))
+            return httpx.Response(304, headers=cabeceras)
+        self.pedidos.append((nombre, 200, request.headers.get('if-none-match')))
+        return httpx.Response(200, content=datos, headers=dict(cabeceras, **{'content-type': 'image/png'}))
+
+
+def main():
+    errores = []
+
+    def comprobar(condicion, mensaje):
+        print(f"{'✓' if condicion else '❌'} {mensaje}")
+        if not condicion:
+            errores.append(mensaje)
+
+    servidor = ServidorSimulado()
+    http = httpx.Client(transport=httpx.MockTransport(servidor))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # 1. Revalidación
+        directorio = Path(tmp) / "revalidacion"
+        cache = CacheImagenes(directorio, presupuesto_bytes=50 * 1024 * 1024, cliente_http=http)
+        servidor.publicar('fija.png', imagen_png((10, 10, 10)), 'f1', cache_control='max-age=3600')
+        servidor.publicar('vence.png', imagen_png((200, 30, 30)), 'v1')
+
+        cache.obtener(f"{BASE}/fija.png")
+        pedidos = len(servidor.pedidos)
+        cache.obtener(f"{BASE}/fija.png")
+        comprobar(len(servidor.pedidos) == pedidos, "Entrada vigente (max-age=3600): sin pedidos al servidor")
+
+        original = cache.obtener(f"{BASE}/vence.png")
+        variante = cache.obtener(f"{BASE}/vence.png", ancho=ANCHO_VARIANTE)
+        ruta_variante = next(directorio.glob(f"*-w{ANCHO_VARIANTE}.webp"))
+        modificada = ruta_variante.stat().st_mtime_ns
+        servidor.pedidos.clear()
+        revalidada = cache.obtener(f"{BASE}/vence.png", ancho=ANCHO_VARIANTE)
+        comprobar(servidor.pedidos == [('vence.png', 304, '"v1"')],
+                  "Entrada vencida: GET condicional con If-None-Match y respuesta 304")
+        comprobar(revalidada == variante and cache.obtener(f"{BASE}/vence.png") == original,
+                  "304: se reutilizan el original y la variante del disco")
+        comprobar(ruta_variante.exists() and ruta_variante.read_bytes() == variante
+                  and ruta_variante.stat().st_mtime_ns >= modificada,
+                  "304: la variante no se borra ni se regenera")
+
+        # 2. Presupuesto
+        directorio = Path(tmp) / "presupuesto"
+        fotos = [f"{BASE}/foto{i}.png" for i in range(4)]
+        for i in range(4):
+            servidor.publicar(f'foto{i}.png', imagen_png((60 * i, 100, 100)), f'p{i}', cache_control='max-age=3600')
+        cache = CacheImagenes(directorio, presupuesto_bytes=50 * 1024 * 1024, cliente_http=http)
+        cache.obtener(fotos[0])
+        # Entran el original y los metadatos de unas 2,5 fotos
+        cache.presupuesto = int(cache.entradas[clave(fotos[0])] * 2.5)
+        cache.obtener(fotos[1])
+        cache.obtener(fotos[0])  # foto0 pasa a ser la más reciente
+        cache.obtener(fotos[2])
+        presentes = [i for i, url in enumerate(fotos) if (directorio / f"{clave(url)}.orig").exists()]
+        comprobar(presentes == [0, 2],
+                  "Al pasarse del presupuesto se expulsa la menos usada (foto1), no la recién consultada (foto0)")
+        cache.obtener(fotos[3], ancho=ANCHO_VARIANTE)
+        en_disco = sum(ruta.stat().st_size for ruta in directorio.iterdir())
+        comprobar(cache.total <= cache.presupuesto and en_disco == cache.total,
+                  f"Total en disco ({en_disco:,} B) dentro del presupuesto ({cache.presupuesto:,} B)")
+        comprobar(not any(directorio.glob(f"{clave(fotos[0])}*")),
+                  "La foto expulsada se borra entera (original, metadatos y variantes)")
+        reabierto = CacheImagenes(directorio, presupuesto_bytes=cache.presupuesto, cliente_http=http)
+        comprobar(reabierto.total == cache.total and list(reabierto.entradas) == list(cache.entradas),
+                  "Un cache nuevo sobre el mismo directorio reconstruye el total y el orden LRU")
+
+        # 3. Variantes tras un cambio de contenido
+        directorio = Path(tmp) / "variantes"
+        cache = CacheImagenes(directorio, presupuesto_bytes=50 * 1024 * 1024, cliente_http=http)
+        servidor.publicar('cambia.png', imagen_png((220, 20, 20)), 'c1')
+        roja = cache.obtener(f"{BASE}/cambia.png", ancho=ANCHO_VARIANTE)
+        cache.obtener(f"{BASE}/cambia.png", ancho=2 * ANCHO_VARIANTE)
+        servidor.publicar('cambia.png', imagen_png((20, 20, 220), tamano=(600, 600)), 'c2')
+        servidor.pedidos.clear()
+        azul = cache.obtener(f"{BASE}/cambia.png", ancho=ANCHO_VARIANTE)
+        comprobar(servidor.pedidos == [('cambia.png', 200, '"c1"')],
+                  "Contenido nuevo: el GET condicional con el ETag viejo recibe un 200")
+        comprobar(color_central(roja)[0] > 150 and color_central(azul)[2] > 150,
+                  "La variante se regenera desde la foto nueva")
+        with Image.open(BytesIO(azul)) as imagen:
+            comprobar(imagen.size == (ANCHO_VARIANTE, ANCHO_VARIANTE), "La variante nueva tiene las proporciones nuevas")
+        comprobar(not (directorio / f"{clave(f'{BASE}/cambia.png')}-w{2 * ANCHO_VARIANTE}.webp").exists(),
+                  "Las otras variantes viejas se borran (se regeneran a pedido)")
+
+        # 4. Fallas
+        servidor.publicar('caida.png', imagen_png((0, 0, 0)), 'x1')
+        servidor.fallas.add('caida.png')
+        servidor.pedidos.clear()
+        intentos = []
+        for _ in range(3):
+            try:
+                cache.obtener(f"{BASE}/caida.png")
+            except (httpx.HTTPStatusError, LookupError) as e:
+                intentos.append(type(e).__name__)
+        comprobar(intentos == ['HTTPStatusError', 'LookupError', 'LookupError'] and len(servidor.pedidos) == 1,
+                  "Tras un 503 la URL no se vuelve a pedir en cada rerun")
+
+    if errores:
+        print(f"\n❌ {len(errores)} comprobaciones fallaron")
+        sys.exit(1)
+    print("\n✓ Revalidación, presupuesto e invalidación de variantes correctos")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+VERIFICACIÓN DEL SITIO ESTÁTICO - exportar_sitio.py
+===================================================
+
+Exporta un catálogo sintético a un directorio temporal y comprueba:
+
+  1. Cada producto disponible aparece en exactamente una página (48 por página)
+     y en datos/catalogo.json.
+  2. Una segunda exportación sin cambios no reescribe ningún archivo.
+  3. Cambiar el precio de un producto reescribe solo su página y el JSON.
+  4. El mensaje de WhatsApp de assets/sitio.js (corrido con node) es idéntico
+     al de tarjetas_html.mensaje_whatsapp(), que usa la app.
+
+Termina con código 1 si alguna comprobación falla.
+
+USO:
+    python benchmarks/verificar_sitio.py
+
+REQUISITOS:
+node (para la comprobación 4)
+"""
+
+import re
+import sys
+import json
+import random
+import shutil
+import tempfile
+import subprocess
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+
+from exportar_sitio import ARCHIVO_DATOS, PRODUCTOS_POR_PAGINA, construir_sitio, escribir_sitio  # noqa: E402
+from fake_supabase import filas_sinteticas  # noqa: E402
+from tarjetas_html import mensaje_whatsapp  # noqa: E402
+
+PATRON_TARJETA = re.compile(r"<article class='product-card' data-sku='([^']+)'")
+
+
+def mensajes_js(carritos):
+    """Mensajes de sitio.js para cada carrito (o None si no hay node)."""
+    node = shutil.which('node')
+    if not node:
+        return None
+    script = (
+        f"const {{mensajeWhatsapp}} = require({json.dumps(str(RAIZ / 'assets' / 'sitio.js'))});"
+        "const carritos = JSON.parse(require('fs').readFileSync(0, 'utf8'));"
+        "process.stdout.write(JSON.stringify(carritos.map(mensajeWhatsapp)));"
+    )
+    salida = subprocess.run([node, '-e', script], input=json.dumps(carritos), capture_output=True, text=True, check=True)
+    return json.loads(salida.stdout)
+
+
+def main():
+    errores = []
+
+    def comprobar(condicion, mensaje):
+        print(f"{'✓' if condicion else '❌'} {mensaje}")
+        if not condicion:
+            errores.append(mensaje)
+
+    productos = sorted((f for f in filas_sinteticas(1000) if f['stock_actual'] > 0),
+                       key=lambda f: (f['modelo'], f['sku']))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # 1. Primera exportación
+        escribir_sitio(construir_sitio(productos, '51999999999'), tmp)
+        paginas = sorted(Path(tmp).glob('*.html'))
+        skus_paginas = [sku for pagina in paginas for sku in PATRON_TARJETA.findall(pagina.read_text(encoding='utf-8'))]
+        datos = json.loads((Path(tmp) / ARCHIVO_DATOS).read_text(encoding='utf-8'))
+        comprobar(sorted(skus_paginas) == sorted(p['sku'] for p in productos),
+                  f"{len(productos)} productos en {len(paginas)} páginas, cada uno una vez")
+        comprobar(all(len(PATRON_TARJETA.findall(p.read_text(encoding='utf-8'))) <= PRODUCTOS_POR_PAGINA for p in paginas),
+                  f"Como máximo {PRODUCTOS_POR_PAGINA} tarjetas por página")
+        comprobar(len(datos['filas']) == len(productos), "datos/catalogo.json tiene todos los productos")
+
+        # 2. Sin cambios
+        resultado = escribir_sitio(construir_sitio(productos, '51999999999'), tmp)
+        comprobar(not resultado['escritos'] and not resultado['eliminados'], "Segunda exportación: 0 archivos escritos")
+
+        # 3. Cambia un precio
+        indice = PRODUCTOS_POR_PAGINA * 2 + 5
+        productos[indice] = dict(productos[indice], precio_soles=productos[indice]['precio_soles'] + 10)
+        resultado = escribir_sitio(construir_sitio(productos, '51999999999'), tmp)
+        comprobar(sorted(resultado['escritos']) == sorted([ARCHIVO_DATOS, 'pagina-3.html']),
+                  f"Un precio cambiado reescribe solo {ARCHIVO_DATOS} y pagina-3.html ({resultado['escritos']})")
+
+    # 4. Mensaje de WhatsApp idéntico al de la app
+    rng = random.Random(7)
+    carritos = [[
+        {'modelo': p['modelo'], 'color': p['color'], 'talla': p['talla'],
+         'precio': p['precio_soles'], 'cantidad': rng.randint(1, 4)}
+        for p in rng.sample(productos, rng.randint(0, 6))
+    ] for _ in range(200)]
+    desde_js = mensajes_js(carritos)
+    if desde_js is None:
+        print("- node no está instalado: se omite la comprobación del mensaje")
+    else:
+        comprobar(desde_js == [mensaje_whatsapp(c) for c in carritos],
+                  f"Mensaje de WhatsApp idéntico en sitio.js y en la app ({len(carritos)} carritos)")
+
+    if errores:
+        print(f"\n❌ {len(errores)} comprobaciones fallaron")
+        sys.exit(1)
+    print("\n✓ Sitio estático correcto")
+
+
+if __name__ == "__main__":
+    main()
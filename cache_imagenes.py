@@ -0,0 +1,204 @@
+"""
+Cache de imágenes - Nancy's Collection
+Cache LRU en disco delante de Supabase Storage para el panel admin: cada foto
+se descarga una sola vez, las variantes redimensionadas (WebP) se generan a
+pedido y se guardan junto al original, y las entradas vencidas se revalidan
+con If-None-Match / If-Modified-Since (un 304 no vuelve a bajar la imagen).
+
+Al superar el presupuesto de disco se eliminan las fotos usadas hace más
+tiempo (original y variantes juntos).
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from io import BytesIO
+from pathlib import Path
+
+from instrumentation import contar, span
+
+# Presupuesto de disco por defecto (NANCY_CACHE_IMAGENES_MB lo cambia)
+PRESUPUESTO_MB = 256
+# Vigencia si el servidor no manda Cache-Control: max-age
+MAX_AGE_DEFECTO = 3600
+# "immutable" = el contenido de esa URL no cambia nunca (nombres con hash)
+MAX_AGE_INMUTABLE = 365 * 24 * 3600
+CALIDAD_VARIANTES = 80
+TIMEOUT_DESCARGA = 15
+# Tras un error de descarga, segundos antes de volver a intentar esa URL
+REINTENTO_FALLIDAS = 60
+
+_PATRON_MAX_AGE = re.compile(r'max-age=(\d+)')
+
+
+def vigencia(cache_control):
+    """Segundos de vigencia según la cabecera Cache-Control de la respuesta."""
+    cache_control = (cache_control or '').lower()
+    if 'immutable' in cache_control:
+        return MAX_AGE_INMUTABLE
+    if 'no-cache' in cache_control or 'no-store' in cache_control:
+        return 0
+    coincidencia = _PATRON_MAX_AGE.search(cache_control)
+    return int(coincidencia.group(1)) if coincidencia else MAX_AGE_DEFECTO
+
+
+class CacheImagenes:
+    """Cache LRU en disco de imágenes remotas y sus variantes por ancho.
+
+    Archivos por URL (clave = hash de la URL):
+        {clave}.orig          bytes originales
+        {clave}.meta.json     etag, last-modified y vencimiento
+        {clave}-w{ancho}.webp variantes redimensionadas
+    """
+
+    def __init__(self, directorio, presupuesto_bytes=None, cliente_http=None):
+        import httpx
+
+        self.directorio = Path(directorio)
+        self.directorio.mkdir(parents=True, exist_ok=True)
+        if presupuesto_bytes is None:
+            presupuesto_bytes = int(float(os.getenv('NANCY_CACHE_IMAGENES_MB', PRESUPUESTO_MB)) * 1024 * 1024)
+        self.presupuesto = presupuesto_bytes
+        self.http = cliente_http or httpx.Client(timeout=TIMEOUT_DESCARGA, follow_redirects=True)
+        self.candado = threading.Lock()
+        # clave -> bytes en disco, de la menos a la más recientemente usada
+        self.entradas = OrderedDict()
+        self.total = 0
+        # url -> momento desde el que se puede reintentar (no repetir timeouts en cada rerun)
+        self.fallidas = {}
+        self._cargar_indice()
+
+    def _cargar_indice(self):
+        """Reconstruye el orden LRU desde el disco (mtime = último uso)."""
+        grupos = {}
+        with os.scandir(self.directorio) as archivos:
+            for archivo in archivos:
+                if archivo.name.endswith('.tmp'):
+                    continue
+                clave = archivo.name.split('.', 1)[0].split('-w', 1)[0]
+                info = archivo.stat()
+                tamano, uso = grupos.get(clave, (0, 0.0))
+                grupos[clave] = (tamano + info.st_size, max(uso, info.st_mtime))
+        for clave, (tamano, _) in sorted(grupos.items(), key=lambda g: g[1][1]):
+            self.entradas[clave] = tamano
+            self.total += tamano
+
+    # --- rutas ---
+    def _ruta(self, clave, sufijo):
+        return self.directorio / f"{clave}{sufijo}"
+
+    def _archivos(self, clave):
+        return [self._ruta(clave, '.orig'), self._ruta(clave, '.meta.json')] + \
+            list(self.directorio.glob(f"{clave}-w*.webp"))
+
+    @staticmethod
+    def _escribir(ruta, datos):
+        temporal = ruta.with_name(f"{ruta.name}.{threading.get_ident()}.tmp")
+        temporal.write_bytes(datos)
+        os.replace(temporal, ruta)
+
+    # --- API ---
+    def obtener(self, url, ancho=None):
+        """Bytes de la imagen (o de su variante WebP de `ancho` px). Descarga solo si hace falta."""
+        if self.fallidas.get(url, 0) > time.time():
+            raise LookupError(f"Descarga fallida reciente: {url}")
+        clave = hashlib.sha256(url.encode('utf-8')).hexdigest()[:32]
+        try:
+            original, cambio = self._original(url, clave)
+        except Exception:
+            self.fallidas[url] = time.time() + REINTENTO_FALLIDAS
+            raise
+        if cambio:
+            for variante in self.directorio.glob(f"{clave}-w*.webp"):
+                variante.unlink(missing_ok=True)
+
+        if ancho is None:
+            datos = original
+        else:
+            ruta = self._ruta(clave, f"-w{int(ancho)}.webp")
+            if ruta.exists():
+                datos = ruta.read_bytes()
+                os.utime(ruta)
+            else:
+                datos = self._variante(original, int(ancho))
+                self._escribir(ruta, datos)
+
+        self._registrar_uso(clave)
+        return datos
+
+    def _original(self, url, clave):
+        """(bytes, cambió): desde disco si está vigente; si no, GET condicional."""
+        ruta = self._ruta(clave, '.orig')
+        ruta_meta = self._ruta(clave, '.meta.json')
+        meta = {}
+        if ruta.exists() and ruta_meta.exists():
+            meta = json.loads(ruta_meta.read_text(encoding='utf-8'))
+            if meta.get('vence', 0) > time.time():
+                contar('imagenes.hits')
+                os.utime(ruta)
+                return ruta.read_bytes(), False
+
+        cabeceras = {}
+        if meta.get('etag'):
+            cabeceras['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            cabeceras['If-Modified-Since'] = meta['last_modified']
+
+        with span('imagenes.descargar'):
+            respuesta = self.http.get(url, headers=cabeceras)
+
+        if respuesta.status_code == 304 and meta:
+            contar('imagenes.revalidadas')
+            meta['vence'] = time.time() + vigencia(respuesta.headers.get('cache-control') or meta.get('cache_control'))
+            self._escribir(ruta_meta, json.dumps(meta).encode('utf-8'))
+            return ruta.read_bytes(), False
+
+        respuesta.raise_for_status()
+        contar('imagenes.misses')
+        contar('imagenes.bytes_descargados', len(respuesta.content))
+        meta = {
+            'url': url,
+            'etag': respuesta.headers.get('etag'),
+            'last_modified': respuesta.headers.get('last-modified'),
+            'cache_control': respuesta.headers.get('cache-control'),
+            'vence': time.time() + vigencia(respuesta.headers.get('cache-control')),
+        }
+        self._escribir(ruta, respuesta.content)
+        self._escribir(ruta_meta, json.dumps(meta).encode('utf-8'))
+        return respuesta.content, True
+
+    @staticmethod
+    def _variante(original, ancho):
+        """Redimensiona a `ancho` px (sin agrandar) y codifica en WebP."""
+        from PIL import Image, ImageOps
+
+        with span('imagenes.redimensionar'), Image.open(BytesIO(original)) as imagen:
+            imagen = ImageOps.exif_transpose(imagen)
+            if imagen.width > ancho:
+                imagen = imagen.resize((ancho, round(imagen.height * ancho / imagen.width)), Image.Resampling.LANCZOS)
+            if imagen.mode not in ('RGB', 'RGBA'):
+                imagen = imagen.convert('RGBA' if 'A' in imagen.getbands() else 'RGB')
+            salida = BytesIO()
+            imagen.save(salida, 'WEBP', quality=CALIDAD_VARIANTES)
+            return salida.getvalue()
+
+    def _registrar_uso(self, clave):
+        """Marca la clave como la más reciente y expulsa las más viejas si se pasa del presupuesto."""
+        tamano = sum(ruta.stat().st_size for ruta in self._archivos(clave) if ruta.exists())
+        with self.candado:
+            self.total += tamano - self.entradas.pop(clave, 0)
+            self.entradas[clave] = tamano
+            while self.total > self.presupuesto and len(self.entradas) > 1:
+                vieja, tamano_viejo = self.entradas.popitem(last=False)
+                for ruta in self._archivos(vieja):
+                    ruta.unlink(missing_ok=True)
+                self.total -= tamano_viejo
+                contar('imagenes.expulsadas')
+
+    def estadisticas(self):
+        with self.candado:
+            return {'imagenes': len(self.entradas), 'bytes': self.total, 'presupuesto': self.presupuesto}
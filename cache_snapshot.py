@@ -0,0 +1,104 @@
+"""
+Cache de snapshots - Nancy's Collection
+Stale-while-revalidate para el catálogo público: al vencer el TTL se sigue
+sirviendo el snapshot anterior al instante y un único hilo de fondo lo
+refresca. Ninguna sesión espera a Supabase salvo la primera carga del proceso.
+
+- Misses simultáneos se juntan en una sola carga (las demás sesiones esperan
+  esa misma carga, no lanzan la suya).
+- Si el refresco falla se sigue sirviendo el último snapshot bueno y se
+  reintenta pasado REINTENTO_ERROR segundos.
+"""
+
+import time
+import threading
+
+from instrumentation import contar, span
+
+# Segundos entre reintentos cuando el refresco falla
+REINTENTO_ERROR = 30
+
+
+class CacheSnapshot:
+    """Un valor (p. ej. el DataFrame del catálogo) compartido por todas las sesiones del proceso.
+
+    El valor se comparte, no se copia: quien lo recibe no debe modificarlo.
+    """
+
+    def __init__(self, nombre, cargar, ttl, reintento_error=REINTENTO_ERROR):
+        self.nombre = nombre
+        self.cargar = cargar
+        self.ttl = ttl
+        self.reintento_error = reintento_error
+        self.candado = threading.Lock()
+        self.valor = None
+        self.cargado_en = None
+        self.vence = 0.0
+        self.ultimo_error = None
+        # Carga en curso (evento que se marca al terminar) o None
+        self._en_curso = None
+
+    def obtener(self, al_esperar=None):
+        """Snapshot vigente, o el anterior si venció (y dispara el refresco).
+
+        Solo bloquea si todavía no hay ningún snapshot; en ese caso se llama
+        al_esperar() en el hilo de quien pide (para marcar el miss) y, si la
+        carga falla, se propaga el error.
+        """
+        with self.candado:
+            ahora = time.time()
+            if self.cargado_en is not None:
+                if ahora >= self.vence and self._en_curso is None:
+                    self._en_curso = threading.Event()
+                    threading.Thread(target=self._refrescar, daemon=True,
+                                     name=f"refresco-{self.nombre}").start()
+                contar(f"snapshot.{self.nombre}.{'frescos' if ahora < self.vence else 'obsoletos'}")
+                return self.valor
+            evento = self._en_curso
+            propio = evento is None
+            if propio:
+                evento = self._en_curso = threading.Event()
+
+        if al_esperar is not None:
+            al_esperar()
+        if propio:
+            self._refrescar()
+        else:
+            contar(f"snapshot.{self.nombre}.coalescidos")
+            evento.wait()
+
+        with self.candado:
+            if self.cargado_en is None:
+                raise self.ultimo_error
+            return self.valor
+
+    def _refrescar(self):
+        """Carga un snapshot nuevo; si falla conserva el anterior."""
+        try:
+            with span(f"snapshot.{self.nombre}.refresco"):
+                valor = self.cargar()
+        except Exception as e:
+            contar(f"snapshot.{self.nombre}.errores")
+            with self.candado:
+                self.ultimo_error = e
+                self.vence = time.time() + self.reintento_error
+                evento, self._en_curso = self._en_curso, None
+        else:
+            contar(f"snapshot.{self.nombre}.refrescos")
+            with self.candado:
+                self.valor = valor
+                self.cargado_en = time.time()
+                self.vence = self.cargado_en + self.ttl
+                self.ultimo_error = None
+                evento, self._en_curso = self._en_curso, None
+        evento.set()
+
+    def invalidar(self):
+        """Marca el snapshot como vencido: la próxima lectura lo refresca (sin bloquear)."""
+        with self.candado:
+            self.vence = 0.0
+
+    def edad(self):
+        """Segundos desde la última carga exitosa, o None si no hay snapshot."""
+        with self.candado:
+            return None if self.cargado_en is None else time.time() - self.cargado_en
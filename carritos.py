@@ -0,0 +1,204 @@
+"""
+Carritos persistentes - Nancy's Collection
+El carrito de st.session_state se pierde cada vez que se corta el websocket
+(muy seguido en redes móviles). Aquí se guarda aparte, identificado por un
+token que viaja en la URL (?carrito=...), para recuperarlo al reconectar.
+
+- Forma compacta: solo {sku: cantidad}; modelo, color, precio, stock y foto se
+  rehidratan desde el snapshot del catálogo al recuperar el carrito.
+- Escrituras diferidas y agrupadas: guardar() solo anota el cambio en memoria;
+  un hilo de fondo junta todo lo pendiente cada RETARDO_ESCRITURA segundos y
+  lo escribe en una sola operación. Un clic en el carrito nunca espera al disco
+  ni a la red.
+
+Almacenes: SQLite local (por defecto, .carritos.sqlite3) o la tabla carritos
+de Supabase (NANCY_CARRITOS=supabase, ver migrations/003_carritos.sql). La
+anon key no tiene acceso directo a esa tabla: se lee y escribe solo con las
+funciones de migrations/006_carritos_rpc.sql, que exigen el token.
+"""
+
+import os
+import json
+import time
+import atexit
+import sqlite3
+import threading
+from pathlib import Path
+
+from instrumentation import contar, span
+
+RUTA_SQLITE = Path(__file__).parent / ".carritos.sqlite3"
+TABLA_CARRITOS = 'carritos'
+FUNCION_LEER = 'leer_carrito'
+FUNCION_GUARDAR = 'guardar_carritos'
+# Espera desde el primer cambio pendiente hasta escribir el lote
+RETARDO_ESCRITURA = 1.0
+# Tope de unidades por producto al rehidratar (por si el token fue manipulado)
+MAX_CANTIDAD = 99
+
+
+def compactar(carrito):
+    """Carrito de la sesión -> {sku: cantidad}."""
+    return {item['sku']: int(item['cantidad']) for item in carrito}
+
+
+def serializar(compacto):
+    return json.dumps(compacto, separators=(',', ':'), sort_keys=True)
+
+
+def deserializar(texto):
+    """Texto guardado -> {sku: cantidad}; ignora entradas mal formadas."""
+    try:
+        datos = json.loads(texto) if texto else {}
+    except ValueError:
+        return {}
+    if not isinstance(datos, dict):
+        return {}
+    return {str(sku): int(cantidad) for sku, cantidad in datos.items()
+            if isinstance(cantidad, (int, float)) and cantidad > 0}
+
+
+def rehidratar(compacto, df):
+    """{sku: cantidad} -> items del carrito con los datos del snapshot del catálogo.
+
+    Los productos que ya no están en el snapshot (agotados) se omiten y las
+    cantidades se ajustan al stock vigente.
+    """
+    if not compacto or df is None or df.empty:
+        return []
+    filas = df[df['sku'].isin(list(compacto))].drop_duplicates('sku')
+    carrito = []
+    for prod in filas.to_dict('records'):
+        cantidad = min(compacto[prod['sku']], int(prod['stock_actual']), MAX_CANTIDAD)
+        if cantidad <= 0:
+            continue
+        carrito.append({
+            'sku': prod['sku'],
+            'modelo': prod['modelo'],
+            'color': prod['color'],
+            'talla': prod['talla'],
+            'precio': prod['precio_soles'],
+            'cantidad': cantidad,
+            'stock_disponible': prod['stock_actual'],
+            'imagen': prod.get('url_foto'),
+        })
+    # Mismo orden en que se guardaron (orden de agregado)
+    orden = {sku: i for i, sku in enumerate(compacto)}
+    return sorted(carrito, key=lambda item: orden[item['sku']])
+
+
+class AlmacenSQLite:
+    """Carritos en un archivo SQLite local (una fila por token)."""
+
+    def __init__(self, ruta=RUTA_SQLITE):
+        self.ruta = str(ruta)
+        with self._conectar() as conexion:
+            conexion.execute(
+                "CREATE TABLE IF NOT EXISTS carritos ("
+                " token TEXT PRIMARY KEY, items TEXT NOT NULL, actualizado REAL NOT NULL)"
+            )
+
+    def _conectar(self):
+        # Una conexión por operación: se usa desde el hilo de las sesiones y el del escritor
+        return sqlite3.connect(self.ruta, timeout=10)
+
+    def leer(self, token):
+        with self._conectar() as conexion:
+            fila = conexion.execute("SELECT items FROM carritos WHERE token = ?", (token,)).fetchone()
+        return fila[0] if fila else None
+
+    def escribir_lote(self, cambios):
+        """cambios: {token: texto compacto o None para borrar}. Una sola transacción."""
+        ahora = time.time()
+        with self._conectar() as conexion:
+            conexion.executemany(
+                "INSERT INTO carritos (token, items, actualizado) VALUES (?, ?, ?)"
+                " ON CONFLICT(token) DO UPDATE SET items = excluded.items, actualizado = excluded.actualizado",
+                [(token, texto, ahora) for token, texto in cambios.items() if texto is not None],
+            )
+            conexion.executemany(
+                "DELETE FROM carritos WHERE token = ?",
+                [(token,) for token, texto in cambios.items() if texto is None],
+            )
+
+
+class AlmacenSupabase:
+    """Carritos en la tabla carritos de Supabase, vía funciones RPC (un round trip por lote)."""
+
+    def __init__(self, cliente):
+        self.cliente = cliente
+
+    def leer(self, token):
+        return self.cliente.rpc(FUNCION_LEER, {'token_carrito': token}).execute().data
+
+    def escribir_lote(self, cambios):
+        """cambios: {token: texto compacto o None para borrar}; upsert y borrado en la misma llamada."""
+        self.cliente.rpc(FUNCION_GUARDAR, {
+            'cambios': [{'token': token, 'items': texto} for token, texto in cambios.items()],
+        }).execute()
+
+
+class CarritosPersistentes:
+    """Lecturas directas y escrituras diferidas (un hilo de fondo por proceso)."""
+
+    def __init__(self, almacen, retardo=RETARDO_ESCRITURA):
+        self.almacen = almacen
+        self.retardo = retardo
+        self.candado = threading.Lock()
+        self.hay_pendientes = threading.Event()
+        # token -> texto compacto (None = borrar); el último cambio reemplaza a los anteriores
+        self.pendientes = {}
+        threading.Thread(target=self._escritor, daemon=True, name='carritos-escritor').start()
+        atexit.register(self.vaciar_pendientes)
+
+    def guardar(self, token, compacto):
+        """Anota el carrito para el próximo lote. No hace I/O."""
+        with self.candado:
+            self.pendientes[token] = serializar(compacto) if compacto else None
+        self.hay_pendientes.set()
+        contar('carritos.cambios')
+
+    def leer(self, token):
+        """{sku: cantidad} del token (incluye cambios aún no escritos)."""
+        with self.candado:
+            if token in self.pendientes:
+                return deserializar(self.pendientes[token])
+        try:
+            with span('carritos.leer'):
+                return deserializar(self.almacen.leer(token))
+        except Exception:
+            contar('carritos.errores')
+            return {}
+
+    def _escritor(self):
+        while True:
+            self.hay_pendientes.wait()
+            # Debounce: los clics de los próximos segundos entran en el mismo lote
+            time.sleep(self.retardo)
+            self.vaciar_pendientes()
+
+    def vaciar_pendientes(self):
+        """Escribe todo lo pendiente en una operación; si falla, se reintenta en el próximo lote."""
+        with self.candado:
+            lote, self.pendientes = self.pendientes, {}
+            self.hay_pendientes.clear()
+        if not lote:
+            return
+        try:
+            with span('carritos.escribir_lote'):
+                self.almacen.escribir_lote(lote)
+            contar('carritos.lotes')
+            contar('carritos.escritos', len(lote))
+        except Exception:
+            contar('carritos.errores')
+            with self.candado:
+                for token, texto in lote.items():
+                    self.pendientes.setdefault(token, texto)
+            self.hay_pendientes.set()
+
+
+def almacen_desde_entorno(cliente=None):
+    """Almacén según NANCY_CARRITOS: 'supabase' (tabla carritos) o SQLite local (por defecto)."""
+    if os.getenv('NANCY_CARRITOS', 'sqlite').lower() == 'supabase' and cliente is not None:
+        return AlmacenSupabase(cliente)
+    return AlmacenSQLite(os.getenv('NANCY_CARRITOS_SQLITE', RUTA_SQLITE))
@@ -0,0 +1,251 @@
+"""
+Imágenes del catálogo - Nancy's Collection
+Validación y metadatos de las fotos de catalogo-nancy's/ durante la generación
+del catálogo: dimensiones, peso, color dominante y hash perceptual, con alertas
+de imágenes corruptas, sobredimensionadas, rotadas por EXIF o duplicadas.
+El formato se detecta por magic bytes (no por extensión) y cada foto se
+transcodifica una vez a la versión web (WebP) que se sube a Storage.
+
+Cada imagen se analiza en un proceso del pool (decodificar es CPU puro), así la
+etapa cuesta aproximadamente lo que tarda la imagen más pesada.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# Límites para marcar una foto como sobredimensionada para la galería
+MAX_LADO_PX = 2000
+MAX_BYTES = 2 * 1024 * 1024
+# Bits distintos (de 64) hasta los que dos hashes perceptuales son la misma foto
+DISTANCIA_DUPLICADO = 4
+# Lado de la miniatura sobre la que se calculan color y hash
+LADO_ANALISIS = 64
+
+# Tag EXIF de orientación (1 = normal)
+_EXIF_ORIENTACION = 0x0112
+
+# Firmas (magic bytes) de los formatos de imagen aceptados: la extensión no
+# sirve, hay JPEGs guardados como .txt en catalogo-nancy's/
+FIRMAS = (
+    (b'\x89PNG\r\n\x1a\n', 'png'),
+    (b'\xff\xd8\xff', 'jpeg'),
+    (b'GIF87a', 'gif'),
+    (b'GIF89a', 'gif'),
+)
+CONTENT_TYPES = {
+    'png': 'image/png',
+    'jpeg': 'image/jpeg',
+    'gif': 'image/gif',
+    'webp': 'image/webp',
+}
+
+# Versión web que se sirve en la galería: WebP de hasta 1200 px por lado
+LADO_WEB_PX = 1200
+CALIDAD_WEB = 80
+CONTENT_TYPE_WEB = CONTENT_TYPES['webp']
+# Cache del navegador/CDN para las fotos subidas (segundos, campo cacheControl de
+# Storage, que se sirve como "max-age=31536000"). Es seguro cachear un año
+# porque el nombre del objeto lleva el hash del contenido: una foto nueva es
+# una URL nueva.
+CACHE_CONTROL_IMAGENES = '31536000'
+
+
+def detectar_formato(ruta):
+    """Formato real de un archivo por sus primeros bytes ('png', 'jpeg', 'gif', 'webp') o None."""
+    try:
+        with open(ruta, 'rb') as f:
+            cabecera = f.read(12)
+    except OSError:
+        return None
+    if cabecera[:4] == b'RIFF' and cabecera[8:12] == b'WEBP':
+        return 'webp'
+    for firma, formato in FIRMAS:
+        if cabecera.startswith(firma):
+            return formato
+    return None
+
+
+def _matriz_dct(n):
+    import numpy as np
+
+    k = np.arange(n)
+    matriz = np.cos(np.pi * (2 * k[None, :] + 1) * k[:, None] / (2 * n))
+    matriz[0] /= np.sqrt(2)
+    return matriz * np.sqrt(2 / n)
+
+
+def hash_perceptual(imagen):
+    """pHash de 64 bits (hex): DCT de la imagen en grises 32x32, 8x8 de baja frecuencia vs mediana."""
+    import numpy as np
+    from PIL import Image
+
+    grises = np.asarray(imagen.convert('L').resize((32, 32), Image.Resampling.LANCZOS), dtype=float)
+    dct = _matriz_dct(32)
+    bajas = (dct @ grises @ dct.T)[:8, :8].flatten()
+    bits = bajas > np.median(bajas[1:])
+    return f"{int(''.join('1' if b else '0' for b in bits), 2):016x}"
+
+
+def color_dominante(imagen):
+    """Color más frecuente (hex) ignorando el fondo transparente, cuantizado a 16 niveles por canal."""
+    import numpy as np
+
+    pixeles = np.asarray(imagen.convert('RGBA')).reshape(-1, 4)
+    opacos = pixeles[pixeles[:, 3] >= 128][:, :3]
+    if not len(opacos):
+        return None
+    cubetas = (opacos >> 4).astype(np.int32)
+    claves = cubetas[:, 0] << 8 | cubetas[:, 1] << 4 | cubetas[:, 2]
+    clave = int(np.bincount(claves).argmax())
+    r, g, b = (clave >> 8) * 16 + 8, (clave >> 4 & 0xF) * 16 + 8, (clave & 0xF) * 16 + 8
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+
+def metadatos_imagen(ruta):
+    """Metadatos de una imagen. Si no se puede decodificar, {'archivo', 'bytes', 'error'}.
+
+    Se ejecuta en los procesos del pool: recibe y retorna solo tipos simples.
+    """
+    from PIL import Image
+
+    metadatos = {'archivo': os.path.basename(ruta), 'bytes': os.path.getsize(ruta)}
+    try:
+        with Image.open(ruta) as imagen:
+            metadatos.update(formato=imagen.format, ancho=imagen.width, alto=imagen.height)
+            metadatos['orientacion_exif'] = imagen.getexif().get(_EXIF_ORIENTACION, 1)
+            # draft() deja que el decodificador JPEG reduzca al leer; PNG decodifica completo
+            imagen.draft('RGB', (LADO_ANALISIS * 4, LADO_ANALISIS * 4))
+            imagen.thumbnail((LADO_ANALISIS * 4, LADO_ANALISIS * 4))
+            metadatos['color_dominante'] = color_dominante(imagen)
+            metadatos['phash'] = hash_perceptual(imagen)
+    except Exception as e:
+        metadatos['error'] = f"{type(e).__name__}: {e}"
+    return metadatos
+
+
+def distancia_hash(a, b):
+    """Cantidad de bits distintos entre dos pHash hex."""
+    return bin(int(a, 16) ^ int(b, 16)).count('1')
+
+
+def _tramos_hash(tramos, bits=64):
+    """(desplazamiento, máscara) de `tramos` segmentos contiguos que cubren los bits del hash."""
+    segmentos, inicio = [], 0
+    for i in range(tramos):
+        ancho = (bits - inicio) // (tramos - i)
+        segmentos.append((inicio, (1 << ancho) - 1))
+        inicio += ancho
+    return segmentos
+
+
+def marcar_alertas(metadatos):
+    """Agrega la lista 'alertas' a cada imagen (in place) y retorna los metadatos.
+
+    Alertas: corrupta, sobredimensionada (lado o peso), rotada (EXIF distinto
+    de 1) y duplicada (pHash a <= DISTANCIA_DUPLICADO bits de otra imagen,
+    que queda en 'duplicada_de').
+
+    Los duplicados se buscan con un índice por tramos del hash: partido en
+    DISTANCIA_DUPLICADO + 1 tramos, dos hashes a esa distancia o menos
+    coinciden por completo en al menos uno (palomar). Cada foto se compara solo
+    con las que comparten algún tramo, no con todas las anteriores.
+    """
+    tramos = _tramos_hash(DISTANCIA_DUPLICADO + 1)
+    indice = [{} for _ in tramos]
+    vistos = []
+    for nombre in sorted(metadatos):
+        meta = metadatos[nombre]
+        alertas = []
+        if 'error' in meta:
+            alertas.append('corrupta')
+        else:
+            if max(meta['ancho'], meta['alto']) > MAX_LADO_PX or meta['bytes'] > MAX_BYTES:
+                alertas.append('sobredimensionada')
+            if meta['orientacion_exif'] != 1:
+                alertas.append('rotada')
+            valor = int(meta['phash'], 16)
+            claves = [(valor >> desplazamiento) & mascara for desplazamiento, mascara in tramos]
+            candidatos = set()
+            for clave, cubetas in zip(claves, indice):
+                candidatos.update(cubetas.get(clave, ()))
+            # En orden de aparición: la duplicada apunta a la primera foto parecida
+            for posicion in sorted(candidatos):
+                otro, valor_otro = vistos[posicion]
+                if (valor ^ valor_otro).bit_count() <= DISTANCIA_DUPLICADO:
+                    alertas.append('duplicada')
+                    meta['duplicada_de'] = otro
+                    break
+            for clave, cubetas in zip(claves, indice):
+                cubetas.setdefault(clave, []).append(len(vistos))
+            vistos.append((nombre, valor))
+        meta['alertas'] = alertas
+    return metadatos
+
+
+def analizar_imagenes(rutas, max_procesos=None):
+    """Metadatos y alertas de varias imágenes en paralelo: {nombre de archivo: metadatos}."""
+    rutas = [str(r) for r in rutas]
+    if not rutas:
+        return {}
+    procesos = min(max_procesos or os.cpu_count() or 1, len(rutas))
+    if procesos == 1:
+        resultados = map(metadatos_imagen, rutas)
+    else:
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            resultados = list(pool.map(metadatos_imagen, rutas, chunksize=max(1, len(rutas) // (procesos * 4))))
+    return marcar_alertas({meta['archivo']: meta for meta in resultados})
+
+
+def transcodificar_web(ruta, destino_dir):
+    """Convierte una imagen a la versión web (WebP, orientación EXIF aplicada).
+
+    El archivo de salida lleva el hash del contenido de origen en el nombre,
+    así cada foto se transcodifica una sola vez: si ya existe, se reutiliza.
+    Se ejecuta en los procesos del pool.
+
+    Returns:
+        dict con origen, ruta, content_type, bytes y bytes_origen
+    """
+    import hashlib
+    from PIL import Image, ImageOps
+
+    with open(ruta, 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()[:16]
+    nombre = os.path.basename(ruta).rsplit('.', 1)[0]
+    destino = os.path.join(destino_dir, f"{nombre}-{digest}.webp")
+
+    if not os.path.exists(destino):
+        with Image.open(ruta) as imagen:
+            imagen = ImageOps.exif_transpose(imagen)
+            imagen.thumbnail((LADO_WEB_PX, LADO_WEB_PX))
+            if imagen.mode not in ('RGB', 'RGBA'):
+                imagen = imagen.convert('RGBA' if 'A' in imagen.getbands() else 'RGB')
+            temporal = f"{destino}.{os.getpid()}.tmp"
+            imagen.save(temporal, 'WEBP', quality=CALIDAD_WEB, method=4)
+            os.replace(temporal, destino)
+
+    return {
+        'origen': os.path.basename(ruta),
+        'ruta': destino,
+        'content_type': CONTENT_TYPE_WEB,
+        'bytes': os.path.getsize(destino),
+        'bytes_origen': os.path.getsize(ruta),
+    }
+
+
+def transcodificar_imagenes(rutas, destino_dir, max_procesos=None):
+    """Versión web de varias imágenes en paralelo: {nombre de origen: resultado de transcodificar_web}."""
+    from functools import partial
+
+    os.makedirs(destino_dir, exist_ok=True)
+    rutas = [str(r) for r in rutas]
+    if not rutas:
+        return {}
+    tarea = partial(transcodificar_web, destino_dir=str(destino_dir))
+    procesos = min(max_procesos or os.cpu_count() or 1, len(rutas))
+    if procesos == 1:
+        resultados = list(map(tarea, rutas))
+    else:
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            resultados = list(pool.map(tarea, rutas))
+    return {r['origen']: r for r in resultados}
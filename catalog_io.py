@@ -0,0 +1,514 @@
+"""
+Importación y exportación de archivos del catálogo - Nancy's Collection
+Listas de precios de proveedores (CSV o Excel) contra tb_catalogo_stock, y
+exportación del catálogo completo a CSV o Parquet. Sin Streamlit: lo usan la
+vista IMPORTAR / EXPORTAR del panel admin y la línea de comandos.
+
+Importación en tres pasos, sin tener el archivo entero en memoria:
+  1. leer_bloques(): el archivo se lee en bloques de TAMANO_BLOQUE filas
+     (pandas chunksize para CSV, openpyxl en modo read_only para XLSX).
+  2. planificar_importacion(): cada bloque se valida y se compara contra el
+     catálogo actual con operaciones vectorizadas; solo se guardan las filas
+     nuevas o con cambios (y los errores) para la vista previa.
+  3. aplicar_importacion(): en lotes de LOTE_UPSERT filas, los productos
+     nuevos con upsert por sku y los existentes con actualizar_catalogo_lote
+     (ver edicion_catalogo.py) y el updated_at leído: si el ERP modificó un
+     producto después de leer el catálogo, vuelve como conflicto y no se pisa.
+     revisar_conflictos() adelanta ese aviso a la vista previa.
+
+Una celda vacía significa "sin cambio" para los productos existentes.
+
+Exportación: exportar_catalogo() recorre el catálogo con la paginación keyset
+(iterar_paginas) y escribe cada página al destino según llega.
+
+USO:
+    python catalog_io.py exportar --formato parquet --salida catalogo.parquet
+    python catalog_io.py importar lista_proveedor.csv            # solo vista previa
+    python catalog_io.py importar lista_proveedor.xlsx --aplicar
+    NANCY_FAKE_SUPABASE=100000 python catalog_io.py exportar      # sin Supabase
+"""
+
+import io
+import sys
+import csv
+import time
+import argparse
+from pathlib import Path
+
+import pandas as pd
+
+from catalog_queries import TABLA_CATALOGO, TAMANO_PAGINA, iterar_paginas
+from edicion_catalogo import COLUMNA_VERSION, aplicar_cambios
+from instrumentation import contar, span
+
+TAMANO_BLOQUE = 20_000
+LOTE_UPSERT = 1000
+# Columnas que se pueden importar (además de sku); descripcion no se carga en el panel
+COLUMNAS_IMPORTABLES = ['modelo', 'color', 'talla', 'precio_soles', 'stock_actual', 'url_foto']
+COLUMNAS_TEXTO = ['modelo', 'color', 'talla', 'url_foto']
+# Encabezados habituales en listas de proveedores y en el export del ERP TumiSoft
+ALIAS_COLUMNAS = {
+    'codigo': 'sku',
+    'código': 'sku',
+    'codigo_producto': 'sku',
+    'nombre': 'modelo',
+    'precio': 'precio_soles',
+    'precio_unitario': 'precio_soles',
+    'stock': 'stock_actual',
+    'stock_disponible': 'stock_actual',
+    'url_imagen': 'url_foto',
+}
+
+FORMATOS_EXPORTACION = ('csv', 'parquet')
+COLUMNAS_EXPORTACION = 'sku,modelo,descripcion,talla,color,precio_soles,stock_actual,url_foto,updated_at'
+# Filas por row group del Parquet (se acumulan varias páginas de TAMANO_PAGINA)
+FILAS_POR_GRUPO = 50_000
+
+
+class ArchivoInvalido(ValueError):
+    """El archivo no tiene un formato o encabezado que se pueda importar."""
+
+
+# --- Lectura por bloques ---
+def _abrir_binario(archivo, modo='rb'):
+    """Abre las rutas; los archivos ya abiertos se usan tal cual."""
+    return open(archivo, modo) if isinstance(archivo, (str, Path)) else archivo
+
+
+def _separador(archivo):
+    """',' o ';' (Excel en español exporta CSV con punto y coma)."""
+    muestra = archivo.read(4096)
+    archivo.seek(0)
+    if isinstance(muestra, str):
+        muestra = muestra.encode('utf-8', 'replace')
+    primera_linea = muestra.split(b'\n', 1)[0]
+    return ';' if primera_linea.count(b';') > primera_linea.count(b',') else ','
+
+
+def _bloques_csv(archivo, tamano):
+    lector = pd.read_csv(
+        archivo,
+        sep=_separador(archivo),
+        dtype=str,
+        keep_default_na=False,
+        chunksize=tamano,
+        encoding='utf-8-sig',
+        encoding_errors='replace',
+        skipinitialspace=True,
+    )
+    with lector:
+        yield from lector
+
+
+def _bloques_xlsx(archivo, tamano):
+    # Requiere openpyxl (pip install openpyxl); read_only recorre la hoja sin cargarla entera
+    from openpyxl import load_workbook
+
+    libro = load_workbook(archivo, read_only=True, data_only=True)
+    try:
+        filas = libro.active.iter_rows(values_only=True)
+        encabezado = next(filas, None)
+        if encabezado is None:
+            return
+        columnas = [str(c).strip() if c is not None else f"columna_{i}" for i, c in enumerate(encabezado)]
+        bloque = []
+        for fila in filas:
+            # Los códigos numéricos llegan como float (12345.0): se vuelven a entero
+            bloque.append([int(v) if isinstance(v, float) and v.is_integer() else v for v in fila])
+            if len(bloque) == tamano:
+                yield pd.DataFrame(bloque, columns=columnas[:len(bloque[0])])
+                bloque = []
+        if bloque:
+            yield pd.DataFrame(bloque, columns=columnas[:len(bloque[0])])
+    finally:
+        libro.close()
+
+
+def leer_bloques(archivo, nombre=None, tamano=TAMANO_BLOQUE):
+    """DataFrames de hasta `tamano` filas con las columnas tal como vienen en el archivo.
+
+    Args:
+        archivo: Ruta o archivo binario abierto (p. ej. el UploadedFile de st.file_uploader)
+        nombre: Nombre del archivo para reconocer el formato (por defecto, la ruta)
+    """
+    nombre = str(nombre or archivo)
+    extension = Path(nombre).suffix.lower()
+    if extension in ('.xlsx', '.xlsm'):
+        bloques = _bloques_xlsx
+    elif extension in ('.csv', '.txt'):
+        bloques = _bloques_csv
+    else:
+        raise ArchivoInvalido(f"Formato no soportado: {nombre} (usa CSV o XLSX)")
+    binario = _abrir_binario(archivo)
+    try:
+        yield from bloques(binario, tamano)
+    finally:
+        if binario is not archivo:
+            binario.close()
+
+
+def normalizar_encabezado(columnas):
+    """{columna del archivo: columna del catálogo} para sku y COLUMNAS_IMPORTABLES."""
+    renombrar = {}
+    for columna in columnas:
+        clave = str(columna).strip().lower().replace(' ', '_')
+        clave = ALIAS_COLUMNAS.get(clave, clave)
+        if (clave == 'sku' or clave in COLUMNAS_IMPORTABLES) and clave not in renombrar.values():
+            renombrar[columna] = clave
+    if 'sku' not in renombrar.values():
+        raise ArchivoInvalido("El archivo no tiene columna sku (o código)")
+    if len(renombrar) == 1:
+        raise ArchivoInvalido(f"Ninguna columna para importar: se esperan {', '.join(COLUMNAS_IMPORTABLES)}")
+    return renombrar
+
+
+# --- Validación y diferencias (vectorizadas por bloque) ---
+def _vacio(serie):
+    return serie.isna() | serie.astype(str).str.strip().eq('')
+
+
+def _numero(serie):
+    """Texto -> número; acepta coma decimal (79,90)."""
+    if not pd.api.types.is_numeric_dtype(serie):
+        serie = serie.astype(str).str.strip().str.replace(',', '.', regex=False)
+    return pd.to_numeric(serie, errors='coerce')
+
+
+def validar_bloque(bloque, renombrar, primera_fila, vistos):
+    """Convierte los tipos y separa las filas inválidas.
+
+    Args:
+        bloque: DataFrame crudo de leer_bloques()
+        renombrar: Resultado de normalizar_encabezado()
+        primera_fila: Número de fila del archivo de la primera fila del bloque
+        vistos: set de skus de bloques anteriores (se actualiza)
+
+    Returns:
+        (datos válidos con tipos del catálogo, DataFrame de errores con fila, sku y error)
+    """
+    crudo = bloque[list(renombrar)].rename(columns=renombrar)
+    crudo.index = pd.RangeIndex(primera_fila, primera_fila + len(crudo))
+    # sku como object: isin() sobre el string de Arrow convierte valor por valor (mucho más lento)
+    datos = pd.DataFrame({'sku': crudo['sku'].astype(str).str.strip().astype(object)}, index=crudo.index)
+    errores = []
+
+    def error(mascara, mensaje):
+        if mascara.any():
+            errores.append(pd.DataFrame({'fila': crudo.index[mascara], 'sku': datos['sku'][mascara], 'error': mensaje}))
+
+    sin_sku = _vacio(crudo['sku'])
+    error(sin_sku, "sku vacío")
+    repetido = ~sin_sku & (datos['sku'].duplicated() | datos['sku'].isin(vistos))
+    error(repetido, "sku repetido en el archivo")
+    invalida = sin_sku | repetido
+
+    for columna in COLUMNAS_TEXTO:
+        if columna in crudo:
+            texto = crudo[columna].astype('string').str.strip()
+            datos[columna] = texto.mask(texto.eq(''))
+    if 'precio_soles' in crudo:
+        precio = _numero(crudo['precio_soles']).round(2)
+        mal = ~_vacio(crudo['precio_soles']) & ~(precio >= 0)
+        error(mal, "precio no es un número mayor o igual a 0")
+        invalida |= mal
+        datos['precio_soles'] = precio
+    if 'stock_actual' in crudo:
+        stock = _numero(crudo['stock_actual'])
+        mal = ~_vacio(crudo['stock_actual']) & ~((stock >= 0) & (stock % 1 == 0))
+        error(mal, "stock no es un entero mayor o igual a 0")
+        invalida |= mal
+        datos['stock_actual'] = stock.where(~mal).astype('Int64')
+
+    vistos.update(datos['sku'][~sin_sku])
+    errores = pd.concat(errores) if errores else pd.DataFrame(columns=['fila', 'sku', 'error'])
+    return datos[~invalida], errores
+
+
+def diferencias_bloque(datos, actual):
+    """Filas nuevas o con cambios respecto del catálogo actual.
+
+    Args:
+        datos: Filas válidas de validar_bloque()
+        actual: Catálogo actual indexado por sku (al menos las columnas del archivo)
+
+    Returns:
+        (cambios, errores, sin_cambios): cambios lleva sku, accion ('nuevo' o
+        'actualizar'), campos (los que cambian), los valores a guardar y, para
+        los existentes, el valor anterior en <columna>_antes y el updated_at leído
+    """
+    columnas = [c for c in COLUMNAS_IMPORTABLES if c in datos]
+    # Búsqueda por hash en el índice del catálogo: posición de cada sku (-1 = nuevo)
+    posiciones = actual.index.get_indexer(datos['sku'])
+    existe = posiciones >= 0
+
+    nuevos = datos[~existe]
+    sin_modelo = nuevos['modelo'].isna() if 'modelo' in nuevos else pd.Series(True, index=nuevos.index)
+    errores = pd.DataFrame({
+        'fila': nuevos.index[sin_modelo], 'sku': nuevos['sku'][sin_modelo],
+        'error': "sku nuevo sin modelo (no existe en el catálogo)",
+    })
+    nuevos = nuevos[~sin_modelo].assign(accion='nuevo', campos=', '.join(columnas))
+
+    editados = datos[existe]
+    antes = actual[columnas].iloc[posiciones[existe]].set_axis(editados.index)
+    distintos = pd.DataFrame(index=editados.index)
+    for columna in columnas:
+        nuevo, anterior = editados[columna], antes[columna]
+        if columna == 'precio_soles':
+            iguales = nuevo.eq(anterior.astype(float).round(2))
+        else:
+            iguales = nuevo.astype(object).fillna('\0').eq(anterior.astype(object).fillna('\0'))
+        # Celda vacía = sin cambio
+        distintos[columna] = nuevo.notna() & ~iguales
+    cambia = distintos.any(axis=1)
+    editados = editados[cambia]
+    antes = antes[cambia]
+    # Los vacíos conservan el valor actual, así el upsert no los pisa con NULL
+    actualizados = editados.assign(**{c: editados[c].astype(object).fillna(antes[c].astype(object)) for c in columnas})
+    actualizados['accion'] = 'actualizar'
+    actualizados['campos'] = distintos[cambia].dot(pd.Index(columnas) + ', ').str.rstrip(', ')
+    actualizados = actualizados.join(antes.add_suffix('_antes'))
+    actualizados[COLUMNA_VERSION] = actual[COLUMNA_VERSION].iloc[posiciones[existe][cambia.to_numpy()]].to_numpy()
+
+    cambios = pd.concat([actualizados, nuevos]) if len(nuevos) else actualizados
+    return cambios, errores, int((~cambia).sum())
+
+
+def planificar_importacion(bloques, catalogo_actual):
+    """Valida y compara todos los bloques contra el catálogo actual.
+
+    Args:
+        bloques: Iterable de DataFrames (leer_bloques())
+        catalogo_actual: DataFrame del catálogo con columnas sku y updated_at
+            (p. ej. load_catalog_data())
+
+    Returns:
+        dict con cambios y errores (DataFrames), columnas importadas, filas
+        leídas, nuevos, actualizados, sin_cambios y version_catalogo (el
+        updated_at más reciente del catálogo leído)
+    """
+    if COLUMNA_VERSION not in catalogo_actual:
+        raise ValueError(f"El catálogo actual necesita la columna {COLUMNA_VERSION} (ver COLUMNAS_TABLA_ADMIN)")
+    actual = catalogo_actual.set_index('sku')
+    if not actual.index.is_unique:
+        actual = actual[~actual.index.duplicated()]
+    plan = {'filas': 0, 'sin_cambios': 0, 'columnas': None}
+    cambios, errores, vistos = [], [], set()
+    renombrar = None
+    with span('importacion.planificar'):
+        for bloque in bloques:
+            if renombrar is None:
+                renombrar = normalizar_encabezado(bloque.columns)
+                plan['columnas'] = [c for c in COLUMNAS_IMPORTABLES if c in renombrar.values()]
+            # +2: encabezado y numeración desde 1, como la ve el usuario en Excel
+            datos, invalidas = validar_bloque(bloque, renombrar, plan['filas'] + 2, vistos)
+            bloque_cambios, sin_modelo, sin_cambios = diferencias_bloque(datos, actual)
+            cambios.append(bloque_cambios)
+            errores.extend([invalidas, sin_modelo])
+            plan['filas'] += len(bloque)
+            plan['sin_cambios'] += sin_cambios
+    if renombrar is None:
+        raise ArchivoInvalido("El archivo está vacío")
+
+    plan['cambios'] = pd.concat(cambios, ignore_index=True)
+    plan['errores'] = pd.concat([e for e in errores if len(e)] or [pd.DataFrame(columns=['fila', 'sku', 'error'])],
+                                ignore_index=True).sort_values('fila', kind='stable', ignore_index=True)
+    plan['nuevos'] = int(plan['cambios']['accion'].eq('nuevo').sum())
+    plan['actualizados'] = len(plan['cambios']) - plan['nuevos']
+    version = pd.to_datetime(actual[COLUMNA_VERSION], utc=True, format='ISO8601').max()
+    plan['version_catalogo'] = None if pd.isna(version) else version.isoformat()
+    contar('importacion.filas', plan['filas'])
+    return plan
+
+
+def revisar_conflictos(cliente, plan):
+    """Marca los cambios del plan cuyo producto se modificó después de leer el catálogo.
+
+    Una sola consulta: los productos con updated_at posterior al más reciente
+    del catálogo leído (tras una sincronización del ERP, pocos; normalmente
+    ninguno). Es solo el aviso de la vista previa, hasta TAMANO_PAGINA
+    productos; al guardar, actualizar_catalogo_lote vuelve a comprobar cada fila.
+
+    Returns:
+        Cantidad de cambios marcados (columna conflicto de plan['cambios'])
+    """
+    cambios = plan['cambios']
+    modificados = []
+    if plan['version_catalogo'] is not None and len(cambios):
+        with span('importacion.revisar_conflictos'):
+            modificados = cliente.table(TABLA_CATALOGO).select('sku').gt(
+                COLUMNA_VERSION, plan['version_catalogo']).limit(TAMANO_PAGINA).execute().data or []
+    cambios['conflicto'] = cambios['accion'].eq('actualizar') & cambios['sku'].isin([f['sku'] for f in modificados])
+    plan['conflictos'] = int(cambios['conflicto'].sum())
+    return plan['conflictos']
+
+
+def _registros(df):
+    """Filas para supabase-py: tipos de Python y None en vez de NaN/NA."""
+    objetos = df.astype(object)
+    return objetos.where(df.notna(), None).to_dict('records')
+
+
+def aplicar_importacion(cliente, plan, lote=LOTE_UPSERT, al_avanzar=None):
+    """Guarda los cambios del plan en lotes de `lote` filas.
+
+    Los existentes van por actualizar_catalogo_lote con el updated_at leído
+    (un round trip por lote); los que cambiaron desde entonces no se pisan.
+    Los nuevos se insertan con upsert por sku.
+
+    Args:
+        cliente: Cliente de Supabase con permisos de escritura (service_role)
+        plan: Resultado de planificar_importacion()
+        al_avanzar: Callback opcional (filas procesadas, total) después de cada lote
+
+    Returns:
+        dict con guardadas (cantidad), conflictos ({sku: updated_at vigente}) y no_existen (skus)
+    """
+    columnas = ['sku'] + plan['columnas']
+    cambios = plan['cambios']
+    existentes = cambios[cambios['accion'].eq('actualizar')][columnas + [COLUMNA_VERSION]]
+    nuevos = cambios[cambios['accion'].eq('nuevo')][columnas]
+    total = len(cambios)
+    resultado = {'guardadas': 0, 'conflictos': {}, 'no_existen': []}
+    procesadas = 0
+
+    def avanzar(filas):
+        nonlocal procesadas
+        procesadas += filas
+        contar('importacion.lotes')
+        if al_avanzar is not None:
+            al_avanzar(procesadas, total)
+
+    with span('importacion.aplicar'):
+        for inicio in range(0, len(existentes), lote):
+            parte = existentes.iloc[inicio:inicio + lote]
+            guardado = aplicar_cambios(cliente, _registros(parte))
+            resultado['guardadas'] += len(guardado['aplicados'])
+            resultado['conflictos'].update(guardado['conflictos'])
+            resultado['no_existen'].extend(guardado['no_existen'])
+            avanzar(len(parte))
+        for inicio in range(0, len(nuevos), lote):
+            parte = nuevos.iloc[inicio:inicio + lote]
+            cliente.table(TABLA_CATALOGO).upsert(_registros(parte), on_conflict='sku').execute()
+            resultado['guardadas'] += len(parte)
+            avanzar(len(parte))
+    contar('importacion.aplicadas', resultado['guardadas'])
+    contar('importacion.conflictos', len(resultado['conflictos']))
+    return resultado
+
+
+# --- Exportación ---
+def _esquema_parquet(columnas):
+    import pyarrow as pa
+
+    tipos = {'precio_soles': pa.float64(), 'stock_actual': pa.int64()}
+    return pa.schema([(columna, tipos.get(columna, pa.string())) for columna in columnas])
+
+
+def exportar_catalogo(cliente, destino, formato='csv', columnas=COLUMNAS_EXPORTACION):
+    """Escribe el catálogo en destino página por página (nunca la tabla entera en memoria).
+
+    Args:
+        cliente: Cliente de Supabase
+        destino: Ruta o archivo binario abierto
+        formato: 'csv' (UTF-8 con BOM, se abre bien en Excel) o 'parquet'
+
+    Returns:
+        Cantidad de filas escritas
+    """
+    if formato not in FORMATOS_EXPORTACION:
+        raise ValueError(f"Formato no soportado: {formato}")
+    nombres = columnas.split(',')
+    filas = 0
+    with span(f'exportacion.{formato}'):
+        if formato == 'parquet':
+            # Requiere pyarrow (pip install pyarrow); un row group cada FILAS_POR_GRUPO filas
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            esquema = _esquema_parquet(nombres)
+            pendientes = []
+            with pq.ParquetWriter(destino, esquema) as escritor:
+                for pagina in iterar_paginas(cliente, columnas=columnas):
+                    pendientes.extend(pagina)
+                    filas += len(pagina)
+                    if len(pendientes) >= FILAS_POR_GRUPO:
+                        escritor.write_table(pa.Table.from_pylist(pendientes, schema=esquema))
+                        pendientes = []
+                if pendientes or not filas:
+                    escritor.write_table(pa.Table.from_pylist(pendientes, schema=esquema))
+        else:
+            binario = _abrir_binario(destino, 'wb')
+            texto = io.TextIOWrapper(binario, encoding='utf-8-sig', newline='')
+            try:
+                escritor = csv.writer(texto)
+                escritor.writerow(nombres)
+                for pagina in iterar_paginas(cliente, columnas=columnas):
+                    escritor.writerows([fila.get(c) for c in nombres] for fila in pagina)
+                    filas += len(pagina)
+            finally:
+                texto.flush()
+                # No cerrar un archivo que pasó el que llama (p. ej. un BytesIO para st.download_button)
+                if binario is destino:
+                    texto.detach()
+                else:
+                    texto.close()
+    contar('exportacion.filas', filas)
+    return filas
+
+
+# --- Línea de comandos ---
+def _cliente():
+    import streamlit as st
+
+    from data_access import obtener_cliente
+
+    return obtener_cliente(st.secrets, service_role=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Importa o exporta el catálogo en CSV, Excel o Parquet")
+    acciones = parser.add_subparsers(dest='accion', required=True)
+    exportar = acciones.add_parser('exportar', help="Catálogo completo a CSV o Parquet")
+    exportar.add_argument('--formato', choices=FORMATOS_EXPORTACION, default='csv')
+    exportar.add_argument('--salida', type=Path, help="Archivo de salida (por defecto catalogo.<formato>)")
+    importar = acciones.add_parser('importar', help="Lista de precios CSV o XLSX (vista previa)")
+    importar.add_argument('archivo', type=Path)
+    importar.add_argument('--aplicar', action='store_true', help="Guardar los cambios (si no, solo vista previa)")
+    args = parser.parse_args(argv)
+
+    cliente = _cliente()
+    inicio = time.perf_counter()
+    if args.accion == 'exportar':
+        salida = args.salida or Path(f"catalogo.{args.formato}")
+        filas = exportar_catalogo(cliente, salida, args.formato)
+        print(f"✅ {filas:,} productos exportados a {salida} ({time.perf_counter() - inicio:.1f} s)")
+        return
+
+    from catalog_queries import COLUMNAS_TABLA_ADMIN, cargar_catalogo
+
+    actual = pd.DataFrame(cargar_catalogo(cliente, columnas=COLUMNAS_TABLA_ADMIN))
+    try:
+        plan = planificar_importacion(leer_bloques(args.archivo), actual)
+    except ArchivoInvalido as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    print(f"📄 {plan['filas']:,} filas: {plan['nuevos']:,} nuevos, {plan['actualizados']:,} con cambios, "
+          f"{plan['sin_cambios']:,} sin cambios, {len(plan['errores']):,} con errores "
+          f"({time.perf_counter() - inicio:.1f} s)")
+    for error in plan['errores'].head(20).to_dict('records'):
+        print(f"   fila {error['fila']}: {error['sku']} - {error['error']}")
+    if args.aplicar:
+        resultado = aplicar_importacion(cliente, plan)
+        print(f"✅ {resultado['guardadas']:,} productos guardados ({time.perf_counter() - inicio:.1f} s)")
+        for sku in list(resultado['conflictos'])[:20]:
+            print(f"   ⚠️ {sku}: modificado después de leer el catálogo, no se guardó")
+        if resultado['conflictos'] or resultado['no_existen']:
+            print(f"⚠️ {len(resultado['conflictos']):,} en conflicto y {len(resultado['no_existen']):,} "
+                  f"eliminados durante la importación: vuelve a ejecutar para revisarlos")
+    elif len(plan['cambios']):
+        print("Vista previa: usa --aplicar para guardar los cambios")
+
+
+if __name__ == "__main__":
+    main()
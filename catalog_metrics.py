@@ -0,0 +1,67 @@
+"""
+Cálculos del catálogo - Nancy's Collection
+Filtros, facetas, métricas de inventario y preparación de tablas sobre el
+DataFrame de tb_catalogo_stock. Son funciones puras (sin Streamlit): las usan
+ambas apps y la suite de benchmarks las mide directamente.
+"""
+
+import pandas as pd
+
+# Umbral de "stock crítico" usado en alertas y métricas
+STOCK_CRITICO = 5
+
+# Columnas de la tabla del panel admin y sus títulos
+COLUMNAS_TABLA = ['url_foto', 'sku', 'modelo', 'talla', 'color', 'precio_soles', 'stock_actual']
+TITULOS_TABLA = ['Imagen', 'SKU', 'Modelo', 'Talla', 'Color', 'Precio (S/)', 'Stock']
+
+
+def filtrar_catalogo(df, modelo='Todos', color='Todos', talla='Todos', stock_minimo=0):
+    """Aplica los filtros de las apps ('Todos' = sin filtro) con una sola máscara."""
+    mascara = pd.Series(True, index=df.index)
+    if modelo != 'Todos':
+        mascara &= df['modelo'] == modelo
+    if color != 'Todos':
+        mascara &= df['color'] == color
+    if talla != 'Todos':
+        mascara &= df['talla'] == talla
+    if stock_minimo:
+        mascara &= df['stock_actual'] >= stock_minimo
+    return df[mascara]
+
+
+def opciones_filtro(df, columna):
+    """Opciones de un selectbox de filtro: 'Todos' + valores únicos ordenados."""
+    return ['Todos'] + sorted(df[columna].dropna().unique().tolist())
+
+
+def conteo_facetas(df, columnas=('modelo', 'color', 'talla')):
+    """Cantidad de productos por valor de cada faceta: {columna: Series}."""
+    return {columna: df[columna].value_counts() for columna in columnas}
+
+
+def metricas_inventario(df):
+    """Métricas del resumen rápido y de la vista de analytics."""
+    stock = df['stock_actual']
+    return {
+        'total_productos': len(df),
+        'valor_inventario': float((df['precio_soles'] * stock).sum()),
+        'stock_total': int(stock.sum()),
+        'agotados': int((stock == 0).sum()),
+        'criticos': int((stock <= STOCK_CRITICO).sum()),
+    }
+
+
+def estado_stock(stock):
+    """Clase CSS y texto del badge de stock del panel admin."""
+    if stock == 0:
+        return "stock-out", "AGOTADO"
+    if stock <= STOCK_CRITICO:
+        return "stock-low", f"BAJO STOCK ({stock})"
+    return "stock-ok", f"DISPONIBLE ({stock})"
+
+
+def preparar_tabla_admin(df):
+    """DataFrame listo para st.dataframe en la vista de tabla del panel admin."""
+    tabla = df[COLUMNAS_TABLA].copy()
+    tabla.columns = TITULOS_TABLA
+    return tabla
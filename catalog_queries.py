@@ -0,0 +1,151 @@
+"""
+Consultas al catálogo - Nancy's Collection
+Proyecciones de columnas por vista y paginación keyset (por cursor) sobre tb_catalogo_stock,
+compartidas por el catálogo público y el panel admin.
+
+Cada página continúa desde el último (modelo, sku) visto en lugar de usar OFFSET:
+el costo de la página N es el mismo que el de la página 1 y, como el cursor es
+una clave única, las filas no se repiten ni se saltan aunque la sincronización
+del ERP esté actualizando stock o precios durante el recorrido.
+"""
+
+from instrumentation import span
+
+TABLA_CATALOGO = 'tb_catalogo_stock'
+
+# Supabase limita cada respuesta de PostgREST a 1000 filas por defecto
+TAMANO_PAGINA = 1000
+
+# Columnas que forman el cursor (deben coincidir con idx_tb_catalogo_modelo_sku
+# e idx_tb_catalogo_disponibles_cursor)
+COLUMNAS_CURSOR = ('modelo', 'sku')
+
+# --- Proyecciones por vista ---
+# Ninguna vista necesita created_at. descripcion (texto largo) no se muestra en
+# las tarjetas: el panel admin la pide al abrir el detalle de un producto y el
+# catálogo público la carga solo porque la búsqueda la indexa.
+COLUMNAS_GALERIA_PUBLICA = 'sku,modelo,color,talla,precio_soles,stock_actual,url_foto'
+# Snapshot del catálogo público: galería + descripcion para catalog_search.CAMPOS_BUSQUEDA
+COLUMNAS_CATALOGO_PUBLICO = COLUMNAS_GALERIA_PUBLICA + ',descripcion'
+COLUMNAS_VALIDACION_CARRITO = 'sku,stock_actual,precio_soles'
+# updated_at es la versión para la edición por lotes (ver edicion_catalogo.py)
+COLUMNAS_TABLA_ADMIN = 'sku,modelo,color,talla,precio_soles,stock_actual,url_foto,updated_at'
+COLUMNAS_DETALLE_ADMIN = 'sku,descripcion'
+
+
+def crear_cliente(url, key):
+    """Crea el cliente de Supabase.
+
+    No hace falta pedir compresión: httpx ya envía Accept-Encoding: gzip, deflate
+    y reemplazar headers en ClientOptions pisaría los encabezados por defecto.
+    """
+    from supabase import create_client
+
+    return create_client(url, key)
+
+
+def valor_postgrest(valor):
+    """Cita un valor para usarlo dentro de un filtro or=(...) de PostgREST.
+
+    Los modelos pueden contener comas, puntos o paréntesis, que PostgREST
+    interpreta como separadores si no van entre comillas dobles.
+    """
+    texto = str(valor).replace('\\', '\\\\').replace('"', '\\"')
+    return f'"{texto}"'
+
+
+def asegurar_columnas_cursor(columnas):
+    """Agrega modelo y sku a la proyección si no están (se necesitan para el cursor)."""
+    if columnas.strip() == '*':
+        return columnas
+    presentes = [c.strip() for c in columnas.split(',')]
+    faltantes = [c for c in COLUMNAS_CURSOR if c not in presentes]
+    return ','.join(presentes + faltantes)
+
+
+def pagina_catalogo(supabase, despues=None, limite=TAMANO_PAGINA, columnas='*', solo_disponibles=False):
+    """Obtiene una página del catálogo ordenada por (modelo, sku).
+
+    Args:
+        supabase: Cliente de Supabase
+        despues: Cursor (modelo, sku) de la última fila de la página anterior, o None para la primera
+        limite: Filas por página
+        columnas: Proyección para select()
+        solo_disponibles: Si es True, solo productos con stock_actual > 0
+
+    Returns:
+        Tupla (filas, cursor_siguiente). cursor_siguiente es None en la última página.
+    """
+    consulta = supabase.table(TABLA_CATALOGO).select(asegurar_columnas_cursor(columnas))
+
+    if solo_disponibles:
+        consulta = consulta.gt('stock_actual', 0)
+
+    if despues is not None:
+        modelo, sku = despues
+        # Equivale a (modelo, sku) > (:modelo, :sku). El gte acota el rango del
+        # índice y el or solo descarta las filas del mismo modelo ya vistas.
+        consulta = consulta.gte('modelo', modelo).or_(
+            f"modelo.gt.{valor_postgrest(modelo)},sku.gt.{valor_postgrest(sku)}"
+        )
+
+    with span('supabase.pagina_catalogo'):
+        response = consulta.order('modelo').order('sku').limit(limite).execute()
+    filas = response.data or []
+
+    if len(filas) < limite:
+        return filas, None
+    ultima = filas[-1]
+    return filas, (ultima['modelo'], ultima['sku'])
+
+
+def iterar_paginas(supabase, limite=TAMANO_PAGINA, columnas='*', solo_disponibles=False):
+    """Recorre el catálogo completo página por página (generador de listas de filas)."""
+    cursor = None
+    while True:
+        filas, cursor = pagina_catalogo(
+            supabase,
+            despues=cursor,
+            limite=limite,
+            columnas=columnas,
+            solo_disponibles=solo_disponibles
+        )
+        if filas:
+            yield filas
+        if cursor is None:
+            break
+
+
+def cargar_catalogo(supabase, columnas='*', solo_disponibles=False):
+    """Carga todas las filas del catálogo (supera el límite de 1000 filas por respuesta)."""
+    filas = []
+    for pagina in iterar_paginas(supabase, columnas=columnas, solo_disponibles=solo_disponibles):
+        filas.extend(pagina)
+    return filas
+
+
+def stock_por_sku(supabase, skus):
+    """Stock y precio vigentes de los SKUs indicados (validación del carrito).
+
+    Returns:
+        Diccionario {sku: fila} con las columnas de COLUMNAS_VALIDACION_CARRITO
+    """
+    if not skus:
+        return {}
+    with span('supabase.stock_por_sku'):
+        response = supabase.table(TABLA_CATALOGO)\
+            .select(COLUMNAS_VALIDACION_CARRITO)\
+            .in_('sku', list(skus))\
+            .execute()
+    return {fila['sku']: fila for fila in response.data or []}
+
+
+def detalle_producto(supabase, sku):
+    """Campos pesados de un producto (descripción), cargados bajo demanda."""
+    with span('supabase.detalle_producto'):
+        response = supabase.table(TABLA_CATALOGO)\
+            .select(COLUMNAS_DETALLE_ADMIN)\
+            .eq('sku', sku)\
+            .limit(1)\
+            .execute()
+    return response.data[0] if response.data else {}
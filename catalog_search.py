@@ -0,0 +1,153 @@
+"""
+Búsqueda de productos - Nancy's Collection
+Índice invertido en memoria con tolerancia a errores de tipeo (trigramas, al estilo pg_trgm).
+Se construye una sola vez por cada refresco del catálogo y se reutiliza en todos los reruns.
+"""
+
+import re
+import math
+import unicodedata
+from collections import defaultdict
+
+# Campos indexados y su peso en el ranking
+CAMPOS_BUSQUEDA = {
+    'modelo': 3.0,
+    'color': 2.0,
+    'talla': 1.0,
+    'descripcion': 0.5,
+}
+
+# Similitud mínima para considerar un término como coincidencia difusa (igual que pg_trgm)
+UMBRAL_SIMILITUD = 0.3
+# Máximo de términos del vocabulario que se expanden por cada palabra de la consulta
+MAX_EXPANSIONES = 8
+
+_PATRON_TOKEN = re.compile(r'[a-z0-9]+')
+
+
+def normalizar(texto):
+    """Pasa a minúsculas y elimina tildes ('Pantalón' -> 'pantalon')."""
+    texto = unicodedata.normalize('NFKD', str(texto).lower())
+    return ''.join(c for c in texto if not unicodedata.combining(c))
+
+
+def tokenizar(texto):
+    """Divide un texto en palabras normalizadas."""
+    return _PATRON_TOKEN.findall(normalizar(texto))
+
+
+def trigramas(token):
+    """Trigramas de una palabra con el mismo relleno que usa pg_trgm."""
+    relleno = f"  {token} "
+    return {relleno[i:i + 3] for i in range(len(relleno) - 2)}
+
+
+class IndiceCatalogo:
+    """Índice invertido sobre los registros del catálogo.
+
+    Cada documento es la posición del registro en la lista original, de modo que
+    los resultados se pueden aplicar directamente con ``df.iloc``.
+    """
+
+    def __init__(self, registros, campos=None):
+        campos = campos or CAMPOS_BUSQUEDA
+        self.total_docs = 0
+        self._postings = defaultdict(dict)       # término -> {doc: peso}
+        self._trigramas = defaultdict(set)       # trigrama -> {término}
+        self._trigramas_termino = {}             # término -> {trigramas}
+
+        # Los valores se repiten mucho (modelo, color, talla): tokenizar cada uno una sola vez
+        tokens_por_valor = {}
+
+        for doc, registro in enumerate(registros):
+            self.total_docs += 1
+            for campo, peso in campos.items():
+                valor = registro.get(campo)
+                if valor is None or valor != valor:  # None o NaN
+                    continue
+                tokens = tokens_por_valor.get(valor)
+                if tokens is None:
+                    tokens = tokens_por_valor[valor] = tokenizar(valor)
+                for token in tokens:
+                    pesos = self._postings[token]
+                    if pesos.get(doc, 0) < peso:
+                        pesos[doc] = peso
+
+        for termino in self._postings:
+            tris = trigramas(termino)
+            self._trigramas_termino[termino] = tris
+            for tri in tris:
+                self._trigramas[tri].add(termino)
+
+    @classmethod
+    def desde_dataframe(cls, df, campos=None):
+        """Construye el índice a partir de un DataFrame del catálogo."""
+        campos = campos or CAMPOS_BUSQUEDA
+        presentes = [c for c in campos if c in df.columns]
+        return cls(df[presentes].to_dict('records'), {c: campos[c] for c in presentes})
+
+    def _idf(self, termino):
+        return math.log(1 + self.total_docs / len(self._postings[termino]))
+
+    def _expandir(self, token):
+        """Términos del vocabulario que coinciden con una palabra de la consulta.
+
+        Retorna una lista de (término, similitud): coincidencia exacta, prefijo
+        (para búsqueda mientras se escribe) y, si no hay ninguna, trigramas.
+        """
+        if token in self._postings:
+            return [(token, 1.0)]
+
+        if len(token) >= 3:
+            prefijos = [t for t in self._postings if t.startswith(token)]
+            if prefijos:
+                return [(t, 0.9) for t in prefijos[:MAX_EXPANSIONES]]
+
+        tris = trigramas(token)
+        comunes = defaultdict(int)
+        for tri in tris:
+            for termino in self._trigramas.get(tri, ()):
+                comunes[termino] += 1
+
+        candidatos = []
+        for termino, n in comunes.items():
+            similitud = n / len(tris | self._trigramas_termino[termino])
+            if similitud >= UMBRAL_SIMILITUD:
+                candidatos.append((termino, similitud))
+        candidatos.sort(key=lambda c: c[1], reverse=True)
+        return candidatos[:MAX_EXPANSIONES]
+
+    def buscar(self, consulta, limite=None):
+        """Busca productos y retorna las posiciones ordenadas por relevancia.
+
+        Todas las palabras de la consulta deben coincidir (exacta, por prefijo o
+        de forma difusa) para que un producto aparezca en los resultados.
+        """
+        tokens = tokenizar(consulta)
+        if not tokens:
+            return []
+
+        puntajes = None
+        for token in dict.fromkeys(tokens):
+            parcial = defaultdict(float)
+            for termino, similitud in self._expandir(token):
+                factor = similitud * self._idf(termino)
+                for doc, peso in self._postings[termino].items():
+                    valor = factor * peso
+                    if valor > parcial[doc]:
+                        parcial[doc] = valor
+
+            if not parcial:
+                return []
+            if puntajes is None:
+                puntajes = parcial
+            else:
+                if len(parcial) < len(puntajes):
+                    puntajes, parcial = parcial, puntajes
+                puntajes = {doc: p + parcial[doc] for doc, p in puntajes.items() if doc in parcial}
+                if not puntajes:
+                    return []
+
+        # Orden estable: mayor puntaje primero y, a igualdad, el orden original del catálogo
+        ranking = sorted(puntajes, key=lambda doc: (-puntajes[doc], doc))
+        return ranking[:limite] if limite else ranking
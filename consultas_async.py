@@ -0,0 +1,300 @@
+"""
+Consultas concurrentes - Nancy's Collection
+Ruta asyncio para las lecturas independientes de una página: se lanzan todas a
+la vez y el rerun espera solo a la más lenta, no a la suma.
+
+- ClientePostgrestAsync: httpx.AsyncClient con HTTP/2 y pool de conexiones
+  directo contra PostgREST (mismas consultas que catalog_queries.py).
+- ClienteHilos: adapta un cliente síncrono (el fake de pruebas) corriendo cada
+  consulta en un hilo, para medir la concurrencia sin red.
+
+Con una cubeta (pasarela_datos.CubetaTokens) cada request HTTP toma su token
+antes de salir: una carga del catálogo de 100 páginas cuenta como 100
+requests para el límite de NANCY_SUPABASE_RPS, no como una.
+
+Las corrutinas corren en un único event loop de fondo por proceso, así el pool
+HTTP/2 se reutiliza entre reruns y sesiones. La carga completa del catálogo se
+reparte en rangos keyset (cortes del snapshot anterior) que se piden en
+paralelo: cada rango sigue paginando por (modelo, sku), así que no se repiten
+ni se pierden filas aunque el catálogo haya cambiado entre cargas. La primera
+carga del proceso saca los cortes de un conteo y una clave por rango.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from catalog_queries import (
+    COLUMNAS_VALIDACION_CARRITO,
+    TABLA_CATALOGO,
+    TAMANO_PAGINA,
+    asegurar_columnas_cursor,
+    valor_postgrest,
+)
+from instrumentation import contar, span
+
+# Rangos que se piden en paralelo como máximo al cargar el catálogo
+MAX_RANGOS = 8
+TIMEOUT_CONSULTA = 30
+
+
+async def _turno(cubeta):
+    """Un token de la cubeta por request (sin cubeta no hay límite)."""
+    if cubeta is None:
+        return
+    with span('pasarela.cola'):
+        await cubeta.tomar_async()
+    contar('pasarela.consultas')
+
+
+class ClientePostgrestAsync:
+    """PostgREST por HTTP/2 con conexiones reutilizadas (se crea dentro del event loop)."""
+
+    def __init__(self, url, key, max_conexiones=10, cubeta=None):
+        self.base = f"{url.rstrip('/')}/rest/v1"
+        self.cabeceras = {
+            'apikey': key,
+            'Authorization': f"Bearer {key}",
+            'Accept-Encoding': 'gzip, deflate',
+        }
+        self.max_conexiones = max_conexiones
+        self.cubeta = cubeta
+        self._http = None
+
+    def _cliente(self):
+        import httpx
+
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                base_url=self.base,
+                headers=self.cabeceras,
+                http2=True,
+                timeout=TIMEOUT_CONSULTA,
+                limits=httpx.Limits(max_connections=self.max_conexiones,
+                                    max_keepalive_connections=self.max_conexiones),
+            )
+        return self._http
+
+    @staticmethod
+    def parametros(llamadas):
+        """Traduce las llamadas del builder (select, gt, or_, order...) a la query string de PostgREST."""
+        parametros, ors, ordenes = [], [], []
+        for metodo, *args in llamadas:
+            if metodo == 'select':
+                parametros.append(('select', args[0]))
+            elif metodo in ('eq', 'neq', 'gt', 'gte', 'lt', 'lte'):
+                parametros.append((args[0], f"{metodo}.{args[1]}"))
+            elif metodo == 'in_':
+                parametros.append((args[0], f"in.({','.join(valor_postgrest(v) for v in args[1])})"))
+            elif metodo == 'or_':
+                ors.append(args[0])
+            elif metodo == 'order':
+                ordenes.append(f"{args[0]}.asc")
+            elif metodo in ('limit', 'offset'):
+                parametros.append((metodo, str(args[0])))
+        if len(ors) == 1:
+            parametros.append(('or', f"({ors[0]})"))
+        elif ors:
+            # PostgREST admite un solo or= por nivel: varios se anidan en un and=
+            parametros.append(('and', f"({','.join(f'or({o})' for o in ors)})"))
+        if ordenes:
+            parametros.append(('order', ','.join(ordenes)))
+        return parametros
+
+    async def ejecutar(self, tabla, llamadas):
+        await _turno(self.cubeta)
+        respuesta = await self._cliente().get(f"/{tabla}", params=self.parametros(llamadas))
+        respuesta.raise_for_status()
+        return respuesta.json()
+
+    async def contar(self, tabla, llamadas):
+        """Filas que cumplen los filtros: HEAD con Prefer: count=exact (sin cuerpo)."""
+        await _turno(self.cubeta)
+        respuesta = await self._cliente().head(
+            f"/{tabla}", params=self.parametros(llamadas), headers={'Prefer': 'count=exact'}
+        )
+        respuesta.raise_for_status()
+        # Content-Range: 0-999/12345 (o */0 si no hay filas)
+        return int(respuesta.headers['content-range'].rsplit('/', 1)[1])
+
+
+class ClienteHilos:
+    """Cliente síncrono (supabase o SupabaseFake) con la interfaz async: cada consulta en un hilo."""
+
+    def __init__(self, cliente, cubeta=None):
+        self.cliente = cliente
+        self.cubeta = cubeta
+
+    def _ejecutar_sync(self, tabla, llamadas):
+        consulta = self.cliente.table(tabla)
+        for metodo, *args in llamadas:
+            consulta = getattr(consulta, metodo)(*args)
+        return consulta.execute().data or []
+
+    def _contar_sync(self, tabla, llamadas):
+        consulta = self.cliente.table(tabla).select('sku', count='exact')
+        for metodo, *args in llamadas:
+            consulta = getattr(consulta, metodo)(*args)
+        return consulta.limit(1).execute().count
+
+    async def ejecutar(self, tabla, llamadas):
+        await _turno(self.cubeta)
+        return await asyncio.to_thread(self._ejecutar_sync, tabla, llamadas)
+
+    async def contar(self, tabla, llamadas):
+        await _turno(self.cubeta)
+        return await asyncio.to_thread(self._contar_sync, tabla, llamadas)
+
+
+# --- Event loop de fondo (uno por proceso) ---
+_bucle = None
+_candado_bucle = threading.Lock()
+
+
+def _event_loop():
+    global _bucle
+    with _candado_bucle:
+        if _bucle is None:
+            _bucle = asyncio.new_event_loop()
+            # Hilos de ClienteHilos: el default (núcleos + 4) limitaría los rangos en paralelo
+            _bucle.set_default_executor(ThreadPoolExecutor(max_workers=2 * MAX_RANGOS, thread_name_prefix='nancy-consulta'))
+            threading.Thread(target=_bucle.run_forever, daemon=True, name='nancy-consultas').start()
+    return _bucle
+
+
+def en_paralelo(**consultas):
+    """Ejecuta varias corrutinas a la vez y retorna {nombre: resultado}.
+
+    Se llama desde el hilo del script de Streamlit (que no tiene event loop):
+    bloquea hasta que termina la más lenta. Si alguna falla, se propaga el error.
+    """
+    async def juntar():
+        resultados = await asyncio.gather(*consultas.values())
+        return dict(zip(consultas, resultados))
+
+    with span('async.en_paralelo'):
+        return asyncio.run_coroutine_threadsafe(juntar(), _event_loop()).result()
+
+
+# --- Consultas ---
+def _filtros_catalogo(solo_disponibles):
+    return [('gt', 'stock_actual', 0)] if solo_disponibles else []
+
+
+def _llamadas_rango(columnas, solo_disponibles, desde, hasta, limite):
+    """Página de desde < (modelo, sku) <= hasta (None = sin límite de ese lado)."""
+    llamadas = [('select', asegurar_columnas_cursor(columnas)), *_filtros_catalogo(solo_disponibles)]
+    if desde is not None:
+        modelo, sku = desde
+        llamadas += [('gte', 'modelo', modelo),
+                     ('or_', f"modelo.gt.{valor_postgrest(modelo)},sku.gt.{valor_postgrest(sku)}")]
+    if hasta is not None:
+        modelo, sku = hasta
+        llamadas += [('lte', 'modelo', modelo),
+                     ('or_', f"modelo.lt.{valor_postgrest(modelo)},sku.lte.{valor_postgrest(sku)}")]
+    return llamadas + [('order', 'modelo'), ('order', 'sku'), ('limit', limite)]
+
+
+async def rango_catalogo(cliente, desde=None, hasta=None, columnas='*', solo_disponibles=False,
+                         limite=TAMANO_PAGINA):
+    """Todas las filas con desde < (modelo, sku) <= hasta, paginando por cursor dentro del rango."""
+    filas = []
+    cursor = desde
+    while True:
+        with span('supabase.pagina_catalogo'):
+            pagina = await cliente.ejecutar(
+                TABLA_CATALOGO, _llamadas_rango(columnas, solo_disponibles, cursor, hasta, limite)
+            )
+        filas.extend(pagina)
+        if len(pagina) < limite:
+            return filas
+        cursor = (pagina[-1]['modelo'], pagina[-1]['sku'])
+
+
+def cortes_catalogo(filas, rangos=MAX_RANGOS, limite=TAMANO_PAGINA):
+    """Cursores que reparten las filas en rangos de al menos una página (para la próxima carga)."""
+    if len(filas) <= limite:
+        return []
+    paso = max(limite, -(-len(filas) // rangos))
+    return [(filas[i]['modelo'], filas[i]['sku']) for i in range(paso - 1, len(filas) - 1, paso)]
+
+
+async def muestrear_cortes(cliente, solo_disponibles=False, rangos=MAX_RANGOS, limite=TAMANO_PAGINA):
+    """Los cortes que daría cortes_catalogo() sin tener una carga anterior.
+
+    Un conteo y, en paralelo, la clave (modelo, sku) de la fila en cada límite
+    de rango (offset + limit 1 sobre el mismo índice): dos round trips chicos
+    en lugar de paginar todo el catálogo en secuencia la primera vez.
+    """
+    filtros = _filtros_catalogo(solo_disponibles)
+    with span('async.muestrear_cortes'):
+        total = await cliente.contar(TABLA_CATALOGO, filtros)
+        if total <= limite:
+            return []
+        paso = max(limite, -(-total // rangos))
+        claves = await asyncio.gather(*(
+            cliente.ejecutar(TABLA_CATALOGO, [
+                ('select', 'modelo,sku'), *filtros, ('order', 'modelo'), ('order', 'sku'),
+                ('offset', posicion), ('limit', 1),
+            ])
+            for posicion in range(paso - 1, total - 1, paso)
+        ))
+    # Si se borraron filas entre el conteo y las claves, el último offset puede venir vacío
+    return [(fila[0]['modelo'], fila[0]['sku']) for fila in claves if fila]
+
+
+async def cargar_catalogo_async(cliente, columnas='*', solo_disponibles=False, cortes=()):
+    """Catálogo completo ordenado por (modelo, sku), un rango keyset por tarea en paralelo.
+
+    `cortes` (de cortes_catalogo() sobre la carga anterior) solo define cómo se
+    reparte el trabajo: los rangos cubren todo el espacio de claves, así que
+    filas nuevas o borradas desde entonces se leen bien. Sin cortes es la
+    paginación secuencial de siempre.
+    """
+    limites = [None, *cortes, None]
+    contar('async.rangos_catalogo', len(limites) - 1)
+    partes = await asyncio.gather(*(
+        rango_catalogo(cliente, desde, hasta, columnas, solo_disponibles)
+        for desde, hasta in zip(limites, limites[1:])
+    ))
+    return [fila for parte in partes for fila in parte]
+
+
+async def stock_por_sku_async(cliente, skus):
+    """Igual que catalog_queries.stock_por_sku: {sku: fila} con stock y precio vigentes."""
+    if not skus:
+        return {}
+    with span('supabase.stock_por_sku'):
+        filas = await cliente.ejecutar(
+            TABLA_CATALOGO, [('select', COLUMNAS_VALIDACION_CARRITO), ('in_', 'sku', list(skus))]
+        )
+    return {fila['sku']: fila for fila in filas}
+
+
+# Cortes de la última carga por (columnas, solo_disponibles), compartidos por las
+# sesiones: cada sesión de Streamlit lo lee y reescribe desde su propio hilo
+_cortes_previos = {}
+_candado_cortes = threading.Lock()
+
+
+async def cargar_catalogo_rangos(cliente, columnas='*', solo_disponibles=False):
+    """Catálogo completo con los rangos en paralelo (corrutina, para juntarla con otras en en_paralelo).
+
+    Reparte el trabajo según dónde cayeron las filas en la carga anterior del
+    proceso; la primera vez muestrea los cortes (muestrear_cortes).
+    """
+    clave = (columnas, solo_disponibles)
+    with _candado_cortes:
+        cortes = _cortes_previos.get(clave)
+    if cortes is None:
+        cortes = await muestrear_cortes(cliente, solo_disponibles)
+    filas = await cargar_catalogo_async(cliente, columnas, solo_disponibles, cortes)
+    cortes = cortes_catalogo(filas)
+    with _candado_cortes:
+        _cortes_previos[clave] = cortes
+    return filas
+
+
+def cargar_catalogo_concurrente(cliente, columnas='*', solo_disponibles=False):
+    """Versión síncrona de cargar_catalogo_rangos() para las apps."""
+    return en_paralelo(filas=cargar_catalogo_rangos(cliente, columnas, solo_disponibles))['filas']
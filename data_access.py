@@ -0,0 +1,69 @@
+"""
+Acceso a datos - Nancy's Collection
+Punto único para obtener el cliente de Supabase en las apps y scripts.
+
+Con NANCY_FAKE_SUPABASE definida se devuelve el cliente en memoria de
+fake_supabase.py (con la latencia, ancho de banda y errores configurados),
+así cualquier flujo se puede medir sin conexión. Sin ella, el cliente real.
+"""
+
+from catalog_queries import crear_cliente
+
+
+def obtener_cliente(secrets, service_role=False):
+    """Cliente de Supabase (real o fake) a partir de st.secrets.
+
+    Args:
+        secrets: st.secrets (o un dict con la sección [supabase])
+        service_role: Usar service_role_key si está configurada (escrituras en Storage)
+
+    Raises:
+        KeyError: Si falta la configuración de [supabase] y no hay fake activo
+    """
+    from fake_supabase import cliente_desde_entorno
+
+    fake = cliente_desde_entorno()
+    if fake is not None:
+        return fake
+
+    url = secrets["supabase"]["url"]
+    if service_role:
+        key = secrets["supabase"].get("service_role_key") or secrets["supabase"]["key"]
+    else:
+        key = secrets["supabase"]["key"]
+    return crear_cliente(url, key)
+
+
+def obtener_cliente_async(secrets, cliente_sync=None, cubeta=None):
+    """Cliente para consultas_async.py (lecturas concurrentes).
+
+    Con el fake activo (o si cliente_sync ya es un SupabaseFake) se adapta ese
+    mismo cliente en memoria, así las escrituras del panel se ven en las
+    lecturas concurrentes. Sin fake, httpx.AsyncClient con HTTP/2 contra
+    PostgREST usando la clave anónima.
+
+    cubeta: pasarela_datos.CubetaTokens para tomar un token por request (None = sin límite)
+    """
+    from consultas_async import ClienteHilos, ClientePostgrestAsync
+    from fake_supabase import SupabaseFake, cliente_desde_entorno
+
+    if isinstance(cliente_sync, SupabaseFake):
+        return ClienteHilos(cliente_sync, cubeta)
+    fake = cliente_desde_entorno()
+    if fake is not None:
+        return ClienteHilos(fake, cubeta)
+
+    return ClientePostgrestAsync(secrets["supabase"]["url"], secrets["supabase"]["key"], cubeta=cubeta)
+
+
+def obtener_cliente_escritura(secrets, cliente_lectura=None):
+    """Cliente con service_role_key para las escrituras del panel admin.
+
+    Con el fake activo se reutiliza el cliente en memoria de las lecturas
+    (como obtener_cliente_async), así lo guardado se ve al recargar.
+    """
+    from fake_supabase import SupabaseFake
+
+    if isinstance(cliente_lectura, SupabaseFake):
+        return cliente_lectura
+    return obtener_cliente(secrets, service_role=True)
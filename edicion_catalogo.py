@@ -0,0 +1,101 @@
+"""
+Edición por lotes del catálogo - Nancy's Collection
+Stock y precios editados en la grilla del panel admin (st.data_editor). Todos
+los cambios se guardan juntos con la función actualizar_catalogo_lote
+(migrations/004_edicion_lote.sql): editar 500 filas es un solo round trip.
+
+Concurrencia optimista: cada cambio viaja con el updated_at que tenía la fila
+al cargarse el panel. Si la sincronización del ERP la modificó después, esa
+fila vuelve como conflicto y no se pisa; el resto del lote sí se guarda.
+
+Son funciones puras sobre DataFrames más la llamada RPC (sin Streamlit).
+"""
+
+import pandas as pd
+
+from instrumentation import contar, span
+
+FUNCION_LOTE = 'actualizar_catalogo_lote'
+COLUMNAS_EDITABLES = ['precio_soles', 'stock_actual']
+# Columnas que acepta la función (migrations/007); la importación de archivos manda también las de texto
+COLUMNAS_LOTE = ['modelo', 'color', 'talla', 'precio_soles', 'stock_actual', 'url_foto']
+COLUMNA_VERSION = 'updated_at'
+
+
+def cambios_editados(original, editado):
+    """Filas que cambiaron en el editor, listas para aplicar_cambios().
+
+    Args:
+        original: DataFrame indexado por sku con COLUMNAS_EDITABLES y updated_at
+        editado: lo que devolvió st.data_editor para ese mismo DataFrame
+
+    Returns:
+        Lista de {sku, precio_soles, stock_actual, updated_at}; updated_at es
+        la versión original (la que se leyó, no la del editor)
+    """
+    editado = editado.reindex(original.index)
+    antes = original[COLUMNAS_EDITABLES]
+    despues = editado[COLUMNAS_EDITABLES]
+    # Comparación vectorizada; el precio se compara en céntimos para no marcar ruido de float
+    iguales = (
+        antes['precio_soles'].round(2).eq(despues['precio_soles'].round(2))
+        & antes['stock_actual'].eq(despues['stock_actual'])
+    )
+    distintos = despues[~iguales]
+    if distintos.empty:
+        return []
+    filas = pd.DataFrame({
+        'sku': distintos.index,
+        'precio_soles': distintos['precio_soles'].round(2).to_numpy(),
+        'stock_actual': distintos['stock_actual'].to_numpy(),
+        COLUMNA_VERSION: original.loc[distintos.index, COLUMNA_VERSION].to_numpy(),
+    })
+    return [
+        {
+            'sku': fila['sku'],
+            'precio_soles': None if pd.isna(fila['precio_soles']) else float(fila['precio_soles']),
+            'stock_actual': None if pd.isna(fila['stock_actual']) else int(fila['stock_actual']),
+            COLUMNA_VERSION: fila[COLUMNA_VERSION],
+        }
+        for fila in filas.to_dict('records')
+    ]
+
+
+def validar_cambios(cambios):
+    """Mensajes de error (lista vacía si el lote es válido)."""
+    errores = []
+    for cambio in cambios:
+        if cambio['stock_actual'] is None or cambio['stock_actual'] < 0:
+            errores.append(f"{cambio['sku']}: el stock debe ser 0 o más")
+        if cambio['precio_soles'] is None or cambio['precio_soles'] < 0:
+            errores.append(f"{cambio['sku']}: el precio debe ser 0 o más")
+    return errores
+
+
+def aplicar_cambios(cliente, cambios):
+    """Guarda el lote en un solo round trip.
+
+    Args:
+        cliente: Cliente de Supabase con permisos de escritura (service_role)
+        cambios: Resultado de cambios_editados(), o dicts con sku, updated_at y
+            cualquiera de COLUMNAS_LOTE (None = sin cambio)
+
+    Returns:
+        dict con aplicados (skus), conflictos ({sku: updated_at vigente}) y no_existen (skus)
+    """
+    resultado = {'aplicados': [], 'conflictos': {}, 'no_existen': []}
+    if not cambios:
+        return resultado
+    with span('edicion.aplicar_lote'):
+        respuesta = cliente.rpc(FUNCION_LOTE, {'cambios': cambios}).execute()
+    for fila in respuesta.data or []:
+        if fila['estado'] == 'ok':
+            resultado['aplicados'].append(fila['sku'])
+        elif fila['estado'] == 'conflicto':
+            resultado['conflictos'][fila['sku']] = fila[COLUMNA_VERSION]
+        else:
+            resultado['no_existen'].append(fila['sku'])
+    contar('edicion.lotes')
+    contar('edicion.aplicados', len(resultado['aplicados']))
+    contar('edicion.conflictos', len(resultado['conflictos']))
+    return resultado
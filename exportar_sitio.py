@@ -0,0 +1,239 @@
+"""
+Exportación a sitio estático - Nancy's Collection
+Genera una versión estática del catálogo público para servir desde un CDN
+(Netlify, Cloudflare Pages, un bucket de Storage...) sin sesiones de Streamlit:
+
+    sitio/
+    ├── index.html, pagina-2.html, ...   tarjetas ya renderizadas (48 por página)
+    ├── datos/catalogo.json              catálogo compacto (columnas + filas)
+    └── assets/                          CSS de la app + sitio.css y sitio.js
+
+Las tarjetas salen de tarjetas_html.py (el mismo marcado que la app). En el
+navegador, assets/sitio.js filtra y busca sobre datos/catalogo.json y guarda
+el carrito en localStorage; el pedido por WhatsApp genera el mismo mensaje que
+catalogo_publico.py.
+
+Regeneración incremental: solo se reescriben los archivos cuyo contenido
+cambió (sitio/.manifiesto.json guarda el hash de cada uno), así un deploy o
+una sincronización al CDN sube únicamente lo que cambió. Con --cada N se
+consulta Supabase cada N segundos y se regenera cuando cambian los datos.
+
+Los nombres son estables (sin hash): configurar en el CDN una cache corta o
+con revalidación (ETag) para *.html y datos/.
+
+USO:
+    python exportar_sitio.py
+    python exportar_sitio.py --destino sitio --cada 60
+    NANCY_FAKE_SUPABASE=5000 python exportar_sitio.py   # sin Supabase
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+from pathlib import Path
+
+from catalog_queries import COLUMNAS_GALERIA_PUBLICA, cargar_catalogo
+from data_access import obtener_cliente
+from tarjetas_html import STOCK_BAJO, WHATSAPP_DEFECTO, html_tarjeta
+
+RAIZ = Path(__file__).parent
+ASSETS_DIR = RAIZ / "assets"
+SITIO_DIR = RAIZ / "sitio"
+PRODUCTOS_POR_PAGINA = 48
+COLUMNAS_SITIO = COLUMNAS_GALERIA_PUBLICA.split(',')
+ARCHIVO_DATOS = "datos/catalogo.json"
+ASSETS_SITIO = ("catalogo_publico.css", "sitio.css", "sitio.js")
+MANIFIESTO = ".manifiesto.json"
+
+# Producto de relleno para la <template> que sitio.js copia al filtrar
+_PRODUCTO_PLANTILLA = {
+    'sku': '', 'modelo': '', 'color': '', 'talla': '',
+    'precio_soles': 0.0, 'stock_actual': STOCK_BAJO + 1, 'url_foto': 'data:,',
+}
+
+
+def cargar_productos():
+    """Productos disponibles en el orden de la galería (keyset por modelo, sku)."""
+    import streamlit as st
+
+    return cargar_catalogo(obtener_cliente(st.secrets), columnas=COLUMNAS_GALERIA_PUBLICA, solo_disponibles=True)
+
+
+def numero_whatsapp():
+    """[contact] whatsapp_number de .streamlit/secrets.toml, o el número por defecto de la app."""
+    import streamlit as st
+
+    try:
+        return st.secrets["contact"]["whatsapp_number"]
+    except Exception:
+        return WHATSAPP_DEFECTO
+
+
+def datos_json(productos, whatsapp):
+    """Catálogo compacto: los nombres de columna van una sola vez, cada producto es una lista."""
+    datos = {
+        'columnas': COLUMNAS_SITIO,
+        'filas': [[producto.get(columna) for columna in COLUMNAS_SITIO] for producto in productos],
+        'stock_bajo': STOCK_BAJO,
+        'whatsapp': whatsapp,
+    }
+    return json.dumps(datos, ensure_ascii=False, separators=(',', ':'), default=str).encode('utf-8')
+
+
+def nombre_pagina(numero):
+    return "index.html" if numero == 1 else f"pagina-{numero}.html"
+
+
+def html_paginacion(numero, total_paginas):
+    if total_paginas <= 1:
+        return ""
+    enlaces = [
+        f"<span>{n}</span>" if n == numero else f"<a href='{nombre_pagina(n)}'>{n}</a>"
+        for n in range(1, total_paginas + 1)
+    ]
+    return f"<nav class='paginas'>{''.join(enlaces)}</nav>"
+
+
+def html_pagina(productos, numero, total_paginas):
+    """Una página del sitio con sus tarjetas renderizadas (funciona sin JavaScript).
+
+    No lleva nada global (total de productos, fecha): así cambiar un producto
+    solo reescribe la página donde aparece.
+    """
+    tarjetas = ''.join(html_tarjeta(producto) for producto in productos)
+    titulo = "Nancy's Collection" + (f" - Página {numero}" if numero > 1 else "")
+    return f"""<!DOCTYPE html>
+<html lang="es">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{titulo}</title>
+<link rel="stylesheet" href="assets/catalogo_publico.css">
+<link rel="stylesheet" href="assets/sitio.css">
+<script src="assets/sitio.js" defer></script>
+</head>
+<body data-catalogo="{ARCHIVO_DATOS}">
+<header class="cabecera">
+    <div class="marca">Nancy's Collection</div>
+    <div class="lema">MODA FEMENINA • ELEGANCIA PERUANA</div>
+</header>
+<main>
+    <div class="filtros">
+        <input id="busqueda" type="search" placeholder="🔎 Ej: gabardina crema, vestido rojo...">
+        <select id="filtro-modelo"><option>Todos</option></select>
+        <select id="filtro-color"><option>Todos</option></select>
+        <select id="filtro-talla"><option>Todos</option></select>
+    </div>
+    <section id="pagina">
+        <div class="grilla">{tarjetas}</div>
+        {html_paginacion(numero, total_paginas)}
+    </section>
+    <section id="resultados" hidden>
+        <div class="resumen"><b style="color: #1A1A1A; font-size: 18px;">0</b> productos encontrados</div>
+        <div class="grilla"></div>
+    </section>
+</main>
+<template id="plantilla-tarjeta">{html_tarjeta(_PRODUCTO_PLANTILLA)}</template>
+<div class="floating-cart" id="carrito-flotante" hidden>
+    <div class="cart-icon">🛒</div>
+    <div data-campo="items" style="font-weight: 600; font-size: 15px;"></div>
+    <div class="cart-total-float"></div>
+    <div style="font-size: 11px; color: #CCC; margin-top: 8px;">VER CARRITO</div>
+</div>
+<dialog class="carrito" id="panel-carrito">
+    <h2>Resumen de tu Pedido</h2>
+    <div id="items-carrito"></div>
+    <div class="total-carrito" id="total-carrito"></div>
+    <div class="acciones-carrito">
+        <button type="button" class="boton-secundario" id="vaciar-carrito">VACIAR CARRITO</button>
+        <a id="enviar-whatsapp" target="_blank" rel="noopener"><button type="button" class="boton-whatsapp">ENVIAR POR WHATSAPP</button></a>
+    </div>
+    <p style="text-align: center;"><button type="button" class="boton-secundario" id="cerrar-carrito">SEGUIR COMPRANDO</button></p>
+</dialog>
+</body>
+</html>
+"""
+
+
+def construir_sitio(productos, whatsapp, por_pagina=PRODUCTOS_POR_PAGINA):
+    """Todos los archivos del sitio en memoria: {ruta relativa: bytes}."""
+    archivos = {f"assets/{nombre}": (ASSETS_DIR / nombre).read_bytes() for nombre in ASSETS_SITIO}
+    archivos[ARCHIVO_DATOS] = datos_json(productos, whatsapp)
+    total_paginas = max(1, -(-len(productos) // por_pagina))
+    for numero in range(1, total_paginas + 1):
+        pagina = productos[(numero - 1) * por_pagina:numero * por_pagina]
+        archivos[nombre_pagina(numero)] = html_pagina(pagina, numero, total_paginas).encode('utf-8')
+    return archivos
+
+
+def escribir_sitio(archivos, destino=SITIO_DIR):
+    """Escribe solo los archivos que cambiaron y borra los que ya no existen (p. ej. páginas sobrantes).
+
+    Returns:
+        dict con escritos, sin_cambios y eliminados (listas de rutas relativas)
+    """
+    destino = Path(destino)
+    ruta_manifiesto = destino / MANIFIESTO
+    try:
+        anterior = json.loads(ruta_manifiesto.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        anterior = {}
+
+    actual = {ruta: hashlib.sha256(contenido).hexdigest() for ruta, contenido in archivos.items()}
+    resultado = {'escritos': [], 'sin_cambios': [], 'eliminados': []}
+    for ruta, contenido in archivos.items():
+        archivo = destino / ruta
+        if anterior.get(ruta) == actual[ruta] and archivo.exists():
+            resultado['sin_cambios'].append(ruta)
+            continue
+        archivo.parent.mkdir(parents=True, exist_ok=True)
+        temporal = archivo.with_name(f"{archivo.name}.tmp")
+        temporal.write_bytes(contenido)
+        os.replace(temporal, archivo)
+        resultado['escritos'].append(ruta)
+
+    for ruta in sorted(set(anterior) - set(actual)):
+        (destino / ruta).unlink(missing_ok=True)
+        resultado['eliminados'].append(ruta)
+
+    destino.mkdir(parents=True, exist_ok=True)
+    ruta_manifiesto.write_text(json.dumps(actual, indent=1, sort_keys=True), encoding='utf-8')
+    return resultado
+
+
+def exportar(destino=SITIO_DIR, whatsapp=None):
+    """Consulta el catálogo y actualiza el sitio. Retorna el resultado de escribir_sitio()."""
+    productos = cargar_productos()
+    return escribir_sitio(construir_sitio(productos, whatsapp or numero_whatsapp()), destino)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exporta el catálogo público como sitio estático")
+    parser.add_argument("--destino", type=Path, default=SITIO_DIR, help="Directorio de salida (por defecto sitio/)")
+    parser.add_argument("--whatsapp", help="Número para los pedidos (por defecto [contact] de secrets.toml)")
+    parser.add_argument("--cada", type=float, help="Segundos entre regeneraciones (si no, una sola vez)")
+    args = parser.parse_args(argv)
+
+    while True:
+        inicio = time.perf_counter()
+        try:
+            resultado = exportar(args.destino, args.whatsapp)
+        except Exception as e:
+            print(f"❌ Error al exportar: {e}")
+            if not args.cada:
+                sys.exit(1)
+        else:
+            if resultado['escritos'] or resultado['eliminados'] or not args.cada:
+                print(f"✅ {args.destino}: {len(resultado['escritos'])} escritos, "
+                      f"{len(resultado['sin_cambios'])} sin cambios, {len(resultado['eliminados'])} eliminados "
+                      f"({time.perf_counter() - inicio:.2f} s)")
+        if not args.cada:
+            return
+        time.sleep(args.cada)
+
+
+if __name__ == "__main__":
+    main()
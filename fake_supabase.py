@@ -0,0 +1,517 @@
+"""
+Supabase local (fake) - Nancy's Collection
+Cliente en memoria que imita el subconjunto de supabase-py/PostgREST que usan
+las apps, para pruebas de carga y benchmarks sin conexión a Supabase.
+
+Se activa con la variable de entorno NANCY_FAKE_SUPABASE:
+    NANCY_FAKE_SUPABASE=5000                  -> 5000 productos sintéticos
+    NANCY_FAKE_SUPABASE=ruta/catalogo.json    -> filas de un JSON o JSONL
+
+Como los triggers de la base, toda fila modificada renueva su updated_at (y
+las insertadas en tb_catalogo_stock lo reciben como con DEFAULT now()), y
+rpc() implementa en memoria las funciones de migrations/ (FUNCIONES_RPC).
+
+Condiciones de red simuladas (opcionales, por llamada):
+    NANCY_FAKE_LATENCIA_MS=80        latencia base de cada request
+    NANCY_FAKE_JITTER_MS=20          variación aleatoria (+/-) de la latencia
+    NANCY_FAKE_ANCHO_BANDA_KBPS=2000 tiempo de transferencia según el tamaño de la respuesta
+    NANCY_FAKE_TASA_ERROR=0.01       fracción de requests que fallan con ErrorFake
+    NANCY_FAKE_LIMITE_RPS=50         requests por segundo antes de responder 429 (rate limit)
+"""
+
+import os
+import re
+import json
+import time
+import random
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+from carritos import TABLA_CARRITOS
+from catalog_queries import TABLA_CATALOGO
+from edicion_catalogo import COLUMNAS_LOTE
+
+VARIABLE_ENTORNO = 'NANCY_FAKE_SUPABASE'
+URL_FAKE = 'http://supabase.local'
+
+MODELOS = ['Vestido', 'Gabardina', 'Enterizo', 'Pantalón Cintura Alta', 'Blusa Manga Larga',
+           'Conjunto', 'Blazer Catalan', 'Polo Lame', 'Vestisaco']
+COLORES = ['Negro', 'Blanco', 'Azul', 'Rojo', 'Rosa', 'Crema', 'Beige', 'Verde']
+TALLAS = ['S', 'M', 'L', 'S, M, L', 'Única']
+
+
+def filas_sinteticas(cantidad, semilla=42):
+    """Productos sintéticos con las columnas de tb_catalogo_stock."""
+    rng = random.Random(semilla)
+    filas = []
+    for i in range(1, cantidad + 1):
+        modelo = rng.choice(MODELOS)
+        color = rng.choice(COLORES)
+        talla = rng.choice(TALLAS)
+        filas.append({
+            'id': i,
+            'sku': f"NC-{i:07d}-{color}",
+            'modelo': modelo,
+            'descripcion': f"{modelo} {color} - Tallas {talla}",
+            'talla': talla,
+            'color': color,
+            'precio_soles': round(rng.uniform(49, 249), 2),
+            'stock_actual': rng.randint(0, 40),
+            'url_foto': None,
+            'updated_at': '2025-01-01T00:00:00+00:00',
+            'created_at': '2025-01-01T00:00:00+00:00',
+        })
+    return filas
+
+
+# --- Filtros estilo PostgREST ---
+OPERADORES = {
+    'eq': lambda a, b: a == b,
+    'neq': lambda a, b: a != b,
+    'gt': lambda a, b: a > b,
+    'gte': lambda a, b: a >= b,
+    'lt': lambda a, b: a < b,
+    'lte': lambda a, b: a <= b,
+}
+
+
+def _comparar(fila, columna, operador, valor):
+    actual = fila.get(columna)
+    if actual is None:
+        return False
+    # PostgREST recibe los valores como texto; se convierten al tipo de la columna
+    if isinstance(valor, str) and not isinstance(actual, str):
+        valor = type(actual)(valor)
+    return OPERADORES[operador](actual, valor)
+
+
+def _dividir_or(expresion):
+    """Separa 'a.gt."x,y",b.eq.1' por comas de primer nivel (respeta comillas)."""
+    partes, actual, en_comillas, escape = [], [], False, False
+    for caracter in expresion:
+        if escape:
+            actual.append(caracter)
+            escape = False
+        elif caracter == '\\':
+            actual.append(caracter)
+            escape = True
+        elif caracter == '"':
+            actual.append(caracter)
+            en_comillas = not en_comillas
+        elif caracter == ',' and not en_comillas:
+            partes.append(''.join(actual))
+            actual = []
+        else:
+            actual.append(caracter)
+    partes.append(''.join(actual))
+    return partes
+
+
+def _condicion_or(parte):
+    columna, operador, valor = parte.split('.', 2)
+    if valor.startswith('"') and valor.endswith('"'):
+        valor = valor[1:-1].replace('\\"', '"').replace('\\\\', '\\')
+    return columna, operador, valor
+
+
+class ErrorFake(Exception):
+    """Falla inyectada (equivale a un error HTTP/timeout de Supabase)."""
+
+
+class PerfilRed:
+    """Latencia, ancho de banda y tasa de error aplicados a cada llamada."""
+
+    def __init__(self, latencia_ms=0.0, jitter_ms=0.0, ancho_banda_kbps=None, tasa_error=0.0, semilla=None,
+                 limite_rps=None):
+        self.latencia_ms = latencia_ms
+        self.jitter_ms = jitter_ms
+        self.ancho_banda_kbps = ancho_banda_kbps
+        self.tasa_error = tasa_error
+        self.rng = random.Random(semilla)
+        self.limite_rps = limite_rps
+        # Inicio de los requests del último segundo (ventana deslizante del rate limit)
+        self._recientes = deque()
+        self._candado = threading.Lock()
+
+    @classmethod
+    def desde_entorno(cls):
+        ancho_banda = os.getenv('NANCY_FAKE_ANCHO_BANDA_KBPS')
+        limite_rps = os.getenv('NANCY_FAKE_LIMITE_RPS')
+        return cls(
+            latencia_ms=float(os.getenv('NANCY_FAKE_LATENCIA_MS', 0)),
+            jitter_ms=float(os.getenv('NANCY_FAKE_JITTER_MS', 0)),
+            ancho_banda_kbps=float(ancho_banda) if ancho_banda else None,
+            tasa_error=float(os.getenv('NANCY_FAKE_TASA_ERROR', 0)),
+            limite_rps=float(limite_rps) if limite_rps else None,
+        )
+
+    def _excede_limite(self):
+        """Registra el request y dice si supera limite_rps en el último segundo."""
+        ahora = time.monotonic()
+        with self._candado:
+            while self._recientes and self._recientes[0] <= ahora - 1:
+                self._recientes.popleft()
+            self._recientes.append(ahora)
+            return len(self._recientes) > self.limite_rps
+
+    def aplicar(self, operacion, tamano_bytes=0):
+        """Espera lo que tardaría la llamada y, según la tasa, la hace fallar.
+
+        Returns:
+            Milisegundos de espera simulada
+        """
+        if self.limite_rps and self._excede_limite():
+            raise ErrorFake(f"429 Too Many Requests en {operacion}")
+        espera_ms = self.latencia_ms
+        if self.jitter_ms:
+            espera_ms += self.rng.uniform(-self.jitter_ms, self.jitter_ms)
+        if self.ancho_banda_kbps:
+            espera_ms += tamano_bytes * 8 / self.ancho_banda_kbps
+        espera_ms = max(espera_ms, 0.0)
+        if espera_ms:
+            time.sleep(espera_ms / 1000)
+        if self.tasa_error and self.rng.random() < self.tasa_error:
+            raise ErrorFake(f"Fallo simulado en {operacion}")
+        return espera_ms
+
+
+def _tamano_json(datos):
+    return len(json.dumps(datos, ensure_ascii=False, separators=(',', ':'), default=str).encode('utf-8'))
+
+
+def _ahora_iso():
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _renovar_version(fila):
+    """Como el trigger update_tb_catalogo_stock_updated_at: toda fila modificada renueva updated_at."""
+    if 'updated_at' in fila:
+        fila['updated_at'] = _ahora_iso()
+
+
+def _fila_nueva(tabla, valores):
+    """Fila insertada: en tb_catalogo_stock updated_at toma DEFAULT now() si no viene."""
+    fila = dict(valores)
+    if tabla == TABLA_CATALOGO and 'updated_at' not in fila:
+        fila['updated_at'] = _ahora_iso()
+    return fila
+
+
+class ConsultaFake:
+    """Constructor de consultas encadenable: table().select().gt().order()..."""
+
+    def __init__(self, cliente, tabla):
+        self.cliente = cliente
+        self.tabla = tabla
+        self.operacion = 'select'
+        self.valores = None
+        self.conflicto = None
+        self.columnas = None
+        self.filtros = []
+        self.ordenes = []
+        self.limite = None
+        self.desplazamiento = 0
+        self.conteo = None
+        self.total = None
+
+    def select(self, columnas='*', count=None):
+        if columnas.strip() != '*':
+            self.columnas = [c.strip() for c in columnas.split(',')]
+        # count='exact'/'planned'/'estimated': el fake siempre cuenta exacto
+        self.conteo = count
+        return self
+
+    def insert(self, filas):
+        self.operacion = 'insert'
+        self.valores = filas if isinstance(filas, list) else [filas]
+        return self
+
+    def update(self, valores):
+        self.operacion = 'update'
+        self.valores = valores
+        return self
+
+    def upsert(self, filas, on_conflict='sku'):
+        self.operacion = 'upsert'
+        self.valores = filas if isinstance(filas, list) else [filas]
+        self.conflicto = on_conflict
+        return self
+
+    def delete(self):
+        self.operacion = 'delete'
+        return self
+
+    def _filtro(self, columna, operador, valor):
+        self.filtros.append(lambda f: _comparar(f, columna, operador, valor))
+        return self
+
+    def eq(self, columna, valor):
+        return self._filtro(columna, 'eq', valor)
+
+    def neq(self, columna, valor):
+        return self._filtro(columna, 'neq', valor)
+
+    def gt(self, columna, valor):
+        return self._filtro(columna, 'gt', valor)
+
+    def gte(self, columna, valor):
+        return self._filtro(columna, 'gte', valor)
+
+    def lt(self, columna, valor):
+        return self._filtro(columna, 'lt', valor)
+
+    def lte(self, columna, valor):
+        return self._filtro(columna, 'lte', valor)
+
+    def in_(self, columna, valores):
+        valores = set(valores)
+        self.filtros.append(lambda f: f.get(columna) in valores)
+        return self
+
+    def or_(self, expresion):
+        condiciones = [_condicion_or(p) for p in _dividir_or(expresion)]
+        self.filtros.append(lambda f: any(_comparar(f, *c) for c in condiciones))
+        return self
+
+    def order(self, columna, desc=False):
+        self.ordenes.append((columna, desc))
+        return self
+
+    def limit(self, cantidad):
+        self.limite = cantidad
+        return self
+
+    def offset(self, cantidad):
+        self.desplazamiento = cantidad
+        return self
+
+    def _seleccionar(self, filas):
+        filas = [f for f in filas if all(p(f) for p in self.filtros)]
+        # Orden estable: se aplica de la última clave a la primera
+        for columna, desc in reversed(self.ordenes):
+            filas.sort(key=lambda f: (f.get(columna) is None, f.get(columna)), reverse=desc)
+        self.total = len(filas)
+        filas = filas[self.desplazamiento:]
+        if self.limite is not None:
+            filas = filas[:self.limite]
+        if self.columnas is not None:
+            return [{c: f.get(c) for c in self.columnas} for f in filas]
+        return [dict(f) for f in filas]
+
+    def _escribir(self, filas):
+        if self.operacion == 'insert':
+            nuevas = [_fila_nueva(self.tabla, f) for f in self.valores]
+            filas.extend(nuevas)
+            return [dict(f) for f in nuevas]
+        if self.operacion == 'upsert':
+            posiciones = {f.get(self.conflicto): i for i, f in enumerate(filas)}
+            resultado = []
+            for valores in self.valores:
+                clave = valores.get(self.conflicto)
+                if clave in posiciones:
+                    filas[posiciones[clave]].update(valores)
+                    _renovar_version(filas[posiciones[clave]])
+                    resultado.append(dict(filas[posiciones[clave]]))
+                else:
+                    filas.append(_fila_nueva(self.tabla, valores))
+                    posiciones[clave] = len(filas) - 1
+                    resultado.append(dict(filas[-1]))
+            return resultado
+        afectadas = [f for f in filas if all(p(f) for p in self.filtros)]
+        if self.operacion == 'update':
+            for fila in afectadas:
+                fila.update(self.valores)
+                _renovar_version(fila)
+        else:
+            ids = {id(f) for f in afectadas}
+            filas[:] = [f for f in filas if id(f) not in ids]
+        return [dict(f) for f in afectadas]
+
+    def execute(self):
+        cliente = self.cliente
+        if self.operacion == 'select':
+            with cliente.candado:
+                datos = self._seleccionar(cliente.tablas.get(self.tabla, []))
+            tamano = _tamano_json(datos)
+        else:
+            tamano = _tamano_json(self.valores)
+            with cliente.candado:
+                datos = self._escribir(cliente.tablas.setdefault(self.tabla, []))
+        cliente.registrar(f"{self.operacion} {self.tabla}", tamano)
+        return SimpleNamespace(data=datos, count=self.total if self.conteo else None)
+
+
+def _rpc_actualizar_catalogo_lote(cliente, cambios):
+    """migrations/004 y 007: actualiza solo las filas cuyo updated_at no cambió."""
+    filas = {f.get('sku'): f for f in cliente.tablas.get(TABLA_CATALOGO, [])}
+    version = _ahora_iso()
+    resultado = []
+    for cambio in cambios:
+        fila = filas.get(cambio['sku'])
+        if fila is None:
+            resultado.append({'sku': cambio['sku'], 'estado': 'no_existe', 'updated_at': None})
+        elif fila.get('updated_at') != cambio.get('updated_at'):
+            resultado.append({'sku': cambio['sku'], 'estado': 'conflicto', 'updated_at': fila.get('updated_at')})
+        else:
+            for columna in COLUMNAS_LOTE:
+                if cambio.get(columna) is not None:
+                    fila[columna] = cambio[columna]
+            # now() es el mismo para todo el lote (una transacción)
+            fila['updated_at'] = version
+            resultado.append({'sku': cambio['sku'], 'estado': 'ok', 'updated_at': version})
+    return resultado
+
+
+def _rpc_leer_carrito(cliente, token_carrito):
+    """migrations/006_carritos_rpc.sql: items del carrito con ese token (o None)."""
+    return next((f['items'] for f in cliente.tablas.get(TABLA_CARRITOS, []) if f['token'] == token_carrito), None)
+
+
+def _rpc_guardar_carritos(cliente, cambios):
+    """migrations/006_carritos_rpc.sql: upsert de los carritos con items y borrado de los vacíos."""
+    filas = cliente.tablas.setdefault(TABLA_CARRITOS, [])
+    por_token = {f['token']: f for f in filas}
+    for cambio in cambios:
+        token, items = cambio['token'], cambio.get('items')
+        if items is None:
+            por_token.pop(token, None)
+        elif re.fullmatch(r'[A-Za-z0-9_-]{8,64}', token) and len(items) <= 8192:
+            por_token[token] = {'token': token, 'items': items, 'actualizado': _ahora_iso()}
+    filas[:] = list(por_token.values())
+    return None
+
+
+FUNCIONES_RPC = {
+    'actualizar_catalogo_lote': _rpc_actualizar_catalogo_lote,
+    'leer_carrito': _rpc_leer_carrito,
+    'guardar_carritos': _rpc_guardar_carritos,
+}
+
+
+class RpcFake:
+    """supabase.rpc(funcion, parametros): las funciones de migrations/ implementadas en memoria."""
+
+    def __init__(self, cliente, funcion, parametros):
+        self.cliente = cliente
+        self.funcion = funcion
+        self.parametros = parametros or {}
+
+    def execute(self):
+        if self.funcion not in FUNCIONES_RPC:
+            raise ErrorFake(f"Could not find the function public.{self.funcion}")
+        with self.cliente.candado:
+            datos = FUNCIONES_RPC[self.funcion](self.cliente, **self.parametros)
+        self.cliente.registrar(f"rpc {self.funcion}", _tamano_json(self.parametros))
+        return SimpleNamespace(data=datos, count=None)
+
+
+class BucketFake:
+    """supabase.storage.from_(bucket): upload, download, get_public_url y cabeceras."""
+
+    def __init__(self, cliente, nombre):
+        self.cliente = cliente
+        self.nombre = nombre
+
+    def upload(self, path, file, file_options=None):
+        file_options = file_options or {}
+        objetos = self.cliente.objetos.setdefault(self.nombre, {})
+        datos = file.read() if hasattr(file, 'read') else bytes(file)
+        self.cliente.registrar(f"upload {self.nombre}", len(datos))
+        if path in objetos and str(file_options.get('upsert', 'false')).lower() != 'true':
+            raise ErrorFake(f"The resource already exists: {path}")
+        objetos[path] = {'datos': datos, 'opciones': dict(file_options)}
+        return SimpleNamespace(path=path, full_path=f"{self.nombre}/{path}")
+
+    def download(self, path):
+        objeto = self.cliente.objetos.get(self.nombre, {}).get(path)
+        if objeto is None:
+            raise ErrorFake(f"Object not found: {path}")
+        self.cliente.registrar(f"download {self.nombre}", len(objeto['datos']))
+        return objeto['datos']
+
+    def cabeceras(self, path):
+        """Cabeceras con las que Storage serviría el objeto (como un HEAD a la URL pública).
+
+        Igual que Supabase: el cacheControl de la subida (segundos, por defecto
+        3600) se publica como max-age.
+        """
+        objeto = self.cliente.objetos.get(self.nombre, {}).get(path)
+        if objeto is None:
+            raise ErrorFake(f"Object not found: {path}")
+        cache = str(objeto['opciones'].get('cache-control', '3600'))
+        return {
+            'content-type': objeto['opciones'].get('content-type', 'text/plain;charset=UTF-8'),
+            'content-length': str(len(objeto['datos'])),
+            'cache-control': f"max-age={cache}" if cache.isdigit() else cache,
+        }
+
+    def get_public_url(self, path):
+        # Se arma localmente, igual que en supabase-py (no es una llamada de red)
+        return f"{URL_FAKE}/storage/v1/object/public/{self.nombre}/{path}"
+
+
+class StorageFake:
+    def __init__(self, cliente):
+        self.cliente = cliente
+
+    def list_buckets(self):
+        self.cliente.registrar("list_buckets")
+        return [SimpleNamespace(name=nombre) for nombre in self.cliente.objetos]
+
+    def create_bucket(self, nombre, options=None):
+        self.cliente.registrar("create_bucket")
+        self.cliente.objetos.setdefault(nombre, {})
+
+    def from_(self, nombre):
+        return BucketFake(self.cliente, nombre)
+
+
+class SupabaseFake:
+    """Cliente en memoria con la misma forma que supabase.Client."""
+
+    def __init__(self, tablas=None, perfil=None):
+        self.tablas = tablas or {}
+        self.objetos = {}
+        self.perfil = perfil or PerfilRed()
+        self.storage = StorageFake(self)
+        self.candado = threading.Lock()
+        self.llamadas = 0
+        self.bytes_transferidos = 0
+        self.espera_ms = 0.0
+
+    def table(self, nombre):
+        return ConsultaFake(self, nombre)
+
+    def rpc(self, funcion, parametros=None):
+        return RpcFake(self, funcion, parametros)
+
+    def registrar(self, operacion, tamano_bytes=0):
+        """Contabiliza la llamada y le aplica el perfil de red."""
+        with self.candado:
+            self.llamadas += 1
+            self.bytes_transferidos += tamano_bytes
+        espera_ms = self.perfil.aplicar(operacion, tamano_bytes)
+        with self.candado:
+            self.espera_ms += espera_ms
+
+
+def cargar_filas(origen):
+    """Filas desde un número (sintéticas) o desde un archivo JSON / JSONL."""
+    if str(origen).isdigit():
+        return filas_sinteticas(int(origen))
+    ruta = Path(origen)
+    texto = ruta.read_text(encoding='utf-8')
+    if ruta.suffix == '.jsonl':
+        return [json.loads(linea) for linea in texto.splitlines() if linea.strip()]
+    return json.loads(texto)
+
+
+def cliente_desde_entorno():
+    """SupabaseFake si NANCY_FAKE_SUPABASE está definida, si no None."""
+    origen = os.getenv(VARIABLE_ENTORNO)
+    if not origen:
+        return None
+    return SupabaseFake({TABLA_CATALOGO: cargar_filas(origen)}, PerfilRed.desde_entorno())
@@ -0,0 +1,207 @@
+"""
+Instrumentación - Nancy's Collection
+Spans (context managers) y contadores en memoria para los caminos calientes de
+ambas apps: llamadas a Supabase, hits/misses de cache, filtrado de DataFrames,
+armado de gráficos y duración de cada rerun.
+
+Los datos se exportan en formato de texto de Prometheus, por un endpoint HTTP
+local (iniciar_servidor) o con exportar_prometheus(). El panel admin los
+muestra en la vista oculta PERFORMANCE (?vista=performance).
+"""
+
+import os
+import re
+import time
+import threading
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Reruns recientes que se conservan con su desglose por span
+MAX_RERUNS = 50
+# Muestras por span para calcular percentiles
+MAX_MUESTRAS = 1000
+
+
+class Registro:
+    """Acumula spans, contadores y reruns. Seguro entre hilos (una sesión = un hilo)."""
+
+    def __init__(self):
+        self.candado = threading.Lock()
+        self.contadores = defaultdict(float)
+        self.spans_total = defaultdict(float)
+        self.spans_cuenta = defaultdict(int)
+        self.muestras = defaultdict(lambda: deque(maxlen=MAX_MUESTRAS))
+        self.reruns = deque(maxlen=MAX_RERUNS)
+        self.local = threading.local()
+
+    def contar(self, nombre, valor=1):
+        with self.candado:
+            self.contadores[nombre] += valor
+
+    def registrar_span(self, nombre, segundos):
+        with self.candado:
+            self.spans_total[nombre] += segundos
+            self.spans_cuenta[nombre] += 1
+            self.muestras[nombre].append(segundos)
+        desglose = getattr(self.local, 'desglose', None)
+        if desglose is not None:
+            desglose[nombre] = desglose.get(nombre, 0.0) + segundos * 1000
+
+    @contextmanager
+    def span(self, nombre):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar_span(nombre, time.perf_counter() - inicio)
+
+    @contextmanager
+    def rerun(self, app):
+        """Mide un rerun completo y guarda el desglose de los spans que ocurrieron dentro.
+
+        Dentro de otro rerun se comporta como un span: así un st.fragment
+        decorado cuenta como rerun propio solo cuando se ejecuta por separado.
+        """
+        if getattr(self.local, 'desglose', None) is not None:
+            with self.span(app):
+                yield
+            return
+        self.local.desglose = {}
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            segundos = time.perf_counter() - inicio
+            desglose, self.local.desglose = self.local.desglose, None
+            self.registrar_span(f"{app}.rerun", segundos)
+            with self.candado:
+                self.reruns.append({
+                    'app': app,
+                    'inicio': time.time() - segundos,
+                    'total_ms': segundos * 1000,
+                    'spans': desglose,
+                })
+
+    def percentil(self, nombre, p):
+        with self.candado:
+            muestras = sorted(self.muestras.get(nombre, ()))
+        if not muestras:
+            return 0.0
+        return muestras[min(len(muestras) - 1, int(round(p / 100 * (len(muestras) - 1))))]
+
+    def resumen_spans(self):
+        """Lista de dicts {span, llamadas, total_ms, promedio_ms, p50_ms, p95_ms}."""
+        with self.candado:
+            nombres = sorted(self.spans_cuenta)
+            totales = {n: (self.spans_cuenta[n], self.spans_total[n]) for n in nombres}
+        filas = []
+        for nombre in nombres:
+            cuenta, total = totales[nombre]
+            filas.append({
+                'span': nombre,
+                'llamadas': cuenta,
+                'total_ms': total * 1000,
+                'promedio_ms': total * 1000 / cuenta,
+                'p50_ms': self.percentil(nombre, 50) * 1000,
+                'p95_ms': self.percentil(nombre, 95) * 1000,
+            })
+        return filas
+
+    def ratio_cache(self, cache):
+        """Fracción de hits de una cache medida con medir_cache()."""
+        with self.candado:
+            hits = self.contadores.get(f"cache.{cache}.hits", 0)
+            misses = self.contadores.get(f"cache.{cache}.misses", 0)
+        return hits / (hits + misses) if hits + misses else None
+
+    def reruns_recientes(self):
+        with self.candado:
+            return list(self.reruns)
+
+
+REGISTRO = Registro()
+
+# Atajos sobre el registro global
+span = REGISTRO.span
+contar = REGISTRO.contar
+rerun = REGISTRO.rerun
+
+
+def medir_cache(cache, funcion, *args, **kwargs):
+    """Llama a una función con st.cache_data y cuenta hit o miss.
+
+    La función cacheada debe llamar a marcar_miss(cache) en su cuerpo: si el
+    cuerpo no se ejecutó, la llamada fue un hit.
+    """
+    REGISTRO.local.miss = False
+    with span(f"cache.{cache}"):
+        resultado = funcion(*args, **kwargs)
+    contar(f"cache.{cache}.{'misses' if REGISTRO.local.miss else 'hits'}")
+    return resultado
+
+
+def marcar_miss(cache):
+    """Se llama dentro del cuerpo de una función cacheada (solo corre en un miss)."""
+    REGISTRO.local.miss = True
+
+
+# --- Exportación Prometheus ---
+def _nombre_metrica(nombre):
+    return re.sub(r'[^a-zA-Z0-9_]', '_', nombre)
+
+
+def exportar_prometheus(registro=REGISTRO):
+    """Métricas en formato de texto de Prometheus (exposition format 0.0.4)."""
+    lineas = [
+        "# HELP nancy_span_segundos Duración de los spans instrumentados",
+        "# TYPE nancy_span_segundos summary",
+    ]
+    for fila in registro.resumen_spans():
+        etiqueta = f'span="{fila["span"]}"'
+        lineas.append(f'nancy_span_segundos{{{etiqueta},quantile="0.5"}} {fila["p50_ms"] / 1000:.6f}')
+        lineas.append(f'nancy_span_segundos{{{etiqueta},quantile="0.95"}} {fila["p95_ms"] / 1000:.6f}')
+        lineas.append(f'nancy_span_segundos_sum{{{etiqueta}}} {fila["total_ms"] / 1000:.6f}')
+        lineas.append(f'nancy_span_segundos_count{{{etiqueta}}} {fila["llamadas"]}')
+
+    with registro.candado:
+        contadores = sorted(registro.contadores.items())
+    for nombre, valor in contadores:
+        metrica = f"nancy_{_nombre_metrica(nombre)}_total"
+        lineas.append(f"# TYPE {metrica} counter")
+        lineas.append(f"{metrica} {valor:g}")
+    return "\n".join(lineas) + "\n"
+
+
+class _ManejadorMetricas(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        cuerpo = exportar_prometheus().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def log_message(self, formato, *args):
+        pass  # Sin logs por request: Prometheus consulta cada pocos segundos
+
+
+def iniciar_servidor_desde_entorno():
+    """Inicia /metrics si NANCY_METRICAS_PUERTO está definida (si no, o si el puerto está ocupado, None)."""
+    puerto = os.getenv('NANCY_METRICAS_PUERTO')
+    if not puerto:
+        return None
+    try:
+        return iniciar_servidor(int(puerto), os.getenv('NANCY_METRICAS_HOST', '127.0.0.1'))
+    except OSError:
+        return None
+
+
+def iniciar_servidor(puerto, host='127.0.0.1'):
+    """Sirve /metrics en un hilo de fondo y retorna el servidor."""
+    servidor = ThreadingHTTPServer((host, puerto), _ManejadorMetricas)
+    threading.Thread(target=servidor.serve_forever, daemon=True, name='nancy-metricas').start()
+    return servidor
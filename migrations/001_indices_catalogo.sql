@@ -0,0 +1,26 @@
+-- Migración 001: índices ajustados a las consultas reales del catálogo
+-- Table: tb_catalogo_stock
+-- Database: Supabase (PostgreSQL)
+--
+-- Consultas que atienden:
+--   Catálogo público:  WHERE stock_actual > 0 ORDER BY modelo
+--   Panel admin:       ORDER BY modelo, talla
+
+-- Catálogo público: índice parcial solo con productos disponibles.
+-- INCLUDE agrega los campos de la galería para permitir index-only scans.
+CREATE INDEX IF NOT EXISTS idx_tb_catalogo_disponibles
+    ON public.tb_catalogo_stock(modelo, color, talla)
+    INCLUDE (sku, precio_soles, stock_actual, url_foto)
+    WHERE stock_actual > 0;
+
+-- Panel admin: orden por modelo y talla sin sort adicional
+CREATE INDEX IF NOT EXISTS idx_tb_catalogo_modelo_talla
+    ON public.tb_catalogo_stock(modelo, talla);
+
+-- Redundantes:
+--   idx_tb_catalogo_sku duplica el índice de la restricción UNIQUE(sku)
+--   idx_tb_catalogo_modelo queda cubierto por idx_tb_catalogo_modelo_talla (prefijo)
+DROP INDEX IF EXISTS public.idx_tb_catalogo_sku;
+DROP INDEX IF EXISTS public.idx_tb_catalogo_modelo;
+
+ANALYZE public.tb_catalogo_stock;
@@ -0,0 +1,13 @@
+-- Migración 002: índice para paginación keyset por (modelo, sku)
+-- Table: tb_catalogo_stock
+-- Database: Supabase (PostgreSQL)
+--
+-- catalog_queries.pagina_catalogo() continúa cada página desde el último
+-- (modelo, sku) visto: WHERE modelo >= :m AND (modelo > :m OR sku > :s)
+-- ORDER BY modelo, sku LIMIT :n. Con este índice cada página es un range scan
+-- de :n filas, sin importar qué tan profundo esté el cursor.
+
+CREATE INDEX IF NOT EXISTS idx_tb_catalogo_modelo_sku
+    ON public.tb_catalogo_stock(modelo, sku);
+
+ANALYZE public.tb_catalogo_stock;
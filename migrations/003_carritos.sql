@@ -0,0 +1,41 @@
+-- Migración 003: carritos persistentes del catálogo público
+-- Table: carritos
+-- Database: Supabase (PostgreSQL)
+--
+-- Solo se usa con NANCY_CARRITOS=supabase (por defecto carritos.py guarda en
+-- SQLite local). Cada fila es un carrito en forma compacta {"sku": cantidad},
+-- identificado por el token de la URL (?carrito=...). Sin datos personales.
+--
+-- carritos.AlmacenSupabase no toca la tabla directamente: lee y escribe por
+-- lotes con las funciones SECURITY DEFINER leer_carrito y guardar_carritos de
+-- la migración 006 (aplicarla siempre junto con esta).
+
+CREATE TABLE IF NOT EXISTS public.carritos (
+    token TEXT PRIMARY KEY,
+    items TEXT NOT NULL,
+    actualizado TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE OR REPLACE FUNCTION public.carritos_actualizado()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.actualizado = now();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_carritos_actualizado ON public.carritos;
+CREATE TRIGGER trg_carritos_actualizado
+    BEFORE UPDATE ON public.carritos
+    FOR EACH ROW EXECUTE FUNCTION public.carritos_actualizado();
+
+-- Sin políticas para anon: la anon key viaja al navegador y con acceso directo
+-- permitiría listar los tokens y leer o pisar cualquier carrito. El catálogo
+-- público pasa por las funciones de la migración 006, que exigen el token.
+ALTER TABLE public.carritos ENABLE ROW LEVEL SECURITY;
+DROP POLICY IF EXISTS carritos_anon ON public.carritos;
+REVOKE ALL ON public.carritos FROM anon, authenticated;
+
+-- Limpieza de carritos abandonados (ej. con pg_cron una vez al día):
+--   DELETE FROM public.carritos WHERE actualizado < now() - interval '30 days';
+CREATE INDEX IF NOT EXISTS idx_carritos_actualizado ON public.carritos(actualizado);
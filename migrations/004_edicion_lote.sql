@@ -0,0 +1,57 @@
+-- Migración 004: edición por lotes de stock y precios desde el panel admin
+-- Function: actualizar_catalogo_lote(cambios jsonb)
+-- Database: Supabase (PostgreSQL)
+--
+-- edicion_catalogo.aplicar_cambios() manda todas las filas editadas en una
+-- sola llamada (POST /rest/v1/rpc/actualizar_catalogo_lote): 500 filas = un
+-- round trip y un solo UPDATE.
+--
+-- Concurrencia optimista: cada cambio lleva el updated_at que tenía la fila
+-- cuando el panel la leyó. Solo se actualizan las filas cuyo updated_at sigue
+-- igual; si la sincronización del ERP (u otra sesión del panel) la modificó
+-- entretanto, la fila se devuelve como 'conflicto' con su updated_at vigente y
+-- no se pisa. El trigger update_tb_catalogo_stock_updated_at renueva el
+-- updated_at de las filas actualizadas.
+--
+-- cambios: [{"sku": "...", "precio_soles": 79.9, "stock_actual": 12,
+--            "updated_at": "2025-01-01T00:00:00+00:00"}, ...]
+-- Resultado: una fila por cambio con estado 'ok', 'conflicto' o 'no_existe'.
+
+CREATE OR REPLACE FUNCTION public.actualizar_catalogo_lote(cambios jsonb)
+RETURNS TABLE (sku varchar, estado text, updated_at timestamptz)
+LANGUAGE sql
+AS $$
+    WITH entrada AS (
+        SELECT *
+        FROM jsonb_to_recordset(cambios)
+            AS c(sku varchar, precio_soles numeric, stock_actual integer, updated_at timestamptz)
+    ),
+    actualizados AS (
+        UPDATE public.tb_catalogo_stock t
+        SET precio_soles = COALESCE(e.precio_soles, t.precio_soles),
+            stock_actual = COALESCE(e.stock_actual, t.stock_actual)
+        FROM entrada e
+        WHERE t.sku = e.sku
+          AND t.updated_at IS NOT DISTINCT FROM e.updated_at
+        RETURNING t.sku, t.updated_at
+    )
+    SELECT a.sku, 'ok', a.updated_at
+    FROM actualizados a
+    UNION ALL
+    -- Las filas no actualizadas se leen con su versión vigente (la que las hizo fallar)
+    SELECT e.sku,
+           CASE WHEN t.sku IS NULL THEN 'no_existe' ELSE 'conflicto' END,
+           t.updated_at
+    FROM entrada e
+    LEFT JOIN public.tb_catalogo_stock t ON t.sku = e.sku
+    WHERE NOT EXISTS (SELECT 1 FROM actualizados a WHERE a.sku = e.sku);
+$$;
+
+-- Solo el panel (service_role_key) puede editar; el catálogo público usa la anon key
+REVOKE ALL ON FUNCTION public.actualizar_catalogo_lote(jsonb) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.actualizar_catalogo_lote(jsonb) TO service_role;
+
+-- Las ediciones no pueden dejar stock o precios negativos
+ALTER TABLE public.tb_catalogo_stock DROP CONSTRAINT IF EXISTS chk_tb_catalogo_no_negativos;
+ALTER TABLE public.tb_catalogo_stock
+    ADD CONSTRAINT chk_tb_catalogo_no_negativos CHECK (stock_actual >= 0 AND precio_soles >= 0) NOT VALID;
@@ -0,0 +1,28 @@
+-- Migración 005: índice parcial del catálogo público alineado con el cursor keyset
+-- Table: tb_catalogo_stock
+-- Database: Supabase (PostgreSQL)
+--
+-- Desde la paginación keyset (002) el catálogo público pide
+--   WHERE stock_actual > 0 AND modelo >= :m AND (modelo > :m OR sku > :s)
+--   ORDER BY modelo, sku LIMIT :n
+-- pero idx_tb_catalogo_disponibles (001) está ordenado por (modelo, color, talla):
+-- el planner no puede seguirlo para ORDER BY modelo, sku y termina usando
+-- idx_tb_catalogo_modelo_sku filtrando los agotados en el heap.
+--
+-- El nuevo índice parcial tiene la misma clave que el cursor, así que cada
+-- página es un range scan que solo recorre productos disponibles. INCLUDE
+-- cubre la proyección de la galería (COLUMNAS_GALERIA_PUBLICA) para
+-- index-only scans; descripcion (texto largo) queda fuera a propósito.
+--
+-- idx_tb_catalogo_modelo_talla tampoco lo usa ninguna consulta: el panel
+-- admin también pagina por (modelo, sku) con idx_tb_catalogo_modelo_sku.
+
+CREATE INDEX IF NOT EXISTS idx_tb_catalogo_disponibles_cursor
+    ON public.tb_catalogo_stock(modelo, sku)
+    INCLUDE (color, talla, precio_soles, stock_actual, url_foto)
+    WHERE stock_actual > 0;
+
+DROP INDEX IF EXISTS public.idx_tb_catalogo_disponibles;
+DROP INDEX IF EXISTS public.idx_tb_catalogo_modelo_talla;
+
+ANALYZE public.tb_catalogo_stock;
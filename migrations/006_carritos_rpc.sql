@@ -0,0 +1,56 @@
+-- Migración 006: carritos solo a través de funciones (sin acceso directo de anon)
+-- Table: carritos
+-- Database: Supabase (PostgreSQL)
+--
+-- La política carritos_anon que creaba antes la migración 003 (ya quitada de
+-- ella; se borra acá para las bases que la aplicaron) dejaba a cualquiera con la
+-- anon key (que viaja al navegador) listar todos los tokens con un
+-- GET /rest/v1/carritos y leer o pisar cualquier carrito. Ahora la tabla no
+-- tiene políticas para anon y carritos.AlmacenSupabase usa dos funciones
+-- SECURITY DEFINER que exigen el token: sin conocerlo no se puede leer ni
+-- escribir un carrito, y no hay forma de enumerarlos.
+--
+--   leer_carrito(token_carrito text) -> items (texto compacto) o NULL
+--   guardar_carritos(cambios jsonb)  -> [{"token": "...", "items": "{...}"}, ...]
+--                                       items NULL borra el carrito
+
+ALTER TABLE public.carritos ENABLE ROW LEVEL SECURITY;
+DROP POLICY IF EXISTS carritos_anon ON public.carritos;
+REVOKE ALL ON public.carritos FROM anon, authenticated;
+
+CREATE OR REPLACE FUNCTION public.leer_carrito(token_carrito text)
+RETURNS text
+LANGUAGE sql
+STABLE
+SECURITY DEFINER
+SET search_path = public, pg_temp
+AS $$
+    SELECT c.items FROM public.carritos c WHERE c.token = token_carrito;
+$$;
+
+CREATE OR REPLACE FUNCTION public.guardar_carritos(cambios jsonb)
+RETURNS void
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public, pg_temp
+AS $$
+BEGIN
+    -- Mismo formato de token que catalogo_publico.PATRON_TOKEN y carritos de tamaño acotado
+    INSERT INTO public.carritos (token, items)
+    SELECT e.token, e.items
+    FROM jsonb_to_recordset(cambios) AS e(token text, items text)
+    WHERE e.items IS NOT NULL
+      AND e.token ~ '^[A-Za-z0-9_-]{8,64}$'
+      AND length(e.items) <= 8192
+    ON CONFLICT (token) DO UPDATE SET items = EXCLUDED.items;
+
+    DELETE FROM public.carritos c
+    USING jsonb_to_recordset(cambios) AS e(token text, items text)
+    WHERE c.token = e.token AND e.items IS NULL;
+END;
+$$;
+
+REVOKE ALL ON FUNCTION public.leer_carrito(text) FROM PUBLIC;
+REVOKE ALL ON FUNCTION public.guardar_carritos(jsonb) FROM PUBLIC;
+GRANT EXECUTE ON FUNCTION public.leer_carrito(text) TO anon, service_role;
+GRANT EXECUTE ON FUNCTION public.guardar_carritos(jsonb) TO anon, service_role;
@@ -0,0 +1,50 @@
+-- Migración 007: actualizar_catalogo_lote acepta todas las columnas importables
+-- Function: actualizar_catalogo_lote(cambios jsonb)
+-- Database: Supabase (PostgreSQL)
+--
+-- La importación de listas de precios (catalog_io.aplicar_importacion) guarda
+-- los productos existentes con la misma función que la edición del panel,
+-- con el updated_at leído al cargar el catálogo: si la sincronización del ERP
+-- modificó un producto entre la vista previa y el guardado, vuelve como
+-- 'conflicto' en lugar de pisarse con los datos del archivo.
+--
+-- Además de precio_soles y stock_actual acepta modelo, color, talla y url_foto.
+-- Una clave ausente o null conserva el valor actual, así la edición del panel
+-- (que solo manda stock y precio) sigue funcionando igual.
+
+CREATE OR REPLACE FUNCTION public.actualizar_catalogo_lote(cambios jsonb)
+RETURNS TABLE (sku varchar, estado text, updated_at timestamptz)
+LANGUAGE sql
+AS $$
+    WITH entrada AS (
+        SELECT *
+        FROM jsonb_to_recordset(cambios)
+            AS c(sku varchar, modelo varchar, color varchar, talla varchar, precio_soles numeric,
+                 stock_actual integer, url_foto text, updated_at timestamptz)
+    ),
+    actualizados AS (
+        UPDATE public.tb_catalogo_stock t
+        SET modelo = COALESCE(e.modelo, t.modelo),
+            color = COALESCE(e.color, t.color),
+            talla = COALESCE(e.talla, t.talla),
+            precio_soles = COALESCE(e.precio_soles, t.precio_soles),
+            stock_actual = COALESCE(e.stock_actual, t.stock_actual),
+            url_foto = COALESCE(e.url_foto, t.url_foto)
+        FROM entrada e
+        WHERE t.sku = e.sku
+          AND t.updated_at IS NOT DISTINCT FROM e.updated_at
+        RETURNING t.sku, t.updated_at
+    )
+    SELECT a.sku, 'ok', a.updated_at
+    FROM actualizados a
+    UNION ALL
+    SELECT e.sku,
+           CASE WHEN t.sku IS NULL THEN 'no_existe' ELSE 'conflicto' END,
+           t.updated_at
+    FROM entrada e
+    LEFT JOIN public.tb_catalogo_stock t ON t.sku = e.sku
+    WHERE NOT EXISTS (SELECT 1 FROM actualizados a WHERE a.sku = e.sku);
+$$;
+
+REVOKE ALL ON FUNCTION public.actualizar_catalogo_lote(jsonb) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.actualizar_catalogo_lote(jsonb) TO service_role;
@@ -0,0 +1,154 @@
+"""
+Pasarela de datos - Nancy's Collection
+Punto único (por proceso) por el que pasan las consultas a Supabase de las
+apps, para aguantar picos de tráfico (p. ej. cuando se publica el catálogo en
+Instagram y cientos de sesiones entran en el mismo minuto):
+
+- Single-flight: consultas idénticas en curso se juntan en una sola; las demás
+  sesiones esperan ese mismo resultado.
+- Cubeta de tokens: como máximo NANCY_SUPABASE_RPS consultas por segundo (con
+  ráfagas de NANCY_SUPABASE_RAFAGA) hacia PostgREST; las que exceden hacen cola.
+- Si una consulta espera en la cola más de NANCY_SUPABASE_ESPERA_MS, se
+  descarta con SupabaseSaturado y quien llama sirve datos cacheados.
+
+Las lecturas concurrentes de consultas_async.py usan la misma cubeta, un
+token por request HTTP (cada página del catálogo), no uno por carga completa.
+"""
+
+import os
+import time
+import asyncio
+import threading
+
+from instrumentation import contar, span
+
+# Valores por defecto (ajustables con las variables de entorno de arriba)
+CONSULTAS_POR_SEGUNDO = 20
+RAFAGA = 10
+ESPERA_MAX_MS = 500
+
+# espera_max no indicada (None ya significa "sin límite")
+_POR_DEFECTO = object()
+
+
+class SupabaseSaturado(Exception):
+    """La consulta no consiguió turno a tiempo: servir datos cacheados en su lugar."""
+
+
+class CubetaTokens:
+    """Limitador por cubeta de tokens, seguro entre hilos. Los que esperan hacen cola."""
+
+    def __init__(self, tasa, capacidad):
+        self.tasa = tasa
+        self.capacidad = capacidad
+        self.tokens = float(capacidad)
+        self.actualizado = time.monotonic()
+        self.candado = threading.Lock()
+
+    def reservar(self, espera_max=None):
+        """Reserva un token. Retorna los segundos que hay que esperar antes de usarlo,
+        o None si la espera supera espera_max (None = sin límite); en ese caso no reserva nada.
+
+        El token se reserva al entrar (el saldo puede quedar negativo): así cada
+        hilo sabe cuánto le toca esperar y los turnos salen en orden de llegada.
+        """
+        with self.candado:
+            ahora = time.monotonic()
+            self.tokens = min(self.capacidad, self.tokens + (ahora - self.actualizado) * self.tasa)
+            self.actualizado = ahora
+            espera = max(0.0, (1 - self.tokens) / self.tasa)
+            if espera_max is not None and espera > espera_max:
+                return None
+            self.tokens -= 1
+        return espera
+
+    def tomar(self, espera_max=None):
+        """Toma un token esperando a lo más espera_max segundos (None = sin límite). Retorna si lo obtuvo."""
+        espera = self.reservar(espera_max)
+        if espera is None:
+            return False
+        if espera:
+            time.sleep(espera)
+        return True
+
+    async def tomar_async(self, espera_max=None):
+        """Igual que tomar(), esperando con asyncio.sleep para no bloquear el event loop de consultas_async."""
+        espera = self.reservar(espera_max)
+        if espera is None:
+            return False
+        if espera:
+            await asyncio.sleep(espera)
+        return True
+
+
+class _Vuelo:
+    """Consulta en curso: los que llegan después esperan su resultado."""
+
+    def __init__(self):
+        self.listo = threading.Event()
+        self.resultado = None
+        self.error = None
+
+
+class PasarelaDatos:
+    """Single-flight + cubeta de tokens alrededor de las llamadas a Supabase."""
+
+    def __init__(self, consultas_por_segundo=CONSULTAS_POR_SEGUNDO, rafaga=RAFAGA, espera_max_ms=ESPERA_MAX_MS):
+        self.cubeta = CubetaTokens(consultas_por_segundo, rafaga)
+        self.espera_max = espera_max_ms / 1000
+        self.candado = threading.Lock()
+        self.en_vuelo = {}
+
+    @classmethod
+    def desde_entorno(cls):
+        return cls(
+            consultas_por_segundo=float(os.getenv('NANCY_SUPABASE_RPS', CONSULTAS_POR_SEGUNDO)),
+            rafaga=float(os.getenv('NANCY_SUPABASE_RAFAGA', RAFAGA)),
+            espera_max_ms=float(os.getenv('NANCY_SUPABASE_ESPERA_MS', ESPERA_MAX_MS)),
+        )
+
+    def consultar(self, clave, funcion, espera_max=_POR_DEFECTO):
+        """Ejecuta funcion() una sola vez por clave en curso, respetando el límite de tasa.
+
+        Args:
+            clave: Identifica la consulta (hashable); misma clave = mismo resultado
+            funcion: Llamada a Supabase sin argumentos
+            espera_max: Segundos máximos en la cola (None = esperar siempre);
+                por defecto NANCY_SUPABASE_ESPERA_MS
+
+        Raises:
+            SupabaseSaturado: Si no hubo turno dentro de espera_max (las
+                sesiones que esperaban esa misma consulta también lo reciben)
+        """
+        with self.candado:
+            vuelo = self.en_vuelo.get(clave)
+            propio = vuelo is None
+            if propio:
+                vuelo = self.en_vuelo[clave] = _Vuelo()
+
+        if not propio:
+            contar('pasarela.coalescidas')
+            vuelo.listo.wait()
+        else:
+            try:
+                with span('pasarela.cola'):
+                    turno = self.cubeta.tomar(self.espera_max if espera_max is _POR_DEFECTO else espera_max)
+                if not turno:
+                    contar('pasarela.descartadas')
+                    raise SupabaseSaturado(f"Sin turno para {clave!r}")
+                contar('pasarela.consultas')
+                vuelo.resultado = funcion()
+            except Exception as e:
+                vuelo.error = e
+            finally:
+                with self.candado:
+                    del self.en_vuelo[clave]
+                vuelo.listo.set()
+
+        if vuelo.error is not None:
+            raise vuelo.error
+        return vuelo.resultado
+
+
+# Pasarela del proceso (compartida por todas las sesiones)
+PASARELA = PasarelaDatos.desde_entorno()
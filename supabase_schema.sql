@@ -16,11 +16,20 @@ CREATE TABLE IF NOT EXISTS public.tb_catalogo_stock (
     created_at timestamptz DEFAULT now()
 );
 
--- Indexes
-CREATE INDEX IF NOT EXISTS idx_tb_catalogo_modelo ON public.tb_catalogo_stock(modelo);
-CREATE INDEX IF NOT EXISTS idx_tb_catalogo_sku ON public.tb_catalogo_stock(sku);
+-- Indexes (sku ya tiene índice por la restricción UNIQUE)
+-- Ver migrations/001, 002 y 005 para bases creadas con versiones anteriores
 CREATE INDEX IF NOT EXISTS idx_tb_catalogo_stock ON public.tb_catalogo_stock(stock_actual);
 
+-- Catálogo público: WHERE stock_actual > 0 paginado por (modelo, sku).
+-- Índice parcial con la clave del cursor; INCLUDE cubre la galería (index-only scans)
+CREATE INDEX IF NOT EXISTS idx_tb_catalogo_disponibles_cursor
+    ON public.tb_catalogo_stock(modelo, sku)
+    INCLUDE (color, talla, precio_soles, stock_actual, url_foto)
+    WHERE stock_actual > 0;
+
+-- Paginación keyset por (modelo, sku) - ver catalog_queries.py (panel admin)
+CREATE INDEX IF NOT EXISTS idx_tb_catalogo_modelo_sku ON public.tb_catalogo_stock(modelo, sku);
+
 -- Auto-update timestamp trigger
 CREATE OR REPLACE FUNCTION update_updated_at_column()
 RETURNS TRIGGER AS $$
@@ -0,0 +1,89 @@
+"""
+Tarjetas de producto (HTML) - Nancy's Collection
+Marcado de las tarjetas del catálogo y mensaje del pedido por WhatsApp, sin
+dependencias de Streamlit: lo usan catalogo_publico.py (st.markdown) y el
+sitio estático de exportar_sitio.py, así ambos se ven y cobran igual.
+
+Los elementos llevan data-campo para que assets/sitio.js pueda rellenar una
+copia de la tarjeta con otro producto al filtrar en el navegador.
+"""
+
+import html
+import urllib.parse
+
+# Con este stock o menos la tarjeta muestra "Últimas N unidades"
+STOCK_BAJO = 3
+# Número de pedidos si no está configurado [contact] whatsapp_number
+WHATSAPP_DEFECTO = "51980907493"
+
+_SIN_FOTO = "<div style='font-size: 80px; color: #CCC;'>📷</div>"
+
+
+def _texto(valor):
+    return html.escape(str(valor), quote=True)
+
+
+def html_imagen(prod):
+    """Contenedor de 380px con la foto, o el ícono de cámara si no hay (o no carga)."""
+    url = prod.get('url_foto')
+    if not url or url != url:  # None o NaN de pandas
+        return f"<div class='product-img-container'>{_SIN_FOTO}</div>"
+    return f"""
+    <div class='product-img-container'>
+        <img src='{_texto(url)}' alt='{_texto(prod['modelo'])}' loading='lazy' data-campo='foto'
+             onerror="this.onerror=null; this.parentElement.innerHTML='<div style=\\'font-size:80px; color:#CCC;\\'>📷</div>';">
+    </div>
+    """
+
+
+def html_info(prod):
+    """Modelo, precio, color y talla."""
+    return f"""
+    <div style='padding: 20px;'>
+        <div data-campo='modelo' style='font-family: "Playfair Display", serif; font-style: italic;
+                    font-size: 20px; color: #1A1A1A; margin-bottom: 8px;'>{_texto(prod['modelo'])}</div>
+        <div class='price-tag' data-campo='precio'>S/ {prod['precio_soles']:.2f}</div>
+        <div data-campo='detalle' style='font-size: 13px; color: #666; margin: 10px 0;'>{_texto(prod['color'])} • Talla {_texto(prod['talla'])}</div>
+    </div>
+    """
+
+
+def texto_stock(stock):
+    return f"Últimas {stock} unidades" if stock <= STOCK_BAJO else "En stock"
+
+
+def html_badge_stock(stock):
+    clase = 'stock-low' if stock <= STOCK_BAJO else 'stock-ok'
+    return f"<center><span class='stock-badge {clase}' data-campo='stock'>{texto_stock(stock)}</span></center>"
+
+
+def html_tarjeta(prod):
+    """Tarjeta completa del sitio estático (el botón lo maneja assets/sitio.js por data-sku)."""
+    return f"""
+    <article class='product-card' data-sku='{_texto(prod['sku'])}'>
+        {html_imagen(prod)}
+        {html_info(prod)}
+        {html_badge_stock(int(prod['stock_actual']))}
+        <button type='button' class='boton-agregar' data-sku='{_texto(prod['sku'])}'>AGREGAR AL CARRITO</button>
+    </article>
+    """
+
+
+def mensaje_whatsapp(items):
+    """Texto del pedido. items: dicts con modelo, color, talla, cantidad y precio (como el carrito)."""
+    if not items:
+        return ""
+    mensaje = "🖤 *Nuevo Pedido - Nancy's Collection*\n\n"
+    for item in items:
+        mensaje += f"• {item['modelo']}\n"
+        mensaje += f"  Color: {item['color']} | Talla: {item['talla']}\n"
+        mensaje += f"  {item['cantidad']} x S/ {item['precio']:.2f}\n\n"
+    total = sum(item['precio'] * item['cantidad'] for item in items)
+    mensaje += f"💰 *TOTAL: S/ {total:.2f}*\n\n"
+    mensaje += "Confirmar disponibilidad y coordinar entrega 🚚"
+    return mensaje
+
+
+def url_whatsapp(numero, mensaje):
+    """Enlace wa.me con el mensaje codificado para URL."""
+    return f"https://wa.me/{numero}?text={urllib.parse.quote(mensaje)}"
@@ -0,0 +1,22 @@
+"""
+Recursos estáticos de las apps - Nancy's Collection
+El CSS vive en assets/ y se lee una sola vez por proceso; cada rerun solo reutiliza el string cacheado.
+"""
+
+from pathlib import Path
+
+import streamlit as st
+
+ASSETS_DIR = Path(__file__).parent / "assets"
+
+
+@st.cache_resource
+def cargar_css(nombre):
+    """Lee una hoja de estilos de assets/ y la envuelve en un bloque <style>."""
+    css = (ASSETS_DIR / nombre).read_text(encoding="utf-8")
+    return f"<style>\n{css}</style>"
+
+
+def aplicar_css(nombre):
+    """Inyecta en la página la hoja de estilos cacheada."""
+    st.markdown(cargar_css(nombre), unsafe_allow_html=True)
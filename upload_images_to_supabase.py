@@ -6,24 +6,34 @@ IMPORTANTE: Necesitas configurar la Service Role Key en .streamlit/secrets.toml
 """
 
 import os
-import json
+import sys
+import hashlib
 from pathlib import Path
-from supabase import create_client, Client
+from supabase import Client
 import streamlit as st
+from data_access import obtener_cliente
+from catalog_queries import iterar_paginas
+from generate_catalog_data import read_jsonl
+from catalog_images import (
+    CACHE_CONTROL_IMAGENES,
+    CONTENT_TYPES,
+    detectar_formato,
+    transcodificar_imagenes,
+)
 
 # Directorio del catálogo
 CATALOG_DIR = Path(__file__).parent / "catalogo-nancy's"
-DATA_FILE = Path(__file__).parent / "catalog_data.json"
+DATA_FILE = Path(__file__).parent / "catalog_data.jsonl"
 BUCKET_NAME = "product-images"
+# Versiones WebP ya transcodificadas (se reutilizan entre corridas)
+WEB_CACHE_DIR = Path(__file__).parent / ".catalogo_web"
 
 def init_supabase_client() -> Client:
     """Inicializa cliente de Supabase con Service Role Key."""
     try:
         # Intentar cargar desde secrets de Streamlit
-        url = st.secrets["supabase"]["url"]
         # Para subir imágenes necesitamos la service_role_key (no la anon key)
-        key = st.secrets["supabase"].get("service_role_key") or st.secrets["supabase"]["key"]
-        return create_client(url, key)
+        return obtener_cliente(st.secrets, service_role=True)
     except Exception as e:
         print(f"ERROR: Error al inicializar Supabase: {e}")
         print("\nADVERTENCIA: Para subir imágenes necesitas configurar la Service Role Key")
@@ -51,31 +61,70 @@ def ensure_bucket_exists(supabase: Client):
     except Exception as e:
         print(f"ADVERTENCIA: No se pudo verificar/crear bucket: {e}")
 
-def upload_image(supabase: Client, image_path: Path, sku: str) -> str:
-    """Sube una imagen a Supabase Storage y retorna la URL pública."""
+def storage_object_name(sku: str, file_data: bytes, extension: str) -> str:
+    """Nombre en Storage con el hash del contenido: {sku}-{sha256[:16]}.{ext}.
+    
+    La URL cambia solo si cambia la imagen, así se puede cachear como inmutable.
+    """
+    digest = hashlib.sha256(file_data).hexdigest()[:16]
+    return f"{sku}-{digest}.{extension}"
+
+def upload_image(supabase: Client, image_path: Path, sku: str, web_image: dict = None,
+                 current_url: str = None) -> str:
+    """Sube una imagen a Supabase Storage y retorna la URL pública.
+    
+    Con web_image (resultado de transcodificar_web) se sube la versión WebP;
+    si no, el archivo original con el content-type de sus magic bytes. Si la
+    URL versionada coincide con current_url, la imagen ya está subida y no se
+    vuelve a enviar.
+    """
     try:
-        # Nombre del archivo en Storage (usar SKU para organización)
-        storage_path = f"{sku}-{image_path.name}"
+        if web_image:
+            upload_path = Path(web_image['ruta'])
+            content_type = web_image['content_type']
+            extension = 'webp'
+        else:
+            upload_path = image_path
+            fmt = detectar_formato(image_path) or 'png'
+            content_type = CONTENT_TYPES.get(fmt, 'application/octet-stream')
+            extension = fmt.replace('jpeg', 'jpg')
         
         # Leer archivo
-        with open(image_path, 'rb') as f:
+        with open(upload_path, 'rb') as f:
             file_data = f.read()
         
-        # Subir archivo
+        # Nombre versionado por contenido (usar SKU para organización)
+        storage_path = storage_object_name(sku, file_data, extension)
+        public_url = supabase.storage.from_(BUCKET_NAME).get_public_url(storage_path)
+        if public_url == current_url:
+            return public_url
+        
+        # Subir archivo (nombre nuevo: nunca se sobrescribe un objeto ya cacheado)
         supabase.storage.from_(BUCKET_NAME).upload(
             storage_path,
             file_data,
-            file_options={"content-type": "image/png", "upsert": "true"}
+            file_options={
+                "content-type": content_type,
+                "cache-control": CACHE_CONTROL_IMAGENES,
+                "upsert": "true",
+            }
         )
         
-        # Obtener URL pública
-        public_url = supabase.storage.from_(BUCKET_NAME).get_public_url(storage_path)
-        
         return public_url
     except Exception as e:
         print(f"   ERROR: Error subiendo {image_path.name}: {e}")
         return None
 
+def load_current_urls(supabase: Client) -> dict:
+    """url_foto actual de cada SKU ({sku: url}), página por página."""
+    urls = {}
+    try:
+        for page in iterar_paginas(supabase, columnas='sku,url_foto'):
+            urls.update((row['sku'], row.get('url_foto')) for row in page)
+    except Exception as e:
+        print(f"ADVERTENCIA: No se pudieron leer las URLs actuales ({e}); se suben todas")
+    return urls
+
 def update_product_image_url(supabase: Client, sku: str, url: str):
     """Actualiza la URL de imagen en la base de datos."""
     try:
@@ -85,69 +134,106 @@ def update_product_image_url(supabase: Client, sku: str, url: str):
         print(f"   ERROR: Error actualizando URL para {sku}: {e}")
         return False
 
-def main():
-    """Función principal."""
-    print("Iniciando subida de imágenes a Supabase Storage...\n")
+def sync_product_images(supabase: Client, products_with_images: list, catalog_dir: Path = None,
+                        web_cache_dir: Path = None) -> dict:
+    """Transcodifica, sube y actualiza url_foto de los productos con imagen.
     
-    # Verificar que exista el archivo de datos
-    if not DATA_FILE.exists():
-        print("ERROR: No se encontró catalog_data.json")
-        print("   Ejecuta primero: python generate_catalog_data.py")
-        return
+    Solo se suben y actualizan los SKUs cuya imagen cambió (la URL versionada
+    difiere de la guardada en url_foto).
     
-    # Cargar datos del catálogo
-    with open(DATA_FILE, 'r', encoding='utf-8') as f:
-        products = json.load(f)
+    Returns:
+        dict con uploaded, unchanged y errors
+    """
+    catalog_dir = Path(catalog_dir or CATALOG_DIR)
     
-    print(f"Se encontraron {len(products)} productos en catalog_data.json")
-    products_with_images = [p for p in products if p['image_file']]
-    print(f"Productos con imágenes: {len(products_with_images)}\n")
+    # Versión web (WebP) de todas las fotos en paralelo; las ya convertidas se reutilizan
+    image_paths = [catalog_dir / p['image_file'] for p in products_with_images]
+    print("Transcodificando imágenes a WebP...")
+    web_images = transcodificar_imagenes([path for path in image_paths if path.exists()],
+                                         web_cache_dir or WEB_CACHE_DIR)
+    original_bytes = sum(w['bytes_origen'] for w in web_images.values())
+    web_bytes = sum(w['bytes'] for w in web_images.values())
+    if original_bytes:
+        print(f"OK: {len(web_images)} imágenes, {original_bytes / 1e6:.1f} MB -> {web_bytes / 1e6:.1f} MB")
     
-    # Inicializar cliente de Supabase
-    try:
-        supabase = init_supabase_client()
-    except:
-        return
-    
-    # Verificar/crear bucket
-    ensure_bucket_exists(supabase)
+    current_urls = load_current_urls(supabase)
     
     print("\nSubiendo imágenes...\n")
     
     # Subir imágenes y actualizar URLs
-    success_count = 0
-    error_count = 0
+    result = {'uploaded': 0, 'unchanged': 0, 'errors': 0}
     
     for product in products_with_images:
         sku = product['sku']
         image_file = product['image_file']
-        image_path = CATALOG_DIR / image_file
+        image_path = catalog_dir / image_file
         
         if not image_path.exists():
             print(f"ADVERTENCIA: {sku}: Imagen no encontrada ({image_file})")
-            error_count += 1
+            result['errors'] += 1
             continue
         
-        print(f"Subiendo {sku}: {image_file}...")
+        # Subir imagen (si cambió)
+        current_url = current_urls.get(sku)
+        public_url = upload_image(supabase, image_path, sku, web_images.get(image_file), current_url)
         
-        # Subir imagen
-        public_url = upload_image(supabase, image_path, sku)
-        
-        if public_url:
+        if not public_url:
+            result['errors'] += 1
+        elif public_url == current_url:
+            result['unchanged'] += 1
+        else:
+            print(f"Subido {sku}: {image_file}")
             # Actualizar base de datos
             if update_product_image_url(supabase, sku, public_url):
                 print(f"   OK: URL actualizada en DB")
-                success_count += 1
+                result['uploaded'] += 1
             else:
-                error_count += 1
-        else:
-            error_count += 1
+                result['errors'] += 1
+    
+    return result
+
+def main():
+    """Función principal."""
+    print("Iniciando subida de imágenes a Supabase Storage...\n")
+    
+    # Verificar que exista el archivo de datos
+    # Opcional: otro archivo JSONL (ej. catalog_delta.jsonl de --incremental)
+    data_file = Path(sys.argv[1]) if len(sys.argv) > 1 else DATA_FILE
+    if not data_file.exists():
+        print(f"ERROR: No se encontró {data_file.name}")
+        print("   Ejecuta primero: python generate_catalog_data.py")
+        return
+    
+    # Cargar datos del catálogo línea por línea (solo se guardan los que tienen imagen)
+    total_products = 0
+    products_with_images = []
+    for product in read_jsonl(data_file):
+        total_products += 1
+        if product.get('image_file'):
+            products_with_images.append({'sku': product['sku'], 'image_file': product['image_file']})
+    
+    print(f"Se encontraron {total_products} productos en {data_file.name}")
+    print(f"Productos con imágenes: {len(products_with_images)}\n")
+    
+    # Inicializar cliente de Supabase
+    try:
+        supabase = init_supabase_client()
+    except:
+        return
+    
+    # Verificar/crear bucket
+    ensure_bucket_exists(supabase)
+    
+    result = sync_product_images(supabase, products_with_images)
+    success_count = result['uploaded'] + result['unchanged']
+    error_count = result['errors']
     
     # Resumen
     print("\n" + "="*60)
     print("RESUMEN DE SUBIDA")
     print("="*60)
-    print(f"OK: Imágenes subidas exitosamente: {success_count}")
+    print(f"OK: Imágenes subidas exitosamente: {result['uploaded']}")
+    print(f"OK: Sin cambios (ya subidas): {result['unchanged']}")
     print(f"ERROR: Errores: {error_count}")
     print(f"Bucket usado: {BUCKET_NAME}")
     